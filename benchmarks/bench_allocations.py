@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Memory allocated per ``ClientCall`` by ``Client._create_llm_call``.
+
+Counts the blocks and bytes each call record keeps alive, for a short and a
+long conversation, with context messages stored, converted and not stored.
+Runs fully offline against the pricing snapshot bundled with yalc.
+
+    uv run python benchmarks/bench_allocations.py
+"""
+
+import tracemalloc
+from unittest.mock import MagicMock
+
+from bench_create_llm_call import Answer, BenchClient, RawResponse
+
+from yalc import LLMModel
+
+NUMBER = 2_000
+
+
+def conversation(turns: int) -> list[dict[str, str]]:
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."}
+    ]
+    for turn in range(turns):
+        messages.append(
+            {"role": "user", "content": f"Question number {turn}?"}
+        )
+        messages.append(
+            {"role": "assistant", "content": f"Answer number {turn}."}
+        )
+    messages.append({"role": "user", "content": "Say hello"})
+    return messages
+
+
+def allocations_per_call(
+    client: BenchClient,
+    messages: list[dict[str, str]],
+    read_context: bool = False,
+) -> tuple[float, float]:
+    """Blocks and bytes kept alive per call record."""
+    parsed = Answer(text="hello")
+    raw = RawResponse(input_tokens=1200, output_tokens=300)
+    # warm up caches so they are not counted against the calls
+    client._create_llm_call(messages, parsed, raw).context_messages
+
+    calls = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(NUMBER):
+        call = client._create_llm_call(messages, parsed, raw)
+        if read_context:
+            call.context_messages
+        calls.append(call)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    diff = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in diff)
+    size = sum(stat.size_diff for stat in diff)
+    return blocks / NUMBER, size / NUMBER
+
+
+def main() -> None:
+    model = LLMModel.gpt_4o_mini
+    stored = BenchClient(model, MagicMock())
+    not_stored = BenchClient(model, MagicMock(), store_context=False)
+
+    for turns in [0, 50]:
+        messages = conversation(turns)
+        print(f"{len(messages)} messages:")
+        for label, client, read_context in [
+            ("stored", stored, False),
+            ("stored, read", stored, True),
+            ("not stored", not_stored, False),
+        ]:
+            blocks, size = allocations_per_call(
+                client, messages, read_context
+            )
+            print(
+                f"  {label:<13} {blocks:8.1f} blocks/call"
+                f" {size:10.0f} B/call"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the per-call overhead of ``Client._create_llm_call``.
+
+Runs fully offline against the pricing snapshot bundled with yalc.
+
+    uv run python benchmarks/bench_create_llm_call.py
+"""
+
+import timeit
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import MagicMock
+
+from pydantic import BaseModel
+
+from yalc import Client, LLMModel, ResponseStats
+
+NUMBER = 20_000
+REPEAT = 5
+
+
+class Answer(BaseModel):
+    text: str
+
+
+@dataclass
+class RawResponse:
+    input_tokens: int
+    output_tokens: int
+
+
+class BenchClient(Client):
+    """Client that only costs responses; it never sends a request."""
+
+    @classmethod
+    def build_instructor_client(
+        cls, *args: Any, **kwargs: Any
+    ) -> Any:
+        raise NotImplementedError
+
+    async def _response(self, response_type, messages) -> Any:
+        raise NotImplementedError
+
+    def _request_params(self, messages) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def _stream(self, params) -> Any:
+        raise NotImplementedError
+
+    def _stream_response(self, event, response) -> Any:
+        raise NotImplementedError
+
+    def _batch_request(self, custom_id, params) -> dict[str, Any]:
+        raise NotImplementedError
+
+    async def _submit_batch(self, requests) -> str:
+        raise NotImplementedError
+
+    async def _batch_outputs(self, batch_id) -> Any:
+        raise NotImplementedError
+
+    def _get_response_stats(
+        self, response: RawResponse, batch: bool = False
+    ) -> ResponseStats:
+        return self.pricing_service.build_response_stats(
+            input_tokens=response.input_tokens,
+            output_tokens=response.output_tokens,
+            model=self.model,
+            batch=batch,
+        )
+
+
+def per_call_us(func) -> float:
+    best = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+    return best / NUMBER * 1e6
+
+
+def main() -> None:
+    client = BenchClient(LLMModel.gpt_4o_mini, MagicMock())
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": "Say hello"},
+    ]
+    parsed = Answer(text="hello")
+    raw = RawResponse(input_tokens=1200, output_tokens=300)
+    # resolve pricing once so the first measurement isn't a cold start
+    client._create_llm_call(messages, parsed, raw)
+
+    stats = per_call_us(lambda: client._get_response_stats(raw))
+    call = per_call_us(
+        lambda: client._create_llm_call(messages, parsed, raw)
+    )
+    print(f"_get_response_stats: {stats:8.2f} us/call")
+    print(f"_create_llm_call:    {call:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Per-call CPU spent turning a deeply nested response type into a request.
+
+Compares instructor building the tool definition from the plain pydantic
+model, as on every call before, with building it from the compiled model
+every client now shares. No request is sent.
+
+    uv run python benchmarks/bench_schema.py
+"""
+
+import timeit
+
+from instructor import Mode
+from instructor.processing.response import handle_response_model
+from pydantic import BaseModel, Field
+
+from yalc.clients.schema_cache import compiled_model
+
+NUMBER = 200
+REPEAT = 5
+DEPTH = 6
+
+PARAMS = {
+    Mode.RESPONSES_TOOLS: {"model": "m", "input": []},
+    Mode.ANTHROPIC_TOOLS: {
+        "model": "m",
+        "messages": [],
+        "max_tokens": 4096,
+    },
+}
+
+
+class Leaf(BaseModel):
+    name: str
+    score: float = Field(ge=0, le=1)
+    tags: list[str]
+
+
+def deep_model(depth: int) -> type[BaseModel]:
+    model: type[BaseModel] = Leaf
+    for level in range(depth):
+        model = type(
+            f"Level{level}",
+            (BaseModel,),
+            {
+                "__annotations__": {
+                    "label": str,
+                    "meta": dict[str, str],
+                    "children": list[model],  # type: ignore[valid-type]
+                    "best": model | None,
+                }
+            },
+        )
+    return model
+
+
+def per_call_us(func) -> float:
+    best = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+    return best / NUMBER * 1e6
+
+
+def main() -> None:
+    response_type = deep_model(DEPTH)
+    for mode, params in PARAMS.items():
+        plain = per_call_us(
+            lambda: handle_response_model(
+                response_type, mode=mode, **params
+            )
+        )
+        compiled = per_call_us(
+            lambda: handle_response_model(
+                compiled_model(response_type), mode=mode, **params
+            )
+        )
+        print(
+            f"{mode.value:<16} plain: {plain:9.1f} us/call"
+            f"  compiled: {compiled:9.1f} us/call"
+        )
+
+
+if __name__ == "__main__":
+    main()
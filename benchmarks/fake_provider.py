@@ -0,0 +1,284 @@
+"""Local stand-in for the OpenAI Responses and Anthropic Messages APIs.
+
+Answers every request by calling its first tool with arguments generated
+from the tool's JSON schema, after a latency drawn from a log-normal
+distribution. A share of the requests fail with a 429 or a 500. Streams
+are not supported.
+
+Point a client at it with ``base_url``:
+
+    server = FakeProviderProcess(FakeProviderConfig())
+    create_client(LLMModel.gpt_4o_mini, api_key="fake", base_url=server.openai_url)
+"""
+
+import asyncio
+import json
+import math
+import multiprocessing
+import random
+from dataclasses import dataclass
+from typing import Any
+
+# z-score of the 99th percentile of a normal distribution
+_Z_99 = 2.326
+
+
+@dataclass(frozen=True)
+class FakeProviderConfig:
+    """How the fake provider answers. Latencies are in seconds."""
+
+    latency_p50: float = 0.05
+    latency_p99: float = 0.2
+    # shares of the requests answered with a 429 and with a 500
+    rate_limit_rate: float = 0.0
+    error_rate: float = 0.0
+    # sent with 429s as retry-after-ms
+    retry_after: float = 0.05
+    input_tokens: int = 1000
+    output_tokens: int = 100
+    seed: int | None = None
+
+    def latency(self, rng: random.Random) -> float:
+        if self.latency_p99 <= self.latency_p50:
+            return self.latency_p50
+        sigma = math.log(self.latency_p99 / self.latency_p50) / _Z_99
+        return rng.lognormvariate(math.log(self.latency_p50), sigma)
+
+
+def sample_arguments(
+    schema: dict[str, Any], defs: dict[str, Any] | None = None
+) -> Any:
+    """The smallest value valid for ``schema``: required fields only, empty lists."""
+    defs = schema.get("$defs", defs or {})
+    if "$ref" in schema:
+        return sample_arguments(
+            defs[schema["$ref"].rsplit("/", 1)[-1]], defs
+        )
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            return sample_arguments(schema[key][0], defs)
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = kind[0]
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {
+            name: sample_arguments(properties[name], defs)
+            for name in schema.get("required", [])
+        }
+    if kind == "array":
+        return [
+            sample_arguments(schema.get("items", {}), defs)
+            for _ in range(schema.get("minItems", 0))
+        ]
+    return {
+        "string": "text",
+        "integer": schema.get("minimum", 0),
+        "number": schema.get("minimum", 0.0),
+        "boolean": False,
+        "null": None,
+    }[kind]
+
+
+class FakeProvider:
+    def __init__(self, config: FakeProviderConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._requests = 0
+
+    async def handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            while request := await _read_request(reader):
+                path, body = request
+                status, headers, payload = await self._answer(
+                    path, body
+                )
+                _write_response(writer, status, headers, payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(
+        self, path: str, body: dict[str, Any]
+    ) -> tuple[int, dict[str, str], dict[str, Any]]:
+        config, rng = self.config, self._rng
+        await asyncio.sleep(config.latency(rng))
+        self._requests += 1
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            return (
+                429,
+                {
+                    "retry-after-ms": str(
+                        int(config.retry_after * 1000)
+                    )
+                },
+                _error("rate_limit_error", "Rate limited"),
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            return 500, {}, _error("api_error", "Internal error")
+        if body.get("stream"):
+            return 400, {}, _error("invalid_request", "No streams")
+        if path.endswith("/responses"):
+            return 200, {}, self._openai_response(body)
+        if path.endswith("/messages"):
+            return 200, {}, self._anthropic_response(body)
+        return 404, {}, _error("not_found", f"No route {path}")
+
+    def _openai_response(
+        self, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        tool = body["tools"][0]
+        config = self.config
+        return {
+            "id": f"resp_{self._requests}",
+            "object": "response",
+            "created_at": 0,
+            "model": body["model"],
+            "output": [
+                {
+                    "type": "function_call",
+                    "id": f"fc_{self._requests}",
+                    "call_id": f"call_{self._requests}",
+                    "name": tool["name"],
+                    "arguments": json.dumps(
+                        sample_arguments(tool["parameters"])
+                    ),
+                    "status": "completed",
+                }
+            ],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": config.input_tokens,
+                "output_tokens": config.output_tokens,
+                "total_tokens": config.input_tokens
+                + config.output_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+
+    def _anthropic_response(
+        self, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        tool = body["tools"][0]
+        return {
+            "id": f"msg_{self._requests}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [
+                {
+                    "type": "tool_use",
+                    "id": f"toolu_{self._requests}",
+                    "name": tool["name"],
+                    "input": sample_arguments(tool["input_schema"]),
+                }
+            ],
+            "stop_reason": "tool_use",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": self.config.input_tokens,
+                "output_tokens": self.config.output_tokens,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 0,
+            },
+        }
+
+
+def _error(kind: str, message: str) -> dict[str, Any]:
+    return {
+        "type": "error",
+        "error": {"type": kind, "message": message},
+    }
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, dict[str, Any]] | None:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    _, path, _ = request_line.decode().split(" ", 2)
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length) if length else b"{}"
+    return path, json.loads(body)
+
+
+def _write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    headers: dict[str, str],
+    payload: dict[str, Any],
+) -> None:
+    body = json.dumps(payload).encode()
+    head = [
+        f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}",
+        "content-type: application/json",
+        f"content-length: {len(body)}",
+        *(f"{name}: {value}" for name, value in headers.items()),
+    ]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+
+
+async def serve(
+    config: FakeProviderConfig, port: int = 0, ready=None
+) -> None:
+    """Serve until cancelled, sending the bound port through ``ready`` if given."""
+    provider = FakeProvider(config)
+    server = await asyncio.start_server(
+        provider.handle, "127.0.0.1", port, backlog=16384
+    )
+    if ready is not None:
+        ready.send(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+def _run(config: FakeProviderConfig, ready) -> None:
+    asyncio.run(serve(config, ready=ready))
+
+
+class FakeProviderProcess:
+    """The fake provider, served from a separate process.
+
+    Running it out of process keeps its CPU time and memory out of the
+    measurements of the client.
+    """
+
+    def __init__(self, config: FakeProviderConfig):
+        context = multiprocessing.get_context("spawn")
+        receive, send = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_run, args=(config, send), daemon=True
+        )
+        self._process.start()
+        self.port: int = receive.recv()
+
+    @property
+    def openai_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    @property
+    def anthropic_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self) -> None:
+        self._process.terminate()
+        self._process.join()
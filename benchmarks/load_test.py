@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Load test of yalc against a local fake provider, see ``fake_provider.py``.
+
+Sends structured responses through ``create_client`` at each concurrency
+level and reports throughput, p50/p99 latency, the client's CPU time per
+call and how much its memory grew. The fake provider runs in its own
+process, so the CPU and memory figures are yalc's, its SDKs' and httpx's.
+With ``--workers``, the calls run on a ``ShardedExecutor`` and the CPU and
+memory figures only cover the process collecting the results.
+
+    uv run python benchmarks/load_test.py --provider openai --concurrency 1 10 100 1000 10000
+    uv run python benchmarks/load_test.py --save baseline
+    uv run python benchmarks/load_test.py --compare baseline
+
+Results are saved to ``benchmarks/results/<name>.json``. ``--compare``
+prints the change from a saved run and exits with status 1 when
+throughput, p99 latency or CPU per call got worse by more than
+``--tolerance``.
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from fake_provider import FakeProviderConfig, FakeProviderProcess
+from pydantic import BaseModel
+
+from yalc import (
+    LLMModel,
+    PoolConfig,
+    ProviderClientPool,
+    ShardedExecutor,
+    create_client,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+MODELS = {
+    "openai": LLMModel.gpt_4o_mini,
+    "anthropic": LLMModel.claude_haiku_4_5,
+}
+
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "Say hello"},
+]
+
+# metrics compared by --compare, and whether higher is better
+COMPARED = {
+    "throughput": True,
+    "latency_p99": False,
+    "cpu_per_call": False,
+}
+
+
+class Answer(BaseModel):
+    text: str
+    confidence: float
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    calls: int
+    errors: int
+    # calls per second
+    throughput: float
+    # seconds
+    latency_p50: float
+    latency_p99: float
+    cpu_per_call: float
+    # growth of the resident set, in bytes
+    memory_growth: int
+
+
+def resident_memory() -> int:
+    """Current resident set size in bytes, the peak where unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize()
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def run_level(
+    client, concurrency: int, calls: int
+) -> LevelResult:
+    latencies: list[float] = []
+    errors = 0
+    remaining = calls
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                await client.structured_response(Answer, MESSAGES)
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    gc.collect()
+    memory = resident_memory()
+    cpu = time.process_time()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return level_result(
+        concurrency, calls, errors, latencies, started, cpu, memory
+    )
+
+
+async def run_sharded_level(
+    executor: ShardedExecutor, concurrency: int, calls: int
+) -> LevelResult:
+    latencies: list[float] = []
+    errors = 0
+
+    gc.collect()
+    memory = resident_memory()
+    cpu = time.process_time()
+    started = time.perf_counter()
+    async for result in executor.structured_response_as_completed(
+        Answer, itertools.repeat(MESSAGES, calls)
+    ):
+        if result.call is None or result.call.timing is None:
+            errors += 1
+        else:
+            latencies.append(result.call.timing.duration)
+    return level_result(
+        concurrency, calls, errors, latencies, started, cpu, memory
+    )
+
+
+def level_result(
+    concurrency: int,
+    calls: int,
+    errors: int,
+    latencies: list[float],
+    started: float,
+    cpu: float,
+    memory: int,
+) -> LevelResult:
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu
+    gc.collect()
+
+    quantiles = (
+        statistics.quantiles(latencies, n=100)
+        if len(latencies) > 1
+        else latencies * 99
+    )
+    return LevelResult(
+        concurrency=concurrency,
+        calls=calls,
+        errors=errors,
+        throughput=calls / elapsed,
+        latency_p50=quantiles[49] if quantiles else 0.0,
+        latency_p99=quantiles[98] if quantiles else 0.0,
+        cpu_per_call=cpu / calls,
+        memory_growth=resident_memory() - memory,
+    )
+
+
+async def run(
+    args: argparse.Namespace, base_url: str
+) -> list[LevelResult]:
+    pool_config = PoolConfig(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+    )
+    if args.workers:
+        return await run_sharded(args, base_url, pool_config)
+    pool = ProviderClientPool(pool_config)
+    client = create_client(
+        MODELS[args.provider],
+        api_key="fake",
+        base_url=base_url,
+        pool=pool,
+    )
+    try:
+        # warm up connections, pricing and compiled schemas
+        await run_level(client, min(args.concurrency), args.warmup)
+        results = []
+        for concurrency in args.concurrency:
+            calls = max(args.min_calls, concurrency * args.rounds)
+            result = await run_level(client, concurrency, calls)
+            print(format_result(result), flush=True)
+            results.append(result)
+        return results
+    finally:
+        await pool.aclose()
+
+
+async def run_sharded(
+    args: argparse.Namespace, base_url: str, pool_config: PoolConfig
+) -> list[LevelResult]:
+    results = []
+    for concurrency in args.concurrency:
+        async with ShardedExecutor(
+            MODELS[args.provider],
+            workers=args.workers,
+            max_concurrency=max(concurrency // args.workers, 1),
+            pool_config=pool_config,
+            api_key="fake",
+            base_url=base_url,
+        ) as executor:
+            # start the workers and warm them up
+            await run_sharded_level(
+                executor, concurrency, args.warmup * args.workers
+            )
+            calls = max(args.min_calls, concurrency * args.rounds)
+            result = await run_sharded_level(
+                executor, concurrency, calls
+            )
+        print(format_result(result), flush=True)
+        results.append(result)
+    return results
+
+
+def format_result(result: LevelResult) -> str:
+    return (
+        f"{result.concurrency:>6} concurrent"
+        f" {result.calls:>7} calls"
+        f" {result.errors:>5} errors"
+        f" {result.throughput:>9.1f} calls/s"
+        f"  p50 {result.latency_p50 * 1000:>8.1f} ms"
+        f"  p99 {result.latency_p99 * 1000:>8.1f} ms"
+        f"  cpu {result.cpu_per_call * 1000:>6.3f} ms/call"
+        f"  mem {result.memory_growth / 2**20:>+8.1f} MiB"
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def results_path(name: str) -> Path:
+    path = Path(name)
+    if path.suffix == ".json":
+        return path
+    return RESULTS_DIR / f"{name}.json"
+
+
+def compare(
+    results: list[LevelResult], baseline: dict, tolerance: float
+) -> bool:
+    """Print the change from ``baseline``, return whether anything regressed."""
+    previous = {
+        level["concurrency"]: level for level in baseline["levels"]
+    }
+    regressed = False
+    meta = baseline["meta"]
+    print(
+        f"\ncompared with {meta.get('commit')} ({meta['provider']}):"
+    )
+    for result in results:
+        before = previous.get(result.concurrency)
+        if before is None:
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED.items():
+            old, new = before[metric], getattr(result, metric)
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > tolerance:
+                regressed = True
+                flag = " !"
+            changes.append(f"{metric} {change:+7.1%}{flag}")
+        print(
+            f"{result.concurrency:>6} concurrent  "
+            + "  ".join(changes)
+        )
+    return regressed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n")[0]
+    )
+    parser.add_argument(
+        "--provider", choices=sorted(MODELS), default="openai"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 1000],
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="calls per concurrent worker at each level",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="run the calls on a ShardedExecutor with this many processes",
+    )
+    parser.add_argument("--min-calls", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--latency-p50", type=float, default=0.05)
+    parser.add_argument("--latency-p99", type=float, default=0.2)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--input-tokens", type=int, default=1000)
+    parser.add_argument("--output-tokens", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = FakeProviderConfig(
+        latency_p50=args.latency_p50,
+        latency_p99=args.latency_p99,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        input_tokens=args.input_tokens,
+        output_tokens=args.output_tokens,
+        seed=args.seed,
+    )
+    server = FakeProviderProcess(config)
+    try:
+        base_url = (
+            server.openai_url
+            if args.provider == "openai"
+            else server.anthropic_url
+        )
+        results = asyncio.run(run(args, base_url))
+    finally:
+        server.stop()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "provider": args.provider,
+            "workers": args.workers,
+            "server": asdict(config),
+        },
+        "levels": [asdict(result) for result in results],
+    }
+    if args.save:
+        path = results_path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nsaved to {path}")
+    if args.compare:
+        baseline = json.loads(results_path(args.compare).read_text())
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
-from yalc import LLMModel, create_client
+from yalc import LLMModel, aclose, create_client
 
 load_dotenv()
 
@@ -130,6 +130,7 @@ async def main() -> None:
 
     stop_event.set()
     await spin
+    await aclose()
     state.clear_line()
 
     passed = sum(1 for _, ok, _ in results if ok)
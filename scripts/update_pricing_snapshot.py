@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Regenerate the pricing snapshot bundled with yalc.
+
+Takes every LLMModel from the litellm cost map (the remote one, or with
+--offline the copy installed with litellm) and writes the fields yalc reads
+to yalc/common/pricing_snapshot.json. Models litellm does not list yet are
+filled in from MISSING_MODELS, taken from the providers' pricing pages.
+"""
+
+import argparse
+import json
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+
+from yalc.common.pricing import (
+    CostMap,
+    fetch_remote_cost_map,
+    snapshot_entries,
+)
+from yalc.common.schemas import LLMModel
+
+SNAPSHOT_PATH = (
+    Path(__file__).parent.parent
+    / "yalc"
+    / "common"
+    / "pricing_snapshot.json"
+)
+
+# Anthropic bills cache writes at 1.25x and cache reads at 0.1x the
+# input price
+MISSING_MODELS: CostMap = {
+    LLMModel.claude_sonnet_4_6: {
+        "input_cost_per_token": 3e-06,
+        "output_cost_per_token": 1.5e-05,
+        "cache_creation_input_token_cost": 3.75e-06,
+        "cache_read_input_token_cost": 3e-07,
+        "max_input_tokens": 200000,
+        "max_output_tokens": 64000,
+    },
+    LLMModel.claude_opus_4_6: {
+        "input_cost_per_token": 5e-06,
+        "output_cost_per_token": 2.5e-05,
+        "cache_creation_input_token_cost": 6.25e-06,
+        "cache_read_input_token_cost": 5e-07,
+        "max_input_tokens": 200000,
+        "max_output_tokens": 128000,
+    },
+}
+
+
+def load_litellm_cost_map() -> CostMap:
+    spec = find_spec("litellm")
+    if spec is None or not spec.submodule_search_locations:
+        raise SystemExit("litellm is not installed")
+    path = Path(spec.submodule_search_locations[0])
+    return json.loads(
+        (
+            path / "model_prices_and_context_window_backup.json"
+        ).read_text(encoding="utf-8")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="read the cost map installed with litellm",
+    )
+    args = parser.parse_args()
+
+    cost_map = (
+        load_litellm_cost_map()
+        if args.offline
+        else fetch_remote_cost_map()
+    )
+    snapshot = snapshot_entries({**MISSING_MODELS, **cost_map})
+
+    missing = [model for model in LLMModel if model not in snapshot]
+    if missing:
+        sys.exit(f"No pricing for {', '.join(missing)}")
+
+    SNAPSHOT_PATH.write_text(
+        json.dumps(snapshot, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+    print(f"Wrote {len(snapshot)} models to {SNAPSHOT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,27 +3,33 @@ from unittest.mock import MagicMock
 import pytest
 from pytest_mock import MockerFixture
 
+from yalc.clients.pool import ProviderClientPool
 from yalc.clients.provider_clients.anthropic import AnthropicClient
 from yalc.clients.provider_clients.openai import OpenAIClient
+from yalc.common.pricing import PricingService, PricingTable
 from yalc.common.schemas import LLMModel
 
 
 @pytest.fixture
 def mock_pricing(mocker: MockerFixture) -> None:
-    """Patches the HTTP call that fetches LLM pricing data."""
-    mocker.patch(
-        "yalc.common.pricing.get_model_cost_map",
-        return_value={
+    """Replaces the shared pricing table with fixed, offline prices."""
+    table = PricingTable()
+    table.update(
+        {
             "gpt-4o-mini": {
                 "input_cost_per_token": 0.0001,
                 "output_cost_per_token": 0.0002,
+                "cache_read_input_token_cost": 0.00005,
             },
             "claude-sonnet-4-5": {
                 "input_cost_per_token": 0.0003,
                 "output_cost_per_token": 0.0006,
+                "cache_read_input_token_cost": 0.00003,
+                "cache_creation_input_token_cost": 0.000375,
             },
-        },
+        }
     )
+    mocker.patch.object(PricingService, "table", table)
 
 
 @pytest.fixture
@@ -39,8 +45,13 @@ def anthropic_client() -> AnthropicClient:
 
 
 @pytest.fixture
-def mock_instructor(mocker: MockerFixture) -> None:
-    """Patches the instructor client so no API keys are needed."""
+def fake_api_keys(
+    mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Fake provider API keys and a fresh, unshared client pool."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai-key")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-anthropic-key")
     mocker.patch(
-        "yalc.clients.client_factory.instructor.from_provider"
+        "yalc.clients.client_factory.default_pool",
+        ProviderClientPool(),
     )
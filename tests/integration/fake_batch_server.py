@@ -0,0 +1,225 @@
+import json
+from typing import Any
+
+import httpx
+
+
+class FakeBatchServer:
+    """In-memory provider batch API, served through an ``httpx.MockTransport``.
+
+    Every submitted request is answered with a call of its tool with ``arguments``,
+    except the custom IDs in ``failing``, which error. A batch reports as running
+    for its first ``polls_until_done`` retrievals.
+    """
+
+    def __init__(
+        self,
+        arguments: dict[str, Any],
+        failing: set[str] = set(),
+        polls_until_done: int = 1,
+    ):
+        self.arguments = arguments
+        self.failing = failing
+        self.polls_until_done = polls_until_done
+        self.requests: list[dict[str, Any]] = []
+        self.polls = 0
+
+    def http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handle)
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        raise NotImplementedError
+
+    def _poll(self) -> bool:
+        self.polls += 1
+        return self.polls > self.polls_until_done
+
+
+class FakeOpenAIBatchServer(FakeBatchServer):
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/files":
+            # the multipart body holds the JSONL file line by line
+            self.requests = [
+                json.loads(line)
+                for line in request.content.decode().splitlines()
+                if line.startswith("{")
+            ]
+            return httpx.Response(200, json=self._file("file-in"))
+        if path == "/v1/batches":
+            return httpx.Response(200, json=self._batch("validating"))
+        if path == "/v1/batches/batch_1":
+            status = "completed" if self._poll() else "in_progress"
+            return httpx.Response(200, json=self._batch(status))
+        if path == "/v1/files/file-out/content":
+            return httpx.Response(200, text=self._results(ok=True))
+        if path == "/v1/files/file-err/content":
+            return httpx.Response(200, text=self._results(ok=False))
+        return httpx.Response(404)
+
+    def _file(self, file_id: str) -> dict[str, Any]:
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": 0,
+            "created_at": 0,
+            "filename": "batch.jsonl",
+            "purpose": "batch",
+            "status": "processed",
+        }
+
+    def _batch(self, status: str) -> dict[str, Any]:
+        ended = status == "completed"
+        return {
+            "id": "batch_1",
+            "object": "batch",
+            "endpoint": "/v1/responses",
+            "input_file_id": "file-in",
+            "completion_window": "24h",
+            "status": status,
+            "created_at": 0,
+            "output_file_id": "file-out" if ended else None,
+            "error_file_id": "file-err"
+            if ended and self.failing
+            else None,
+        }
+
+    def _results(self, ok: bool) -> str:
+        lines = []
+        for request in self.requests:
+            custom_id = request["custom_id"]
+            if (custom_id in self.failing) == ok:
+                continue
+            lines.append(
+                json.dumps(
+                    {
+                        "id": f"batch_req_{custom_id}",
+                        "custom_id": custom_id,
+                        "response": self._response(request)
+                        if ok
+                        else {
+                            "status_code": 400,
+                            "body": {"error": {"message": "bad"}},
+                        },
+                        "error": None,
+                    }
+                )
+            )
+        return "\n".join(lines)
+
+    def _response(self, request: dict[str, Any]) -> dict[str, Any]:
+        tool = request["body"]["tools"][0]["name"]
+        return {
+            "status_code": 200,
+            "body": {
+                "id": "resp_1",
+                "object": "response",
+                "created_at": 0,
+                "model": request["body"]["model"],
+                "output": [
+                    {
+                        "type": "function_call",
+                        "id": "fc_1",
+                        "call_id": "call_1",
+                        "name": tool,
+                        "arguments": json.dumps(self.arguments),
+                        "status": "completed",
+                    }
+                ],
+                "parallel_tool_calls": True,
+                "tool_choice": "auto",
+                "tools": [],
+                "usage": {
+                    "input_tokens": 10,
+                    "output_tokens": 5,
+                    "total_tokens": 15,
+                    "input_tokens_details": {"cached_tokens": 0},
+                    "output_tokens_details": {"reasoning_tokens": 0},
+                },
+            },
+        }
+
+
+class FakeAnthropicBatchServer(FakeBatchServer):
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/messages/batches":
+            self.requests = json.loads(request.content)["requests"]
+            return httpx.Response(
+                200, json=self._batch("in_progress")
+            )
+        if path == "/v1/messages/batches/msgbatch_1":
+            status = "ended" if self._poll() else "in_progress"
+            return httpx.Response(200, json=self._batch(status))
+        if path == "/v1/messages/batches/msgbatch_1/results":
+            return httpx.Response(200, text=self._results())
+        return httpx.Response(404)
+
+    def _batch(self, status: str) -> dict[str, Any]:
+        return {
+            "id": "msgbatch_1",
+            "type": "message_batch",
+            "processing_status": status,
+            "request_counts": {
+                "processing": 0,
+                "succeeded": 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2026-01-02T00:00:00Z",
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "ended_at": None,
+            "results_url": "https://api.anthropic.com/v1/messages"
+            "/batches/msgbatch_1/results"
+            if status == "ended"
+            else None,
+        }
+
+    def _results(self) -> str:
+        return "\n".join(
+            json.dumps(
+                {
+                    "custom_id": request["custom_id"],
+                    "result": self._result(request),
+                }
+            )
+            for request in self.requests
+        )
+
+    def _result(self, request: dict[str, Any]) -> dict[str, Any]:
+        if request["custom_id"] in self.failing:
+            return {
+                "type": "errored",
+                "error": {
+                    "type": "error",
+                    "error": {
+                        "type": "invalid_request_error",
+                        "message": "bad",
+                    },
+                },
+            }
+        return {
+            "type": "succeeded",
+            "message": {
+                "id": "msg_1",
+                "type": "message",
+                "role": "assistant",
+                "model": request["params"]["model"],
+                "content": [
+                    {
+                        "type": "tool_use",
+                        "id": "toolu_1",
+                        "name": request["params"]["tools"][0]["name"],
+                        "input": self.arguments,
+                    }
+                ],
+                "stop_reason": "tool_use",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 10, "output_tokens": 5},
+            },
+        }
@@ -1,4 +1,6 @@
+from collections.abc import AsyncGenerator, Mapping
 from dataclasses import dataclass
+from typing import Any
 from unittest.mock import MagicMock
 
 from pydantic import BaseModel
@@ -14,6 +16,14 @@ class FakeRawResponse:
 
 
 class FakeClient(Client):
+    """Client answering every call with ``text="hello"``, without streams or batches."""
+
+    @classmethod
+    def build_instructor_client(
+        cls, *args: Any, **kwargs: Any
+    ) -> Any:
+        return MagicMock()
+
     def __init__(self):
         super().__init__(LLMModel.gpt_4o_mini, MagicMock())
 
@@ -28,10 +38,37 @@ class FakeClient(Client):
         )
 
     def _get_response_stats(
-        self, response: FakeRawResponse
+        self, response: FakeRawResponse, batch: bool = False
     ) -> ResponseStats:
         return self.pricing_service.build_response_stats(
             input_tokens=response.input_tokens,
             output_tokens=response.output_tokens,
             model=self.model,
+            batch=batch,
         )
+
+    def _request_params(
+        self, messages: list[dict[str, str]]
+    ) -> dict[str, Any]:
+        return {"messages": messages}
+
+    def _stream(self, params: dict[str, Any]) -> AsyncGenerator[Any]:
+        raise NotImplementedError
+
+    def _stream_response(self, event: Any, response: Any) -> Any:
+        raise NotImplementedError
+
+    def _batch_request(
+        self, custom_id: str, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        raise NotImplementedError
+
+    async def _submit_batch(
+        self, requests: list[dict[str, Any]]
+    ) -> str:
+        raise NotImplementedError
+
+    async def _batch_outputs(
+        self, batch_id: str
+    ) -> Mapping[str, Any] | None:
+        raise NotImplementedError
@@ -0,0 +1,11 @@
+class FakeClock:
+    """Monotonic clock whose ``sleep`` advances time instantly."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
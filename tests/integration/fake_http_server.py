@@ -0,0 +1,82 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+
+from tests.integration.fake_responses import openai_response
+
+
+class FakeOpenAIServer:
+    """OpenAI Responses endpoint served over HTTP from a background thread.
+
+    Unlike the ``httpx.MockTransport`` fakes, it can be reached from other
+    processes through :attr:`base_url`. Every request is answered with a call
+    of its tool with ``arguments``, except those whose last message is in
+    ``failing``, which get a 400. ``requests`` counts the requests served.
+    """
+
+    def __init__(
+        self, arguments: dict[str, Any], failing: set[str] = set()
+    ):
+        self.arguments = arguments
+        self.failing = failing
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self._handler()
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def answer(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+        body = json.loads(request.content)
+        if body["input"][-1]["content"] in self.failing:
+            return httpx.Response(
+                400, json={"error": {"message": "bad request"}}
+            )
+        return openai_response(request, self.arguments)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers["content-length"])
+                response = server.answer(
+                    httpx.Request(
+                        "POST",
+                        self.path,
+                        content=self.rfile.read(length),
+                    )
+                )
+                self.send_response(response.status_code)
+                self.send_header("content-type", "application/json")
+                self.send_header(
+                    "content-length", str(len(response.content))
+                )
+                self.end_headers()
+                self.wfile.write(response.content)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
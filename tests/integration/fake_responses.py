@@ -0,0 +1,40 @@
+import json
+from typing import Any
+
+import httpx
+
+
+def openai_response(
+    request: httpx.Request, arguments: dict[str, Any]
+) -> httpx.Response:
+    """OpenAI Responses API answer calling the request's tool with ``arguments``."""
+    body = json.loads(request.content)
+    return httpx.Response(
+        200,
+        json={
+            "id": "resp_1",
+            "object": "response",
+            "created_at": 0,
+            "model": body["model"],
+            "output": [
+                {
+                    "type": "function_call",
+                    "id": "fc_1",
+                    "call_id": "call_1",
+                    "name": body["tools"][0]["name"],
+                    "arguments": json.dumps(arguments),
+                    "status": "completed",
+                }
+            ],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": 10,
+                "output_tokens": 5,
+                "total_tokens": 15,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        },
+    )
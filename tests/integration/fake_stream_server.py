@@ -0,0 +1,149 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+
+class FakeStreamServer:
+    """Provider streaming endpoint served through an ``httpx.MockTransport``.
+
+    Answers every request with a call of its tool whose ``arguments`` JSON is
+    streamed in ``chunk_size`` character deltas, one server-sent event at a time.
+    ``sent`` counts the events the client has read so far.
+    """
+
+    def __init__(
+        self, arguments: dict[str, Any], chunk_size: int = 4
+    ):
+        self.arguments = arguments
+        self.chunk_size = chunk_size
+        self.request: dict[str, Any] = {}
+        self.sent = 0
+        self.total = 0
+
+    def http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handle)
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.request = json.loads(request.content)
+        events = self.events(self.request["tools"][0]["name"])
+        self.total = len(events)
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=self._stream(events),
+        )
+
+    def events(self, tool: str) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    def deltas(self) -> list[str]:
+        text = json.dumps(self.arguments)
+        return [
+            text[i : i + self.chunk_size]
+            for i in range(0, len(text), self.chunk_size)
+        ]
+
+    async def _stream(
+        self, events: list[dict[str, Any]]
+    ) -> AsyncIterator[bytes]:
+        for event in events:
+            self.sent += 1
+            yield (
+                f"event: {event['type']}\n"
+                f"data: {json.dumps(event)}\n\n"
+            ).encode()
+
+
+class FakeOpenAIStreamServer(FakeStreamServer):
+    def events(self, tool: str) -> list[dict[str, Any]]:
+        response = {
+            "id": "resp_1",
+            "object": "response",
+            "created_at": 0,
+            "model": self.request["model"],
+            "output": [],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "status": "in_progress",
+        }
+        deltas = [
+            {
+                "type": "response.function_call_arguments.delta",
+                "item_id": "fc_1",
+                "output_index": 0,
+                "delta": delta,
+            }
+            for delta in self.deltas()
+        ]
+        completed = {
+            **response,
+            "status": "completed",
+            "usage": {
+                "input_tokens": 10,
+                "output_tokens": 5,
+                "total_tokens": 15,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+        events = [
+            {"type": "response.created", "response": response},
+            *deltas,
+            {"type": "response.completed", "response": completed},
+        ]
+        for number, event in enumerate(events):
+            event["sequence_number"] = number
+        return events
+
+
+class FakeAnthropicStreamServer(FakeStreamServer):
+    def events(self, tool: str) -> list[dict[str, Any]]:
+        message = {
+            "id": "msg_1",
+            "type": "message",
+            "role": "assistant",
+            "model": self.request["model"],
+            "content": [],
+            "stop_reason": None,
+            "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 1},
+        }
+        return [
+            {"type": "message_start", "message": message},
+            {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {
+                    "type": "tool_use",
+                    "id": "toolu_1",
+                    "name": tool,
+                    "input": {},
+                },
+            },
+            *(
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {
+                        "type": "input_json_delta",
+                        "partial_json": delta,
+                    },
+                }
+                for delta in self.deltas()
+            ),
+            {"type": "content_block_stop", "index": 0},
+            {
+                "type": "message_delta",
+                "delta": {
+                    "stop_reason": "tool_use",
+                    "stop_sequence": None,
+                },
+                "usage": {"output_tokens": 5},
+            },
+            {"type": "message_stop"},
+        ]
@@ -14,7 +14,10 @@ class SimpleResponse(BaseModel):
 
 
 def fake_anthropic_response(
-    input_tokens: int, output_tokens: int
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
 ) -> Message:
     return Message(
         id="msg_1",
@@ -26,6 +29,8 @@ def fake_anthropic_response(
         usage=Usage(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
+            cache_read_input_tokens=cache_read_tokens,
+            cache_creation_input_tokens=cache_write_tokens,
         ),
     )
 
@@ -64,3 +69,35 @@ async def test_anthropic_client_structured_response(
     assert call.context_messages[0].role == LLMRole.USER
     assert call.client_message.role == LLMRole.ASSISTANT
     assert call.client_message.response == result
+
+
+@pytest.mark.anyio
+async def test_anthropic_client_prices_cache_reads_and_writes(
+    anthropic_client: AnthropicClient,
+    mock_pricing,
+):
+    # Arrange
+    raw_response = fake_anthropic_response(
+        input_tokens=10,
+        output_tokens=5,
+        cache_read_tokens=60,
+        cache_write_tokens=30,
+    )
+    anthropic_client.instructor_client.messages.create_with_completion = AsyncMock(
+        return_value=(SimpleResponse(text="hello"), raw_response)
+    )
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    _, call = await anthropic_client.structured_response(
+        SimpleResponse, messages
+    )
+
+    # Assert
+    assert call.input_tokens == 100
+    assert call.cache_read_tokens == 60
+    assert call.cache_write_tokens == 30
+    assert call.cache_hit_ratio == 0.6
+    assert call.input_tokens_cost == pytest.approx(
+        10 * 0.0003 + 60 * 0.00003 + 30 * 0.000375
+    )
@@ -0,0 +1,133 @@
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_batch_server import (
+    FakeAnthropicBatchServer,
+    FakeOpenAIBatchServer,
+)
+from yalc.clients.provider_clients.anthropic import AnthropicClient
+from yalc.clients.provider_clients.openai import OpenAIClient
+from yalc.common.schemas import LLMModel
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+def make_openai_client(server: FakeOpenAIBatchServer) -> OpenAIClient:
+    model = LLMModel.gpt_4o_mini
+    return OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+    )
+
+
+def make_anthropic_client(
+    server: FakeAnthropicBatchServer,
+) -> AnthropicClient:
+    model = LLMModel.claude_sonnet_4_5
+    return AnthropicClient(
+        model,
+        AnthropicClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+    )
+
+
+@pytest.mark.anyio
+async def test_openai_batch_returns_results_at_batch_prices(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeOpenAIBatchServer(
+        arguments={"text": "hello"}, polls_until_done=2
+    )
+    client = make_openai_client(server)
+    jobs = [
+        (SimpleResponse, [{"role": "user", "content": f"Say {i}"}])
+        for i in range(3)
+    ]
+
+    # Act
+    results = await client.structured_response_batch(
+        jobs, poll_interval=0
+    )
+
+    # Assert
+    assert server.polls == 3
+    assert [request["url"] for request in server.requests] == [
+        "/v1/responses"
+    ] * 3
+    assert [result.index for result in results] == [0, 1, 2]
+    for i, result in enumerate(results):
+        assert result.error is None
+        assert isinstance(result.response, SimpleResponse)
+        assert result.response.text == "hello"
+        assert result.call is not None
+        assert result.call.batch
+        assert result.call.context_messages[0].message == f"Say {i}"
+        assert result.call.input_tokens_cost == 10 * 0.0001 * 0.5
+        assert result.call.output_tokens_cost == 5 * 0.0002 * 0.5
+
+
+@pytest.mark.anyio
+async def test_openai_batch_reports_failed_requests_per_item(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeOpenAIBatchServer(
+        arguments={"text": "hello"}, failing={"1"}
+    )
+    client = make_openai_client(server)
+    jobs = [
+        (SimpleResponse, [{"role": "user", "content": "Say hello"}])
+    ] * 3
+
+    # Act
+    results = await client.structured_response_batch(
+        jobs, poll_interval=0
+    )
+
+    # Assert
+    assert [result.error is None for result in results] == [
+        True,
+        False,
+        True,
+    ]
+    assert "bad" in str(results[1].error)
+
+
+@pytest.mark.anyio
+async def test_anthropic_batch_round_trip(mock_pricing):
+    # Arrange
+    server = FakeAnthropicBatchServer(
+        arguments={"text": "hello"}, failing={"0"}
+    )
+    client = make_anthropic_client(server)
+    jobs = [
+        (
+            SimpleResponse,
+            [
+                {"role": "system", "content": "Be brief"},
+                {"role": "user", "content": "Say hello"},
+            ],
+        )
+    ] * 2
+
+    # Act
+    results = await client.structured_response_batch(
+        jobs, poll_interval=0
+    )
+
+    # Assert
+    params = server.requests[1]["params"]
+    assert params["max_tokens"] == 4096
+    assert params["messages"] == [
+        {"role": "user", "content": "Say hello"}
+    ]
+    assert "bad" in str(results[0].error)
+    assert isinstance(results[1].response, SimpleResponse)
+    assert results[1].call is not None
+    assert results[1].call.input_tokens_cost == 10 * 0.0003 * 0.5
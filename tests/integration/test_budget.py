@@ -0,0 +1,178 @@
+import pytest
+from pydantic import BaseModel
+from pytest_mock import MockerFixture
+
+from tests.integration.fake_client import FakeClient
+from yalc.clients.budget import (
+    ContextBudget,
+    OverflowStrategy,
+    TokenCounter,
+)
+from yalc.common.exceptions import ContextWindowExceededError
+from yalc.common.pricing import PricingTable
+from yalc.common.schemas import LLMModel, ModelLimits
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+def message(role: str, tokens: int) -> dict[str, str]:
+    """A message the gpt-4o-mini counter estimates at ``tokens`` tokens."""
+    return {"role": role, "content": "abcd" * (tokens - 4)}
+
+
+CONVERSATION = [
+    message("system", 10),
+    message("user", 100),
+    message("assistant", 100),
+    message("user", 100),
+    message("assistant", 100),
+    message("user", 20),
+]
+
+
+def budget_client(budget: ContextBudget) -> FakeClient:
+    client = FakeClient()
+    client.context_budget = budget
+    client.token_counter = TokenCounter(LLMModel.gpt_4o_mini)
+    return client
+
+
+def test_token_counter_calibrates_towards_reported_usage():
+    # Arrange
+    counter = TokenCounter(LLMModel.gpt_4o_mini, smoothing=0.5)
+    messages = [message("user", 1000)]
+
+    # Act
+    before = counter.count(messages)
+    counter.calibrate(before, 2 * before)
+    counter.calibrate(10, 1000)
+
+    # Assert
+    assert before == 1000
+    assert counter.count(messages) == 1500
+
+
+def test_input_limit_reserves_room_for_the_answer():
+    # Arrange
+    budget = ContextBudget(reserved_output_tokens=4096)
+
+    # Act / Assert
+    assert budget.input_limit(ModelLimits(128000, 16384)) == 123904
+    assert budget.input_limit(ModelLimits(8000, 1000)) == 7000
+    assert budget.input_limit(ModelLimits()) is None
+
+
+def test_pricing_table_knows_model_limits():
+    # Act
+    limits = PricingTable().limits(LLMModel.gpt_4o_mini)
+
+    # Assert
+    assert limits == ModelLimits(128000, 16384)
+
+
+@pytest.mark.anyio
+async def test_oversized_conversation_is_rejected_before_sending(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    client = budget_client(ContextBudget(max_input_tokens=300))
+    provider = mocker.spy(client, "_response")
+
+    # Act / Assert
+    with pytest.raises(ContextWindowExceededError) as error:
+        await client.structured_response(SimpleResponse, CONVERSATION)
+    assert error.value.tokens == 430
+    assert provider.call_count == 0
+
+
+@pytest.mark.anyio
+async def test_trim_drops_the_oldest_messages(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    client = budget_client(
+        ContextBudget(
+            overflow=OverflowStrategy.TRIM, max_input_tokens=300
+        )
+    )
+    provider = mocker.spy(client, "_response")
+
+    # Act
+    _, call = await client.structured_response(
+        SimpleResponse, CONVERSATION
+    )
+
+    # Assert
+    sent = provider.call_args.args[1]
+    assert sent == [CONVERSATION[0], *CONVERSATION[3:]]
+    assert len(call.context_messages) == 4
+
+
+@pytest.mark.anyio
+async def test_trim_keeps_the_conversation_starting_with_a_user_message(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    client = budget_client(
+        ContextBudget(
+            overflow=OverflowStrategy.TRIM, max_input_tokens=340
+        )
+    )
+    provider = mocker.spy(client, "_response")
+
+    # Act
+    await client.structured_response(SimpleResponse, CONVERSATION)
+
+    # Assert
+    sent = provider.call_args.args[1]
+    assert sent == [CONVERSATION[0], *CONVERSATION[3:]]
+
+
+@pytest.mark.anyio
+async def test_summarize_replaces_the_oldest_messages(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    summarized: list[list[dict[str, str]]] = []
+
+    async def summarize(messages):
+        summarized.append(messages)
+        return {"role": "user", "content": "Summary"}
+
+    client = budget_client(
+        ContextBudget(
+            overflow=OverflowStrategy.SUMMARIZE,
+            max_input_tokens=300,
+            summarize=summarize,
+            summary_tokens=50,
+        )
+    )
+    provider = mocker.spy(client, "_response")
+
+    # Act
+    await client.structured_response(SimpleResponse, CONVERSATION)
+
+    # Assert
+    assert summarized == [CONVERSATION[1:3]]
+    assert provider.call_args.args[1] == [
+        CONVERSATION[0],
+        {"role": "user", "content": "Summary"},
+        *CONVERSATION[3:],
+    ]
+
+
+def test_estimate_call_costs_the_estimated_tokens(mock_pricing):
+    # Arrange
+    client = FakeClient()
+
+    # Act
+    stats = client.estimate_call(
+        [message("user", 100)], output_tokens=10
+    )
+
+    # Assert
+    assert stats.input_tokens == 100
+    assert stats.input_tokens_cost == pytest.approx(100 * 0.0001)
+    assert stats.output_tokens_cost == pytest.approx(10 * 0.0002)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+from yalc.clients.dispatch import DispatchMode, StrategyDispatcher
+from yalc.clients.schemas import ClientCall, ClientMessage
+from yalc.clients.sinks import (
+    JSONLSink,
+    MetadataBatch,
+    MetadataSink,
+    SQLiteSink,
+)
+from yalc.clients.strategy import BufferedMetadataStrategy
+from yalc.common.schemas import LLMRole
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class SimpleContext(BaseModel):
+    user_id: int
+
+
+class ListSink(MetadataSink):
+    def __init__(self):
+        self.batches: list[MetadataBatch] = []
+
+    async def write(self, batch: MetadataBatch) -> None:
+        self.batches.append(batch)
+
+
+class FailingSink(MetadataSink):
+    async def write(self, batch: MetadataBatch) -> None:
+        raise ConnectionError("database down")
+
+
+def make_call() -> ClientCall:
+    return ClientCall(
+        context_messages=[],
+        client_message=ClientMessage(
+            response=SimpleResponse(text="hello"),
+            role=LLMRole.ASSISTANT,
+        ),
+        model_name="gpt-4o-mini",
+        input_tokens=10,
+        output_tokens=5,
+        input_tokens_cost=0.001,
+        output_tokens_cost=0.002,
+    )
+
+
+@pytest.mark.anyio
+async def test_buffered_strategy_writes_batch_once_full():
+    # Arrange
+    sink = ListSink()
+    strategy = BufferedMetadataStrategy(sink, max_batch_size=2)
+    await strategy.handle(make_call(), SimpleContext(user_id=1))
+
+    # Act
+    await strategy.handle(make_call(), SimpleContext(user_id=2))
+    await asyncio.sleep(0)
+
+    # Assert
+    assert len(sink.batches) == 1
+    assert len(sink.batches[0]) == 2
+    assert strategy.written == 2
+    assert strategy.queued == 0
+    await strategy.aclose()
+
+
+@pytest.mark.anyio
+async def test_buffered_strategy_writes_partial_batch_on_close():
+    # Arrange
+    sink = ListSink()
+    strategy = BufferedMetadataStrategy(sink, max_batch_size=10)
+    await strategy.handle(make_call(), SimpleContext(user_id=1))
+
+    # Act
+    await strategy.aclose()
+
+    # Assert
+    assert len(sink.batches) == 1
+    assert strategy.queued == 0
+
+
+@pytest.mark.anyio
+async def test_buffered_strategy_drops_calls_once_buffer_is_full():
+    # Arrange
+    strategy = BufferedMetadataStrategy(
+        ListSink(), max_batch_size=10, max_buffer_size=1
+    )
+    await strategy.handle(make_call(), SimpleContext(user_id=1))
+
+    # Act
+    await strategy.handle(make_call(), SimpleContext(user_id=2))
+
+    # Assert
+    assert strategy.queued == 1
+    assert strategy.dropped == 1
+    await strategy.aclose()
+
+
+@pytest.mark.anyio
+async def test_buffered_strategy_counts_failed_writes_as_dropped():
+    # Arrange
+    strategy = BufferedMetadataStrategy(FailingSink())
+    await strategy.handle(make_call(), SimpleContext(user_id=1))
+
+    # Act
+    await strategy.aclose()
+
+    # Assert
+    assert strategy.dropped == 1
+    assert strategy.written == 0
+
+
+@pytest.mark.anyio
+async def test_buffered_strategy_flushes_under_thread_dispatch():
+    # Arrange
+    sink = ListSink()
+    strategy = BufferedMetadataStrategy(sink, max_batch_size=2)
+    dispatcher = StrategyDispatcher(DispatchMode.THREAD)
+
+    # Act
+    for user_id in range(2):
+        await dispatcher.dispatch(
+            [strategy], make_call(), SimpleContext(user_id=user_id)
+        )
+    await dispatcher.flush()
+    await asyncio.sleep(0)
+
+    # Assert
+    assert strategy.written == 2
+    assert strategy.dropped == 0
+    await dispatcher.aclose()
+    await strategy.aclose()
+
+
+@pytest.mark.anyio
+async def test_jsonl_sink_writes_call_with_response_fields(
+    tmp_path: Path,
+):
+    # Arrange
+    path = tmp_path / "calls.jsonl"
+    sink = JSONLSink(path)
+
+    # Act
+    await sink.write([(make_call(), SimpleContext(user_id=1))])
+
+    # Assert
+    record = json.loads(path.read_text())
+    assert record["call"]["client_message"]["response"] == {
+        "text": "hello"
+    }
+    assert record["call"]["input_tokens"] == 10
+    assert record["context"] == {"user_id": 1}
+
+
+@pytest.mark.anyio
+async def test_sqlite_sink_inserts_one_row_per_call(tmp_path: Path):
+    # Arrange
+    path = tmp_path / "calls.db"
+    sink = SQLiteSink(path)
+
+    # Act
+    await sink.write(
+        [
+            (make_call(), SimpleContext(user_id=1)),
+            (make_call(), None),
+        ]
+    )
+    await sink.aclose()
+
+    # Assert
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute(
+            "SELECT model_name, input_tokens, context FROM client_calls"
+        ).fetchall()
+    assert rows == [
+        ("gpt-4o-mini", 10, '{"user_id": 1}'),
+        ("gpt-4o-mini", 10, "null"),
+    ]
+
+
+def test_sqlite_sink_rejects_table_names_that_are_not_identifiers(
+    tmp_path: Path,
+):
+    # Act / Assert
+    with pytest.raises(ValueError, match="Invalid table name"):
+        SQLiteSink(tmp_path / "calls.db", table="calls; DROP TABLE x")
@@ -0,0 +1,188 @@
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+from pytest_mock import MockerFixture
+
+from tests.integration.fake_clock import FakeClock
+from tests.integration.fake_client import FakeClient
+from yalc.clients.cache import (
+    MemoryResponseCache,
+    SQLiteResponseCache,
+    cache_key,
+)
+from yalc.clients.schemas import ClientCall, ClientMessage
+from yalc.common.schemas import LLMModel, LLMRole
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class OtherResponse(BaseModel):
+    text: str
+    score: int
+
+
+def make_call(parsed: BaseModel) -> ClientCall:
+    return ClientCall(
+        context_messages=[],
+        client_message=ClientMessage(
+            response=parsed, role=LLMRole.ASSISTANT
+        ),
+        model_name="gpt-4o-mini",
+        input_tokens=10,
+        output_tokens=5,
+        input_tokens_cost=0.001,
+        output_tokens_cost=0.002,
+    )
+
+
+@pytest.mark.anyio
+async def test_client_returns_cached_response_with_zero_cost(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    client = FakeClient()
+    client.response_cache = MemoryResponseCache()
+    provider = mocker.spy(client, "_response")
+    messages = [{"role": "user", "content": "Say hello"}]
+    first, first_call = await client.structured_response(
+        SimpleResponse, messages
+    )
+
+    # Act
+    second, second_call = await client.structured_response(
+        SimpleResponse, messages
+    )
+
+    # Assert
+    assert provider.call_count == 1
+    assert second == first
+    assert first_call.cache_hit is False
+    assert second_call.cache_hit is True
+    assert second_call.input_tokens == 10
+    assert second_call.input_tokens_cost == 0
+    assert second_call.output_tokens_cost == 0
+
+
+@pytest.mark.anyio
+async def test_client_calls_provider_when_cache_is_bypassed(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    client = FakeClient()
+    client.response_cache = MemoryResponseCache()
+    provider = mocker.spy(client, "_response")
+    messages = [{"role": "user", "content": "Say hello"}]
+    await client.structured_response(SimpleResponse, messages)
+
+    # Act
+    _, call = await client.structured_response(
+        SimpleResponse, messages, use_cache=False
+    )
+
+    # Assert
+    assert provider.call_count == 2
+    assert call.cache_hit is False
+
+
+@pytest.mark.anyio
+async def test_memory_cache_is_not_changed_by_mutating_responses():
+    # Arrange
+    cache = MemoryResponseCache()
+    parsed = SimpleResponse(text="hello")
+    await cache.set("key", parsed, make_call(parsed))
+    parsed.text = "changed on set"
+
+    # Act
+    first = await cache.get("key", SimpleResponse)
+    assert first is not None
+    first[0].text = "changed on get"
+    second = await cache.get("key", SimpleResponse)
+
+    # Assert
+    assert second is not None
+    response, call = second
+    assert response.text == "hello"
+    assert call.client_message.response is response
+
+
+def test_cache_key_differs_per_response_schema():
+    # Arrange
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    simple_key = cache_key(
+        LLMModel.gpt_4o_mini, SimpleResponse, messages
+    )
+    other_key = cache_key(
+        LLMModel.gpt_4o_mini, OtherResponse, messages
+    )
+
+    # Assert
+    assert simple_key != other_key
+
+
+@pytest.mark.anyio
+async def test_sqlite_cache_round_trips_response_and_call(
+    tmp_path: Path,
+):
+    # Arrange
+    cache = SQLiteResponseCache(tmp_path / "cache.db")
+    parsed = SimpleResponse(text="hello")
+    await cache.set("key", parsed, make_call(parsed))
+
+    # Act
+    cached = await cache.get("key", SimpleResponse)
+
+    # Assert
+    assert cached is not None
+    cached_parsed, cached_call = cached
+    assert cached_parsed == parsed
+    assert cached_call.client_message.response == parsed
+    assert cached_call.input_tokens == 10
+
+
+@pytest.mark.anyio
+async def test_sqlite_cache_expires_entries_after_ttl(tmp_path: Path):
+    # Arrange
+    clock = FakeClock(now=1000)
+    cache = SQLiteResponseCache(
+        tmp_path / "cache.db", ttl=60, clock=clock
+    )
+    parsed = SimpleResponse(text="hello")
+    await cache.set("key", parsed, make_call(parsed))
+    clock.now = 1060
+
+    # Act
+    cached = await cache.get("key", SimpleResponse)
+
+    # Assert
+    assert cached is None
+
+
+@pytest.mark.anyio
+async def test_sqlite_cache_evicts_least_recently_read_entry(
+    tmp_path: Path,
+):
+    # Arrange
+    clock = FakeClock(now=1000)
+    cache = SQLiteResponseCache(
+        tmp_path / "cache.db", max_entries=2, clock=clock
+    )
+    parsed = SimpleResponse(text="hello")
+    await cache.set("old", parsed, make_call(parsed))
+    clock.now = 1001
+    await cache.set("never-read", parsed, make_call(parsed))
+    clock.now = 1002
+    await cache.get("old", SimpleResponse)
+    clock.now = 1003
+
+    # Act
+    await cache.set("new", parsed, make_call(parsed))
+
+    # Assert
+    assert await cache.get("old", SimpleResponse) is not None
+    assert await cache.get("never-read", SimpleResponse) is None
+    assert await cache.get("new", SimpleResponse) is not None
@@ -1,7 +1,10 @@
+import asyncio
+
 import pytest
 from pydantic import BaseModel
+from pytest_mock import MockerFixture
 
-from tests.integration.fake_client import FakeClient
+from tests.integration.fake_client import FakeClient, FakeRawResponse
 from yalc.clients.schemas import ClientCall
 from yalc.clients.strategy import ClientMetadataStrategy
 from yalc.common.schemas import LLMModel, LLMRole
@@ -41,6 +44,43 @@ async def test_client_with_returned_client_call(mock_pricing):
     assert call.client_message.response == result
 
 
+@pytest.mark.anyio
+async def test_client_call_keeps_a_snapshot_of_the_messages(
+    mock_pricing,
+):
+    # Arrange
+    client = FakeClient()
+    messages = [{"role": "user", "content": "Say hello"}]
+    _, call = await client.structured_response(
+        SimpleResponse, messages
+    )
+
+    # Act
+    messages.append({"role": "assistant", "content": "hello"})
+    restored = ClientCall.model_validate_json(call.model_dump_json())
+
+    # Assert
+    assert len(call.context_messages) == 1
+    assert restored.context_messages == call.context_messages
+    assert "messages" not in call.model_dump()
+
+
+@pytest.mark.anyio
+async def test_client_without_stored_context(mock_pricing):
+    # Arrange
+    client = FakeClient()
+    client.store_context = False
+
+    # Act
+    _, call = await client.structured_response(
+        SimpleResponse, [{"role": "user", "content": "Say hello"}]
+    )
+
+    # Assert
+    assert call.context_messages == []
+    assert call.input_tokens == 10
+
+
 @pytest.mark.anyio
 async def test_client_calls_all_strategies_and_returns_parsed_response(
     mock_pricing,
@@ -102,3 +142,94 @@ async def test_client_calls_all_strategies_and_returns_parsed_response(
 
     assert call_b == call_a
     assert context_b == context
+
+
+@pytest.mark.anyio
+async def test_structured_response_many_returns_results_in_input_order(
+    mock_pricing,
+):
+    # Arrange
+    client = FakeClient()
+    messages_batch = [
+        [{"role": "user", "content": "first"}],
+        [{"role": "user", "content": "second"}],
+    ]
+
+    # Act
+    results = await client.structured_response_many(
+        SimpleResponse, messages_batch
+    )
+
+    # Assert
+    assert [result.index for result in results] == [0, 1]
+    assert results[0].response == SimpleResponse(text="hello")
+    assert results[0].call is not None
+    assert results[0].call.context_messages[0].message == "first"
+    assert results[1].call is not None
+    assert results[1].call.context_messages[0].message == "second"
+
+
+@pytest.mark.anyio
+async def test_structured_response_many_isolates_failing_items(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    client = FakeClient()
+    error = RuntimeError("provider down")
+    mocker.patch.object(
+        client,
+        "_response",
+        side_effect=[
+            error,
+            (SimpleResponse(text="hello"), FakeRawResponse(10, 5)),
+        ],
+    )
+    messages_batch = [
+        [{"role": "user", "content": "fails"}],
+        [{"role": "user", "content": "succeeds"}],
+    ]
+
+    # Act
+    results = await client.structured_response_many(
+        SimpleResponse, messages_batch, max_concurrency=1
+    )
+
+    # Assert
+    assert results[0].error is error
+    assert results[0].response is None
+    assert results[1].error is None
+    assert results[1].response == SimpleResponse(text="hello")
+
+
+@pytest.mark.anyio
+async def test_structured_response_as_completed_limits_calls_in_flight(
+    mocker: MockerFixture,
+):
+    # Arrange
+    client = FakeClient()
+    never_set = asyncio.Event()
+
+    async def wait_forever(*args):
+        await never_set.wait()
+
+    response = mocker.patch.object(
+        client, "_response", side_effect=wait_forever
+    )
+    messages_batch = iter(
+        [
+            [{"role": "user", "content": "first"}],
+            [{"role": "user", "content": "second"}],
+            [{"role": "user", "content": "third"}],
+        ]
+    )
+    results = client.structured_response_as_completed(
+        SimpleResponse, messages_batch, max_concurrency=2
+    )
+
+    # Act
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(anext(results), timeout=0.1)
+
+    # Assert
+    assert response.call_count == 2
+    assert next(messages_batch)[0]["content"] == "third"
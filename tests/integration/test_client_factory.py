@@ -1,18 +1,59 @@
+import pytest
+
 from yalc.clients.client_factory import create_client
+from yalc.clients.pool import ProviderClientPool
 from yalc.clients.provider_clients.anthropic import AnthropicClient
 from yalc.clients.provider_clients.openai import OpenAIClient
 from yalc.common.schemas import LLMModel
 
 
 def test_create_client_returns_openai_client_for_openai_model(
-    mock_instructor,
+    fake_api_keys,
 ):
     client = create_client(LLMModel.gpt_4o_mini)
     assert isinstance(client, OpenAIClient)
 
 
 def test_create_client_returns_anthropic_client_for_anthropic_model(
-    mock_instructor,
+    fake_api_keys,
 ):
     client = create_client(LLMModel.claude_sonnet_4_5)
     assert isinstance(client, AnthropicClient)
+
+
+def test_create_client_shares_provider_client_across_same_provider_models(
+    fake_api_keys,
+):
+    # Act
+    first = create_client(LLMModel.gpt_4o_mini)
+    second = create_client(LLMModel.gpt_5_mini)
+
+    # Assert
+    assert first.instructor_client is second.instructor_client
+
+
+def test_create_client_uses_separate_provider_clients_per_api_key(
+    fake_api_keys,
+):
+    # Act
+    first = create_client(LLMModel.gpt_4o_mini, api_key="key-a")
+    second = create_client(LLMModel.gpt_4o_mini, api_key="key-b")
+
+    # Assert
+    assert first.instructor_client is not second.instructor_client
+
+
+@pytest.mark.anyio
+async def test_pool_aclose_drops_cached_provider_clients(
+    fake_api_keys,
+):
+    # Arrange
+    pool = ProviderClientPool()
+    before = create_client(LLMModel.gpt_4o_mini, pool=pool)
+
+    # Act
+    await pool.aclose()
+    after = create_client(LLMModel.gpt_4o_mini, pool=pool)
+
+    # Assert
+    assert before.instructor_client is not after.instructor_client
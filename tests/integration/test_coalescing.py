@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+from pytest_mock import MockerFixture
+
+from tests.integration.fake_client import FakeClient, FakeRawResponse
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+@pytest.mark.anyio
+async def test_client_coalesces_identical_concurrent_calls(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    async def slow_response(*args):
+        await asyncio.sleep(0)
+        return SimpleResponse(text="hello"), FakeRawResponse(10, 5)
+
+    client = FakeClient()
+    client.coalesce_requests = True
+    provider = mocker.patch.object(
+        client, "_response", side_effect=slow_response
+    )
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    (first, first_call), (second, second_call) = await asyncio.gather(
+        client.structured_response(SimpleResponse, messages),
+        client.structured_response(SimpleResponse, messages),
+    )
+
+    # Assert
+    assert provider.call_count == 1
+    assert first == second
+    assert first is not second
+    assert first_call.coalesced is False
+    assert first_call.input_tokens_cost == 10 * 0.0001
+    assert second_call.coalesced is True
+    assert second_call.input_tokens == 10
+    assert second_call.input_tokens_cost == 0
+    assert second_call.client_message.response is second
+
+
+@pytest.mark.anyio
+async def test_coalesced_calls_share_the_provider_error(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    error = RuntimeError("provider down")
+
+    async def failing_response(*args):
+        await asyncio.sleep(0)
+        raise error
+
+    client = FakeClient()
+    client.coalesce_requests = True
+    mocker.patch.object(
+        client, "_response", side_effect=failing_response
+    )
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    results = await asyncio.gather(
+        client.structured_response(SimpleResponse, messages),
+        client.structured_response(SimpleResponse, messages),
+        return_exceptions=True,
+    )
+
+    # Assert
+    assert results == [error, error]
+
+
+@pytest.mark.anyio
+async def test_clients_with_different_instructor_clients_do_not_coalesce(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    async def slow_response(*args):
+        await asyncio.sleep(0)
+        return SimpleResponse(text="hello"), FakeRawResponse(10, 5)
+
+    clients = [FakeClient(), FakeClient()]
+    providers = []
+    for client in clients:
+        client.coalesce_requests = True
+        providers.append(
+            mocker.patch.object(
+                client, "_response", side_effect=slow_response
+            )
+        )
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    results = await asyncio.gather(
+        *(
+            client.structured_response(SimpleResponse, messages)
+            for client in clients
+        )
+    )
+
+    # Assert
+    assert [provider.call_count for provider in providers] == [1, 1]
+    assert not any(llm_call.coalesced for _, llm_call in results)
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_client import FakeClient
+from yalc.clients.dispatch import DispatchMode, StrategyDispatcher
+from yalc.clients.schemas import ClientCall
+from yalc.clients.strategy import ClientMetadataStrategy
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class SimpleContext(BaseModel):
+    user_id: int
+
+
+class AsyncRecordingStrategy(ClientMetadataStrategy[SimpleContext]):
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.gate = gate
+        self.handled: list[SimpleContext | None] = []
+
+    async def handle(
+        self, call: ClientCall, context: SimpleContext | None
+    ):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.handled.append(context)
+
+
+class ThreadRecordingStrategy(ClientMetadataStrategy[SimpleContext]):
+    def __init__(self):
+        self.thread_ids: list[int] = []
+
+    def handle(self, call: ClientCall, context: SimpleContext | None):
+        self.thread_ids.append(threading.get_ident())
+
+
+@pytest.mark.anyio
+async def test_client_awaits_async_strategy_inline(mock_pricing):
+    # Arrange
+    strategy = AsyncRecordingStrategy()
+    client = FakeClient()
+    client.metadata_strategies = [strategy]
+    context = SimpleContext(user_id=42)
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    await client.structured_response(
+        SimpleResponse, messages, context
+    )
+
+    # Assert
+    assert strategy.handled == [context]
+
+
+@pytest.mark.anyio
+async def test_background_dispatcher_returns_before_strategy_finishes(
+    mock_pricing,
+):
+    # Arrange
+    gate = asyncio.Event()
+    strategy = AsyncRecordingStrategy(gate)
+    client = FakeClient()
+    client.metadata_strategies = [strategy]
+    client.dispatcher = StrategyDispatcher(DispatchMode.BACKGROUND)
+    context = SimpleContext(user_id=42)
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    await client.structured_response(
+        SimpleResponse, messages, context
+    )
+    handled_before_flush = list(strategy.handled)
+    gate.set()
+    await client.dispatcher.aclose()
+
+    # Assert
+    assert handled_before_flush == []
+    assert strategy.handled == [context]
+
+
+@pytest.mark.anyio
+async def test_thread_dispatcher_runs_sync_strategy_off_the_event_loop(
+    mock_pricing,
+):
+    # Arrange
+    strategy = ThreadRecordingStrategy()
+    client = FakeClient()
+    client.metadata_strategies = [strategy]
+    client.dispatcher = StrategyDispatcher(DispatchMode.THREAD)
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    await client.structured_response(
+        SimpleResponse, messages, SimpleContext(user_id=42)
+    )
+    await client.dispatcher.flush()
+
+    # Assert
+    assert strategy.thread_ids != [threading.get_ident()]
+    assert len(strategy.thread_ids) == 1
+
+
+@pytest.mark.anyio
+async def test_background_dispatcher_applies_backpressure_when_queue_is_full(
+    mock_pricing,
+):
+    # Arrange
+    gate = asyncio.Event()
+    strategy = AsyncRecordingStrategy(gate)
+    client = FakeClient()
+    client.metadata_strategies = [strategy]
+    client.dispatcher = StrategyDispatcher(
+        DispatchMode.BACKGROUND, max_queue_size=1
+    )
+    context = SimpleContext(user_id=42)
+    messages = [{"role": "user", "content": "Say hello"}]
+    # picked up by the worker, which then blocks on the gate
+    await client.structured_response(
+        SimpleResponse, messages, context
+    )
+    await asyncio.sleep(0)
+    # fills the queue
+    await client.structured_response(
+        SimpleResponse, messages, context
+    )
+
+    # Act
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(
+            client.structured_response(
+                SimpleResponse, messages, context
+            ),
+            timeout=0.1,
+        )
+
+    # Assert
+    assert client.dispatcher.queued == 1
+    gate.set()
+    await client.dispatcher.aclose()
@@ -0,0 +1,201 @@
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_client import FakeClient
+from tests.integration.fake_clock import FakeClock
+from yalc.clients.health import (
+    CircuitBreaker,
+    CircuitState,
+    HealthTracker,
+    LatencySketch,
+)
+from yalc.clients.retry import RetryPolicy
+from yalc.clients.scheduler import RequestScheduler
+from yalc.common.exceptions import CircuitOpenError
+from yalc.common.schemas import LLMModel
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class FailingClient(FakeClient):
+    """FakeClient whose provider fails with a transient error until ``healthy``."""
+
+    def __init__(self, circuit_breaker: CircuitBreaker):
+        super().__init__()
+        self.retry_policy = RetryPolicy(max_transport_retries=0)
+        self.circuit_breaker = circuit_breaker
+        self.health = circuit_breaker.tracker
+        self.healthy = False
+        self.calls = 0
+
+    async def _response(self, response_type, messages):
+        self.calls += 1
+        if not self.healthy:
+            raise ConnectionError("provider down")
+        return await super()._response(response_type, messages)
+
+    def _is_transient(self, error):
+        return isinstance(error, ConnectionError)
+
+
+MESSAGES = [{"role": "user", "content": "Say hello"}]
+
+
+def breaker_with_clock(clock: FakeClock, **options) -> CircuitBreaker:
+    return CircuitBreaker(
+        LLMModel.gpt_4o_mini,
+        tracker=HealthTracker(clock=clock),
+        clock=clock,
+        **options,
+    )
+
+
+def test_latency_sketch_quantiles_are_within_relative_accuracy():
+    # Arrange
+    sketch = LatencySketch(relative_accuracy=0.01)
+    latencies = [i / 1000 for i in range(1, 10001)]
+
+    # Act
+    for latency in latencies:
+        sketch.add(latency)
+
+    # Assert
+    for q in [0.5, 0.9, 0.99]:
+        exact = latencies[int(q * (len(latencies) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+
+def test_health_tracker_forgets_calls_outside_the_window():
+    # Arrange
+    clock = FakeClock()
+    tracker = HealthTracker(window=60, slices=6, clock=clock)
+    tracker.record_failure()
+    clock.now = 30
+    tracker.record_success(0.2)
+
+    # Act
+    before = tracker.error_rate()
+    clock.now = 65
+    after = tracker.error_rate()
+
+    # Assert
+    assert before == 0.5
+    assert after == 0.0
+    assert tracker.calls() == 1
+    assert tracker.latency(0.5) == pytest.approx(0.2, rel=0.01)
+
+
+def test_breaker_opens_on_sustained_failures_and_fails_fast():
+    # Arrange
+    clock = FakeClock()
+    breaker = breaker_with_clock(clock, min_calls=4)
+
+    # Act
+    for _ in range(4):
+        breaker.before_call()
+        breaker.tracker.record_failure()
+        breaker.after_call(True)
+
+    # Assert
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_after == 30
+
+
+@pytest.mark.parametrize(
+    ("probe_failed", "state"),
+    [(False, CircuitState.CLOSED), (True, CircuitState.OPEN)],
+)
+def test_breaker_half_opens_to_probe_the_model(
+    probe_failed: bool, state: CircuitState
+):
+    # Arrange
+    clock = FakeClock()
+    breaker = breaker_with_clock(clock, min_calls=1)
+    breaker.tracker.record_failure()
+    breaker.after_call(True)
+    clock.now = 31
+
+    # Act
+    trial = breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.after_call(probe_failed, trial)
+
+    # Assert
+    assert breaker.state == state
+
+
+def test_breaker_only_counts_half_open_trials():
+    # Arrange
+    clock = FakeClock()
+    breaker = breaker_with_clock(clock, min_calls=1)
+    admitted_while_closed = breaker.before_call()
+    breaker.tracker.record_failure()
+    breaker.after_call(True)
+    clock.now = 31
+    trial = breaker.before_call()
+
+    # Act
+    breaker.after_call(False, admitted_while_closed)
+
+    # Assert
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.after_call(False, trial)
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.anyio
+async def test_client_stops_calling_a_failing_model(mock_pricing):
+    # Arrange
+    clock = FakeClock()
+    client = FailingClient(breaker_with_clock(clock, min_calls=3))
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await client.structured_response(
+                SimpleResponse, MESSAGES, use_cache=False
+            )
+
+    # Act / Assert
+    with pytest.raises(CircuitOpenError):
+        await client.structured_response(
+            SimpleResponse, MESSAGES, use_cache=False
+        )
+    assert client.calls == 3
+
+    clock.now = 31
+    client.healthy = True
+    result, _ = await client.structured_response(
+        SimpleResponse, MESSAGES, use_cache=False
+    )
+    assert result.text == "hello"
+    assert client.circuit_breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.anyio
+async def test_calls_timing_out_in_the_queue_do_not_count_as_failures(
+    mock_pricing,
+):
+    # Arrange
+    clock = FakeClock()
+    client = FailingClient(breaker_with_clock(clock, min_calls=1))
+    client.retry_policy = RetryPolicy(deadline=0.01)
+    client.scheduler = RequestScheduler(max_in_flight=1)
+    slot = await client.scheduler.acquire()
+
+    # Act
+    with pytest.raises(TimeoutError):
+        await client.structured_response(
+            SimpleResponse, MESSAGES, use_cache=False
+        )
+    slot.release()
+
+    # Assert
+    assert client.calls == 0
+    assert client.health.calls() == 0
+    assert client.circuit_breaker.state == CircuitState.CLOSED
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+# eagerly importing any of these costs seconds at startup
+HEAVY_PACKAGES = {"litellm", "instructor", "openai", "anthropic"}
+
+# an order of magnitude above what the lazy imports take, and well
+# below the eager ones
+IMPORT_BUDGET_SECONDS = 1.0
+
+SCRIPT = """
+import time
+
+started = time.perf_counter()
+import yalc
+from yalc.common.pricing import load_bundled_cost_map
+
+yalc.LLMModel, yalc.ClientCall, yalc.ClientMetadataStrategy
+load_bundled_cost_map()
+print(time.perf_counter() - started)
+"""
+
+
+def imported_packages(importtime_output: str) -> set[str]:
+    return {
+        line.split("|")[-1].strip().split(".")[0]
+        for line in importtime_output.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_import_yalc_skips_provider_sdks_and_litellm():
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Assert
+    assert not imported_packages(result.stderr) & HEAVY_PACKAGES
+    assert float(result.stdout) < IMPORT_BUDGET_SECONDS
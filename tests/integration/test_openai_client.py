@@ -19,7 +19,10 @@ class SimpleResponse(BaseModel):
 
 
 def fake_openai_response(
-    input_tokens: int, output_tokens: int
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+    reasoning_tokens: int = 0,
 ) -> Response:
     return Response(
         id="resp_1",
@@ -34,9 +37,11 @@ def fake_openai_response(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             total_tokens=input_tokens + output_tokens,
-            input_tokens_details=InputTokensDetails(cached_tokens=0),
+            input_tokens_details=InputTokensDetails(
+                cached_tokens=cached_tokens
+            ),
             output_tokens_details=OutputTokensDetails(
-                reasoning_tokens=0
+                reasoning_tokens=reasoning_tokens
             ),
         ),
     )
@@ -75,3 +80,37 @@ async def test_openai_client_structured_response(
     assert call.context_messages[0].role == LLMRole.USER
     assert call.client_message.role == LLMRole.ASSISTANT
     assert call.client_message.response == result
+
+
+@pytest.mark.anyio
+async def test_openai_client_prices_cached_and_reasoning_tokens(
+    openai_client: OpenAIClient,
+    mock_pricing,
+):
+    # Arrange
+    raw_response = fake_openai_response(
+        input_tokens=100,
+        output_tokens=50,
+        cached_tokens=80,
+        reasoning_tokens=30,
+    )
+    openai_client.instructor_client.responses.create_with_completion = AsyncMock(
+        return_value=(SimpleResponse(text="hello"), raw_response)
+    )
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    _, call = await openai_client.structured_response(
+        SimpleResponse, messages
+    )
+
+    # Assert
+    assert call.input_tokens == 100
+    assert call.cache_read_tokens == 80
+    assert call.reasoning_tokens == 30
+    assert call.cache_hit_ratio == 0.8
+    assert call.input_tokens_cost == pytest.approx(
+        20 * 0.0001 + 80 * 0.00005
+    )
+    # reasoning tokens are billed as output
+    assert call.output_tokens_cost == pytest.approx(50 * 0.0002)
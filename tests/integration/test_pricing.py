@@ -0,0 +1,284 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from yalc.common.pricing import PricingService, PricingTable
+from yalc.common.schemas import LLMModel, TokensPricing
+
+
+def fail_fetch() -> dict:
+    raise ConnectionError("offline")
+
+
+def test_pricing_table_lookup_does_not_fetch_while_fresh():
+    # Arrange
+    fetch = MagicMock(return_value={})
+    table = PricingTable(fetch=fetch)
+    table.update(
+        {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.1,
+                "output_cost_per_token": 0.2,
+            }
+        }
+    )
+
+    # Act
+    pricing = table.get(LLMModel.gpt_4o_mini)
+
+    # Assert
+    assert pricing == TokensPricing(0.1, 0.2)
+    fetch.assert_not_called()
+
+
+def test_pricing_table_keeps_stale_prices_when_refresh_fails():
+    # Arrange
+    table = PricingTable(ttl=0, fetch=fail_fetch)
+    table.update(
+        {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.1,
+                "output_cost_per_token": 0.2,
+            }
+        }
+    )
+    version = table.version
+
+    # Act
+    thread = table.refresh_in_background()
+    assert thread is not None
+    thread.join()
+
+    # Assert
+    assert table.get(LLMModel.gpt_4o_mini) == TokensPricing(0.1, 0.2)
+    assert table.version == version
+
+
+def test_pricing_table_swaps_in_refreshed_prices():
+    # Arrange
+    table = PricingTable(
+        fetch=lambda: {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.3,
+                "output_cost_per_token": 0.4,
+            }
+        }
+    )
+    table.update(
+        {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.1,
+                "output_cost_per_token": 0.2,
+            }
+        }
+    )
+    version = table.version
+
+    # Act
+    thread = table.refresh_in_background()
+    assert thread is not None
+    thread.join()
+
+    # Assert
+    assert table.get(LLMModel.gpt_4o_mini) == TokensPricing(0.3, 0.4)
+    assert table.version != version
+
+
+def test_pricing_table_seeds_from_snapshot_file_when_offline(
+    tmp_path: Path,
+):
+    # Arrange
+    snapshot_path = tmp_path / "pricing.json"
+    snapshot_path.write_text(
+        json.dumps(
+            {
+                "gpt-4o-mini": {
+                    "input_cost_per_token": 0.5,
+                    "output_cost_per_token": 0.6,
+                }
+            }
+        )
+    )
+    table = PricingTable(
+        fetch=fail_fetch, snapshot_path=snapshot_path
+    )
+
+    # Act
+    pricing = table.get(LLMModel.gpt_4o_mini)
+
+    # Assert
+    assert pricing == TokensPricing(0.5, 0.6)
+
+
+def test_pricing_table_writes_snapshot_after_refresh(tmp_path: Path):
+    # Arrange
+    snapshot_path = tmp_path / "pricing.json"
+    table = PricingTable(
+        fetch=lambda: {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.3,
+                "output_cost_per_token": 0.4,
+            },
+            "some-other-model": {"input_cost_per_token": 1},
+        },
+        snapshot_path=snapshot_path,
+    )
+
+    # Act
+    table.refresh()
+
+    # Assert
+    snapshot = json.loads(snapshot_path.read_text())
+    assert snapshot["gpt-4o-mini"] == {
+        "input_cost_per_token": 0.3,
+        "output_cost_per_token": 0.4,
+    }
+    assert "some-other-model" not in snapshot
+
+
+def test_pricing_table_keeps_models_missing_from_refresh(
+    tmp_path: Path,
+):
+    # Arrange
+    snapshot_path = tmp_path / "pricing.json"
+    table = PricingTable(
+        fetch=lambda: {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.3,
+                "output_cost_per_token": 0.4,
+            }
+        },
+        snapshot_path=snapshot_path,
+    )
+    pricing = table.get(LLMModel.claude_sonnet_4_6)
+
+    # Act
+    table.refresh()
+
+    # Assert
+    assert table.get(LLMModel.gpt_4o_mini) == TokensPricing(0.3, 0.4)
+    assert table.get(LLMModel.claude_sonnet_4_6) == pricing
+    assert LLMModel.claude_sonnet_4_6 in json.loads(
+        snapshot_path.read_text()
+    )
+
+
+def test_pricing_table_raises_for_unknown_model():
+    # Arrange
+    table = PricingTable()
+    table.update({})
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        table.get(LLMModel.gpt_4o_mini)
+
+
+def test_pricing_service_reprices_after_table_publishes_new_version(
+    mocker: MockerFixture,
+):
+    # Arrange
+    table = PricingTable()
+    table.update(
+        {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.1,
+                "output_cost_per_token": 0.2,
+            }
+        }
+    )
+    mocker.patch.object(PricingService, "table", table)
+    service = PricingService(LLMModel.gpt_4o_mini)
+    service.build_response_stats(10, 5, LLMModel.gpt_4o_mini)
+    table.update(
+        {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.3,
+                "output_cost_per_token": 0.4,
+            }
+        }
+    )
+
+    # Act
+    stats = service.build_response_stats(10, 5, LLMModel.gpt_4o_mini)
+
+    # Assert
+    assert stats.input_tokens_cost == 10 * 0.3
+    assert stats.output_tokens_cost == 5 * 0.4
+
+
+def test_batch_stats_use_listed_batch_rates(mocker: MockerFixture):
+    # Arrange
+    table = PricingTable()
+    table.update(
+        {
+            "gpt-4o-mini": {
+                "input_cost_per_token": 0.1,
+                "output_cost_per_token": 0.2,
+                "input_cost_per_token_batches": 0.03,
+            }
+        }
+    )
+    mocker.patch.object(PricingService, "table", table)
+    service = PricingService(LLMModel.gpt_4o_mini)
+
+    # Act
+    stats = service.build_response_stats(
+        10, 5, LLMModel.gpt_4o_mini, batch=True
+    )
+
+    # Assert
+    assert stats.input_tokens_cost == 10 * 0.03
+    # no listed output batch rate, so half the interactive one
+    assert stats.output_tokens_cost == 5 * 0.2 * 0.5
+
+
+def test_bundled_snapshot_prices_every_model():
+    # Arrange
+    table = PricingTable(fetch=fail_fetch)
+
+    # Act
+    prices = [table.get(model) for model in LLMModel]
+
+    # Assert
+    assert all(pricing.input_cost_per_token > 0 for pricing in prices)
+    assert table.version
+
+
+def test_pinned_table_never_refreshes_on_lookup():
+    # Arrange
+    fetch = MagicMock(return_value={})
+    table = PricingTable(ttl=0, fetch=fetch)
+
+    # Act
+    table.get(LLMModel.gpt_4o_mini)
+    table.get(LLMModel.gpt_4o_mini)
+
+    # Assert
+    fetch.assert_not_called()
+
+
+def test_response_stats_record_pricing_version(mocker: MockerFixture):
+    # Arrange
+    cost_map = {
+        "gpt-4o-mini": {
+            "input_cost_per_token": 0.1,
+            "output_cost_per_token": 0.2,
+        }
+    }
+    table = PricingTable()
+    table.update(cost_map)
+    other_table = PricingTable()
+    other_table.update(cost_map)
+    mocker.patch.object(PricingService, "table", table)
+    service = PricingService(LLMModel.gpt_4o_mini)
+
+    # Act
+    stats = service.build_response_stats(10, 5, LLMModel.gpt_4o_mini)
+
+    # Assert
+    assert stats.pricing_version == table.version
+    # the version identifies the prices, not the table
+    assert other_table.version == table.version
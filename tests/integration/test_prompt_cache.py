@@ -0,0 +1,178 @@
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_stream_server import (
+    FakeAnthropicStreamServer,
+    FakeOpenAIStreamServer,
+)
+from yalc.clients.prompt_cache import cache_breakpoint
+from yalc.clients.provider_clients.anthropic import AnthropicClient
+from yalc.clients.provider_clients.openai import OpenAIClient
+from yalc.common.schemas import LLMModel
+
+
+class Judgment(BaseModel):
+    verdict: str
+    reasoning: str
+
+
+ARGUMENTS = {"verdict": "pass", "reasoning": "cites its sources"}
+
+SYSTEM_PROMPT = "You are a strict judge. " * 200
+
+
+async def drain(client, messages) -> None:
+    async for _ in client.structured_response_stream(
+        Judgment, messages
+    ):
+        pass
+
+
+@pytest.mark.anyio
+async def test_anthropic_caches_leading_system_messages(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeAnthropicStreamServer(arguments=ARGUMENTS)
+    model = LLMModel.claude_sonnet_4_5
+    client = AnthropicClient(
+        model,
+        AnthropicClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+        prompt_caching=True,
+    )
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": "Judge this"},
+    ]
+
+    # Act
+    await drain(client, messages)
+
+    # Assert
+    assert server.request["system"] == [
+        {
+            "type": "text",
+            "text": SYSTEM_PROMPT,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert server.request["messages"] == [
+        {"role": "user", "content": "Judge this"}
+    ]
+
+
+@pytest.mark.anyio
+async def test_anthropic_caches_up_to_marked_message(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeAnthropicStreamServer(arguments=ARGUMENTS)
+    model = LLMModel.claude_sonnet_4_5
+    client = AnthropicClient(
+        model,
+        AnthropicClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+    )
+    messages = [
+        cache_breakpoint(
+            {"role": "user", "content": "Long document"}
+        ),
+        {"role": "user", "content": "Judge this"},
+    ]
+
+    # Act
+    await drain(client, messages)
+
+    # Assert
+    assert server.request["messages"][0]["content"] == [
+        {
+            "type": "text",
+            "text": "Long document",
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert server.request["messages"][1] == {
+        "role": "user",
+        "content": "Judge this",
+    }
+
+
+@pytest.mark.anyio
+async def test_anthropic_sends_messages_unchanged_by_default(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeAnthropicStreamServer(arguments=ARGUMENTS)
+    model = LLMModel.claude_sonnet_4_5
+    client = AnthropicClient(
+        model,
+        AnthropicClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+    )
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": "Judge this"},
+    ]
+
+    # Act
+    await drain(client, messages)
+
+    # Assert
+    assert "cache_control" not in str(server.request)
+
+
+@pytest.mark.anyio
+async def test_openai_keys_cache_by_shared_prefix(mock_pricing):
+    # Arrange
+    server = FakeOpenAIStreamServer(arguments=ARGUMENTS)
+    model = LLMModel.gpt_4o_mini
+    client = OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+        prompt_caching=True,
+    )
+    system = {"role": "system", "content": SYSTEM_PROMPT}
+
+    # Act
+    await drain(client, [system, {"role": "user", "content": "A"}])
+    first = server.request
+    await drain(client, [system, {"role": "user", "content": "B"}])
+    second = server.request
+
+    # Assert
+    assert first["input"][0] == system
+    assert first["prompt_cache_key"]
+    assert first["prompt_cache_key"] == second["prompt_cache_key"]
+
+
+@pytest.mark.anyio
+async def test_openai_strips_cache_markers(mock_pricing):
+    # Arrange
+    server = FakeOpenAIStreamServer(arguments=ARGUMENTS)
+    model = LLMModel.gpt_4o_mini
+    client = OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+    )
+    document = {"role": "user", "content": "Long document"}
+
+    # Act
+    await drain(
+        client,
+        [
+            cache_breakpoint(document),
+            {"role": "user", "content": "A"},
+        ],
+    )
+
+    # Assert
+    assert server.request["input"][0] == document
+    assert "prompt_cache_key" in server.request
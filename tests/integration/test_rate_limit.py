@@ -0,0 +1,105 @@
+import pytest
+from pydantic import BaseModel
+from pytest_mock import MockerFixture
+
+from tests.integration.fake_clock import FakeClock
+from tests.integration.fake_client import FakeClient
+from yalc.clients.rate_limit import RateLimits, TokenBucketRateLimiter
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+@pytest.mark.anyio
+async def test_rate_limiter_queues_request_until_request_slot_refills():
+    # Arrange
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(
+        RateLimits(requests_per_minute=1), clock, clock.sleep
+    )
+    await limiter.acquire(tokens=10)
+
+    # Act
+    await limiter.acquire(tokens=10)
+
+    # Assert
+    assert clock.now == 60
+
+
+@pytest.mark.anyio
+async def test_rate_limiter_queues_request_until_enough_tokens_refill():
+    # Arrange
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(
+        RateLimits(tokens_per_minute=1000), clock, clock.sleep
+    )
+    await limiter.acquire(tokens=800)
+
+    # Act
+    await limiter.acquire(tokens=800)
+
+    # Assert — 600 missing tokens at 1000 tokens per minute
+    assert clock.now == pytest.approx(36)
+
+
+@pytest.mark.anyio
+async def test_rate_limiter_charges_underestimated_tokens_after_settle():
+    # Arrange
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(
+        RateLimits(tokens_per_minute=1000), clock, clock.sleep
+    )
+    await limiter.acquire(tokens=100)
+    limiter.settle(estimated_tokens=100, actual_tokens=900)
+
+    # Act
+    await limiter.acquire(tokens=500)
+
+    # Assert — 400 missing tokens at 1000 tokens per minute
+    assert clock.now == pytest.approx(24)
+
+
+@pytest.mark.anyio
+async def test_client_waits_for_rate_limiter_before_calling_provider(
+    mock_pricing,
+):
+    # Arrange
+    clock = FakeClock()
+    client = FakeClient()
+    client.rate_limiter = TokenBucketRateLimiter(
+        RateLimits(requests_per_minute=1), clock, clock.sleep
+    )
+    messages = [{"role": "user", "content": "Say hello"}]
+    await client.structured_response(SimpleResponse, messages)
+
+    # Act
+    await client.structured_response(SimpleResponse, messages)
+
+    # Assert
+    assert clock.now == 60
+
+
+@pytest.mark.anyio
+async def test_failed_call_gives_back_its_token_reservation(
+    mock_pricing, mocker: MockerFixture
+):
+    # Arrange
+    clock = FakeClock()
+    client = FakeClient()
+    client.rate_limiter = TokenBucketRateLimiter(
+        RateLimits(tokens_per_minute=10), clock, clock.sleep
+    )
+    mocker.patch.object(
+        client, "_response", side_effect=RuntimeError("bad request")
+    )
+    messages = [{"role": "user", "content": "Say hello"}]
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await client.structured_response(SimpleResponse, messages)
+
+    # Act
+    await client.rate_limiter.acquire(tokens=10)
+
+    # Assert
+    assert clock.now == 0
@@ -0,0 +1,228 @@
+import asyncio
+
+import httpx
+import pytest
+from instructor.core.exceptions import InstructorRetryException
+from openai import BadRequestError, RateLimitError
+from pydantic import BaseModel
+
+from tests.integration.fake_responses import openai_response
+from yalc.clients.provider_clients.openai import OpenAIClient
+from yalc.clients.retry import RetryPolicy, retry_after
+from yalc.common.schemas import LLMModel
+
+VALID = {"text": "hello"}
+INVALID = {"wrong": "field"}
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+def error_response(status: int, **headers: str) -> httpx.Response:
+    return httpx.Response(
+        status,
+        headers=headers,
+        json={"error": {"message": "nope", "type": "error"}},
+    )
+
+
+def scripted_client(
+    answers: list[dict | httpx.Response],
+    retry_policy: RetryPolicy,
+) -> tuple[OpenAIClient, list[httpx.Request]]:
+    """OpenAIClient whose requests get ``answers`` in turn.
+
+    A dict is answered as the tool call arguments, a response as is.
+    """
+    requests: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        answer = answers[len(requests) - 1]
+        if isinstance(answer, httpx.Response):
+            return answer
+        return openai_response(request, answer)
+
+    model = LLMModel.gpt_4o_mini
+    client = OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model,
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(handle)
+            ),
+            api_key="test",
+        ),
+        retry_policy=retry_policy,
+    )
+    return client, requests
+
+
+MESSAGES = [{"role": "user", "content": "Say hello"}]
+NO_BACKOFF = RetryPolicy(initial_backoff=0, jitter=False)
+
+
+@pytest.mark.anyio
+async def test_transient_errors_are_retried(mock_pricing):
+    # Arrange
+    client, requests = scripted_client(
+        [
+            error_response(429, **{"retry-after": "0"}),
+            error_response(503),
+            VALID,
+        ],
+        NO_BACKOFF,
+    )
+
+    # Act
+    result, call = await client.structured_response(
+        SimpleResponse, MESSAGES
+    )
+
+    # Assert
+    assert result.text == "hello"
+    assert len(requests) == 3
+    assert call.timing is not None
+    assert call.timing.retries == 2
+    assert call.input_tokens == 10
+
+
+@pytest.mark.anyio
+async def test_client_errors_are_not_retried(mock_pricing):
+    # Arrange
+    client, requests = scripted_client(
+        [error_response(400), VALID], NO_BACKOFF
+    )
+
+    # Act / Assert
+    with pytest.raises(BadRequestError):
+        await client.structured_response(SimpleResponse, MESSAGES)
+    assert len(requests) == 1
+
+
+@pytest.mark.anyio
+async def test_transport_and_validation_budgets_are_separate(
+    mock_pricing,
+):
+    # Arrange
+    policy = RetryPolicy(
+        max_validation_retries=1,
+        max_transport_retries=1,
+        initial_backoff=0,
+    )
+    client, requests = scripted_client(
+        [error_response(500), INVALID, INVALID, VALID], policy
+    )
+
+    # Act / Assert
+    with pytest.raises(InstructorRetryException):
+        await client.structured_response(SimpleResponse, MESSAGES)
+    assert len(requests) == 3
+
+
+@pytest.mark.anyio
+async def test_validation_retries_add_up_tokens_and_cost(
+    mock_pricing,
+):
+    # Arrange
+    client, _ = scripted_client([INVALID, INVALID, VALID], NO_BACKOFF)
+
+    # Act
+    _, call = await client.structured_response(
+        SimpleResponse, MESSAGES
+    )
+
+    # Assert
+    assert call.input_tokens == 30
+    assert call.output_tokens == 15
+    assert call.input_tokens_cost == pytest.approx(30 * 0.0001)
+    assert call.output_tokens_cost == pytest.approx(15 * 0.0002)
+
+
+@pytest.mark.anyio
+async def test_retry_that_would_miss_the_deadline_is_skipped(
+    mock_pricing,
+):
+    # Arrange
+    policy = RetryPolicy(deadline=5)
+    client, requests = scripted_client(
+        [error_response(429, **{"retry-after": "60"}), VALID], policy
+    )
+
+    # Act / Assert
+    with pytest.raises(RateLimitError):
+        await client.structured_response(SimpleResponse, MESSAGES)
+    assert len(requests) == 1
+
+
+@pytest.mark.anyio
+async def test_retry_after_past_max_backoff_fails_fast(mock_pricing):
+    # Arrange
+    client, requests = scripted_client(
+        [error_response(429, **{"retry-after": "3600"}), VALID],
+        RetryPolicy(),
+    )
+
+    # Act / Assert
+    with pytest.raises(RateLimitError):
+        await client.structured_response(SimpleResponse, MESSAGES)
+    assert len(requests) == 1
+
+
+@pytest.mark.anyio
+async def test_deadline_bounds_the_whole_call(mock_pricing):
+    # Arrange
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(10)
+        return openai_response(request, VALID)
+
+    model = LLMModel.gpt_4o_mini
+    client = OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model,
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(slow)
+            ),
+            api_key="test",
+        ),
+        retry_policy=RetryPolicy(deadline=0.05),
+    )
+
+    # Act / Assert
+    with pytest.raises(TimeoutError):
+        await client.structured_response(SimpleResponse, MESSAGES)
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after": "2"}, 2.0),
+        ({"retry-after": "Thu, 01 Jan 1970 00:00:00 GMT"}, 0.0),
+        ({}, None),
+    ],
+)
+def test_retry_after_reads_provider_headers(
+    headers: dict[str, str], expected: float | None
+):
+    # Act / Assert
+    assert retry_after(headers) == expected
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    # Arrange
+    policy = RetryPolicy(
+        initial_backoff=1, max_backoff=5, jitter=False
+    )
+
+    # Act / Assert
+    assert [policy.backoff(retry) for retry in range(4)] == [
+        1,
+        2,
+        4,
+        5,
+    ]
+    assert policy.backoff(0, retry_after=3) == 3
+    assert policy.backoff(0, retry_after=7) is None
@@ -0,0 +1,207 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_client import FakeClient, FakeRawResponse
+from tests.integration.fake_stream_server import (
+    FakeOpenAIStreamServer,
+)
+from yalc.clients.provider_clients.openai import OpenAIClient
+from yalc.clients.routing import LatencyWindow, RoutingClient
+from yalc.clients.scheduler import RequestScheduler
+from yalc.clients.schemas import ClientCall
+from yalc.clients.strategy import ClientMetadataStrategy
+from yalc.common.schemas import LLMModel
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class ScriptedClient(FakeClient):
+    """FakeClient for ``model`` that answers after ``delay``, or fails with ``error``."""
+
+    def __init__(
+        self,
+        model: LLMModel,
+        delay: float = 0.0,
+        error: Exception | None = None,
+    ):
+        super().__init__()
+        self.model = model
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def _response(self, response_type, messages):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return response_type(text=self.model.value), FakeRawResponse(
+            input_tokens=10, output_tokens=5
+        )
+
+
+class RecordingStrategy(ClientMetadataStrategy):
+    def __init__(self):
+        self.calls: list[ClientCall] = []
+
+    def handle(self, call: ClientCall, context: BaseModel | None):
+        self.calls.append(call)
+
+
+MESSAGES = [{"role": "user", "content": "Say hello"}]
+
+
+@pytest.mark.anyio
+async def test_routing_fails_over_to_next_model(mock_pricing):
+    # Arrange
+    client = RoutingClient(
+        [
+            ScriptedClient(
+                LLMModel.claude_sonnet_4_5, error=RuntimeError("429")
+            ),
+            ScriptedClient(LLMModel.gpt_4o_mini),
+        ]
+    )
+
+    # Act
+    result, call = await client.structured_response(
+        SimpleResponse, MESSAGES
+    )
+
+    # Assert
+    assert result.text == "gpt-4o-mini"
+    assert call.model_name == LLMModel.gpt_4o_mini
+    assert call.failovers == 1
+    assert call.hedges == 0
+
+
+@pytest.mark.anyio
+async def test_routing_raises_last_error_when_all_models_fail(
+    mock_pricing,
+):
+    # Arrange
+    client = RoutingClient(
+        [
+            ScriptedClient(
+                LLMModel.claude_sonnet_4_5,
+                error=RuntimeError("first"),
+            ),
+            ScriptedClient(
+                LLMModel.gpt_4o_mini, error=RuntimeError("second")
+            ),
+        ]
+    )
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="second"):
+        await client.structured_response(SimpleResponse, MESSAGES)
+
+
+@pytest.mark.anyio
+async def test_slow_call_is_hedged_and_loser_cancelled(mock_pricing):
+    # Arrange
+    slow = ScriptedClient(LLMModel.claude_sonnet_4_5, delay=5)
+    fast = ScriptedClient(LLMModel.gpt_4o_mini)
+    client = RoutingClient([slow, fast], min_samples=3)
+    for _ in range(3):
+        client.latencies[0].add(0.01)
+
+    # Act
+    result, call = await client.structured_response(
+        SimpleResponse, MESSAGES
+    )
+    await asyncio.sleep(0)
+
+    # Assert
+    assert result.text == "gpt-4o-mini"
+    assert call.hedges == 1
+    assert slow.cancelled
+    # the cancelled request's input, at the claude-sonnet-4-5 rate
+    assert call.wasted_cost == pytest.approx(
+        (len("Say hello") // 4 + 4) * 0.0003
+    )
+
+
+@pytest.mark.anyio
+async def test_calls_are_not_hedged_before_min_samples(mock_pricing):
+    # Arrange
+    slow = ScriptedClient(LLMModel.claude_sonnet_4_5, delay=0.05)
+    fast = ScriptedClient(LLMModel.gpt_4o_mini)
+    client = RoutingClient([slow, fast], min_samples=3)
+
+    # Act
+    result, call = await client.structured_response(
+        SimpleResponse, MESSAGES
+    )
+
+    # Assert
+    assert result.text == "claude-sonnet-4-5"
+    assert call.hedges == 0
+    assert len(client.latencies[0]) == 1
+
+
+@pytest.mark.anyio
+async def test_stream_goes_through_the_primary_clients_scheduler(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeOpenAIStreamServer(arguments={"text": "hello"})
+    model = LLMModel.gpt_4o_mini
+    scheduler = RequestScheduler(max_in_flight=1)
+    primary = OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+        scheduler=scheduler,
+    )
+    strategy = RecordingStrategy()
+    client = RoutingClient(
+        [primary, ScriptedClient(LLMModel.claude_sonnet_4_5)],
+        [strategy],
+    )
+    slot = await scheduler.acquire()
+
+    async def stream() -> list:
+        return [
+            update
+            async for update in client.structured_response_stream(
+                SimpleResponse, MESSAGES, SimpleResponse(text="ctx")
+            )
+        ]
+
+    # Act
+    task = asyncio.create_task(stream())
+    while not scheduler.queued:
+        await asyncio.sleep(0)
+    slot.release()
+    updates = await task
+
+    # Assert
+    final = updates[-1]
+    assert final.response == SimpleResponse(text="hello")
+    assert final.call is not None
+    assert final.call.queue_wait_time > 0
+    assert strategy.calls == [final.call]
+    assert scheduler.in_flight == 0
+
+
+def test_latency_window_evicts_oldest():
+    # Arrange
+    window = LatencyWindow(size=3)
+
+    # Act
+    for latency in [5.0, 1.0, 2.0, 3.0]:
+        window.add(latency)
+
+    # Assert
+    assert len(window) == 3
+    assert window.percentile(0.0) == 1.0
+    assert window.percentile(0.99) == 3.0
@@ -0,0 +1,225 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_client import FakeClient
+from yalc.clients.scheduler import (
+    Priority,
+    PriorityClass,
+    RequestScheduler,
+)
+from yalc.clients.schemas import ClientCall
+from yalc.clients.strategy import ClientMetadataStrategy
+from yalc.common.exceptions import LoadShedError
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class Job(BaseModel):
+    priority: Priority = Priority.DEFAULT
+    tenant_id: str | None = None
+
+
+class RecordingStrategy(ClientMetadataStrategy[Job]):
+    def __init__(self):
+        self.calls: dict[str, ClientCall] = {}
+
+    def handle(self, call: ClientCall, context: Job | None):
+        self.calls[call.messages[-1]["content"]] = call
+
+
+class GatedClient(FakeClient):
+    """Fake client whose provider calls wait until ``gate`` is set."""
+
+    def __init__(self, scheduler: RequestScheduler):
+        super().__init__()
+        self.scheduler = scheduler
+        self.strategy = RecordingStrategy()
+        self.metadata_strategies = [self.strategy]
+        self.gate = asyncio.Event()
+        self.started: list[str] = []
+
+    async def _response(self, response_type, messages):
+        self.started.append(messages[-1]["content"])
+        await self.gate.wait()
+        return await super()._response(response_type, messages)
+
+    def call(self, name: str, **job) -> asyncio.Task:
+        return asyncio.create_task(
+            self.structured_response(
+                SimpleResponse,
+                [{"role": "user", "content": name}],
+                Job(**job),
+            )
+        )
+
+
+async def queued(scheduler: RequestScheduler, count: int) -> None:
+    while scheduler.queued < count:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.anyio
+async def test_scheduler_serves_priorities_by_weight(mock_pricing):
+    # Arrange
+    scheduler = RequestScheduler(max_in_flight=1)
+    client = GatedClient(scheduler)
+    calls = [client.call("first")]
+    calls += [
+        client.call(f"background {i}", priority=Priority.BACKGROUND)
+        for i in range(2)
+    ]
+    calls += [
+        client.call(f"interactive {i}", priority=Priority.INTERACTIVE)
+        for i in range(2)
+    ]
+    await queued(scheduler, 4)
+
+    # Act
+    client.gate.set()
+    await asyncio.gather(*calls)
+
+    # Assert
+    assert client.started == [
+        "first",
+        "interactive 0",
+        "interactive 1",
+        "background 0",
+        "background 1",
+    ]
+    assert client.strategy.calls["first"].queue_wait_time == 0.0
+    assert client.strategy.calls["background 1"].queue_wait_time > 0
+    assert scheduler.in_flight == scheduler.queued == 0
+
+
+@pytest.mark.anyio
+async def test_scheduler_holds_tenant_at_quota_without_blocking_others(
+    mock_pricing,
+):
+    # Arrange
+    scheduler = RequestScheduler(max_in_flight=2, tenant_quota=1)
+    client = GatedClient(scheduler)
+    calls = [
+        client.call("a 0", tenant_id="a"),
+        client.call("a 1", tenant_id="a"),
+    ]
+    await queued(scheduler, 1)
+
+    # Act
+    calls.append(client.call("b 0", tenant_id="b"))
+    while len(client.started) < 2:
+        await asyncio.sleep(0)
+    started = list(client.started)
+    client.gate.set()
+    await asyncio.gather(*calls)
+
+    # Assert
+    assert started == ["a 0", "b 0"]
+    assert client.started == ["a 0", "b 0", "a 1"]
+
+
+@pytest.mark.anyio
+async def test_scheduler_sheds_calls_past_their_queue_deadline(
+    mock_pricing,
+):
+    # Arrange
+    scheduler = RequestScheduler(
+        max_in_flight=1,
+        classes={
+            Priority.INTERACTIVE: PriorityClass(
+                weight=8, max_queue_time=0.01
+            ),
+            Priority.DEFAULT: PriorityClass(weight=4),
+        },
+    )
+    client = GatedClient(scheduler)
+    first = client.call("first")
+
+    # Act
+    with pytest.raises(LoadShedError) as shed:
+        await client.call("late", priority=Priority.INTERACTIVE)
+    client.gate.set()
+    await first
+
+    # Assert
+    assert shed.value.priority == Priority.INTERACTIVE
+    assert shed.value.queue_wait >= 0.01
+    assert client.started == ["first"]
+    assert scheduler.shed == {Priority.INTERACTIVE: 1}
+    assert scheduler.queued == 0
+
+
+@pytest.mark.anyio
+async def test_full_scheduler_sheds_lower_priority_calls_first(
+    mock_pricing,
+):
+    # Arrange
+    scheduler = RequestScheduler(max_in_flight=1, max_queue_size=1)
+    client = GatedClient(scheduler)
+    first = client.call("first")
+    background = client.call(
+        "background", priority=Priority.BACKGROUND
+    )
+    await queued(scheduler, 1)
+
+    # Act
+    interactive = client.call(
+        "interactive", priority=Priority.INTERACTIVE
+    )
+    with pytest.raises(LoadShedError):
+        await background
+    with pytest.raises(LoadShedError):
+        await client.call("overflow")
+    client.gate.set()
+    await asyncio.gather(first, interactive)
+
+    # Assert
+    assert client.started == ["first", "interactive"]
+    assert scheduler.shed == {
+        Priority.BACKGROUND: 1,
+        Priority.DEFAULT: 1,
+    }
+
+
+@pytest.mark.anyio
+async def test_scheduler_forgets_calls_that_stopped_waiting():
+    # Arrange
+    scheduler = RequestScheduler(
+        max_in_flight=1,
+        classes={
+            Priority.DEFAULT: PriorityClass(
+                weight=1, max_queue_time=0.01
+            )
+        },
+    )
+    running = await scheduler.acquire()
+    shed = await asyncio.gather(
+        *(scheduler.acquire(Job()) for _ in range(200)),
+        return_exceptions=True,
+    )
+
+    # Act
+    waiting = asyncio.create_task(scheduler.acquire(Job()))
+    await queued(scheduler, 1)
+
+    # Assert
+    assert all(isinstance(error, LoadShedError) for error in shed)
+    assert len(scheduler._heap) == 1
+    assert len(scheduler._arrivals[Priority.DEFAULT]) == 1
+    running.release()
+    (await waiting).release()
+
+
+def test_scheduler_rejects_unknown_priorities():
+    # Arrange
+    class UntypedJob(BaseModel):
+        priority: str
+
+    scheduler = RequestScheduler()
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="interactive, default"):
+        scheduler.classify(UntypedJob(priority="urgent"))
@@ -0,0 +1,110 @@
+import gc
+import weakref
+
+import pytest
+from instructor import Mode
+from instructor.processing.response import handle_response_model
+from pydantic import BaseModel, create_model
+
+from yalc.clients import schema_cache
+from yalc.clients.schema_cache import compiled_model
+
+
+class Leaf(BaseModel):
+    """A scored leaf."""
+
+    name: str
+    tags: list[str]
+
+
+class Tree(BaseModel):
+    label: str
+    leaves: list[Leaf]
+
+
+@pytest.mark.parametrize(
+    ("mode", "params"),
+    [
+        (Mode.RESPONSES_TOOLS, {"model": "m", "input": []}),
+        (
+            Mode.ANTHROPIC_TOOLS,
+            {"model": "m", "messages": [], "max_tokens": 10},
+        ),
+    ],
+)
+def test_compiled_model_builds_the_same_request(
+    mode: Mode, params: dict
+):
+    # Arrange
+    _, expected = handle_response_model(Tree, mode=mode, **params)
+
+    # Act
+    _, first = handle_response_model(
+        compiled_model(Tree), mode=mode, **params
+    )
+    _, second = handle_response_model(
+        compiled_model(Tree), mode=mode, **params
+    )
+
+    # Assert
+    assert first == expected
+    assert second == expected
+
+
+def test_compiled_model_is_shared_and_parses_responses():
+    # Act
+    model = compiled_model(Tree)
+    parsed = model.model_validate(
+        {"label": "root", "leaves": [{"name": "a", "tags": []}]}
+    )
+
+    # Assert
+    assert compiled_model(Tree) is model
+    assert compiled_model(Tree, partial=True) is not model
+    assert isinstance(parsed, Tree)
+
+
+def test_compiled_json_schema_is_copied():
+    # Arrange
+    model = compiled_model(Tree)
+
+    # Act
+    model.model_json_schema()["properties"].clear()
+
+    # Assert
+    assert model.model_json_schema() == Tree.model_json_schema()
+
+
+def test_compiled_models_do_not_keep_response_types_alive():
+    # Arrange
+    response_type = create_model("Dynamic", text=(str, ...))
+    compiled_model(response_type)
+    ref = weakref.ref(response_type)
+
+    # Act
+    del response_type
+    gc.collect()
+
+    # Assert
+    assert ref() is None
+
+
+def test_least_recently_used_response_types_are_evicted(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Arrange
+    monkeypatch.setattr(schema_cache, "MAX_COMPILED", 2)
+    first, second, third = (
+        create_model(f"Model{i}", text=(str, ...)) for i in range(3)
+    )
+    compiled_model(first)
+    compiled_model(second)
+
+    # Act
+    compiled_model(first)
+    compiled_model(third)
+
+    # Assert
+    assert schema_cache._COMPILED in first.__dict__
+    assert schema_cache._COMPILED not in second.__dict__
+    assert schema_cache._COMPILED in third.__dict__
@@ -0,0 +1,132 @@
+from contextlib import aclosing
+
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_http_server import FakeOpenAIServer
+from yalc.clients.budget import ContextBudget
+from yalc.clients.retry import RetryPolicy
+from yalc.clients.schemas import ClientCall
+from yalc.clients.sharding import ShardedExecutor
+from yalc.clients.strategy import ClientMetadataStrategy
+from yalc.common.exceptions import ContextWindowExceededError
+from yalc.common.schemas import LLMModel
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class SimpleContext(BaseModel):
+    job: str
+
+
+class RecordingStrategy(ClientMetadataStrategy[SimpleContext]):
+    def __init__(self):
+        self.calls: list[ClientCall] = []
+
+    def handle(self, call: ClientCall, context: SimpleContext | None):
+        self.calls.append(call)
+
+
+def messages(count: int):
+    for i in range(count):
+        yield [{"role": "user", "content": f"Say {i}"}]
+
+
+@pytest.mark.anyio
+async def test_sharded_executor_returns_every_result_in_order():
+    # Arrange
+    strategy = RecordingStrategy()
+
+    # Act
+    with FakeOpenAIServer(arguments={"text": "hello"}) as server:
+        async with ShardedExecutor(
+            LLMModel.gpt_4o_mini,
+            workers=2,
+            max_concurrency=4,
+            metadata_strategies=[strategy],
+            api_key="test",
+            base_url=server.base_url,
+        ) as executor:
+            results = await executor.structured_response_many(
+                SimpleResponse,
+                messages(30),
+                context=SimpleContext(job="enrich"),
+            )
+
+    # Assert
+    assert server.requests == 30
+    assert [result.index for result in results] == list(range(30))
+    assert all(result.error is None for result in results)
+    assert all(
+        result.response == SimpleResponse(text="hello")
+        for result in results
+    )
+    assert results[7].call is not None
+    assert results[7].call.messages == [
+        {"role": "user", "content": "Say 7"}
+    ]
+    assert len(strategy.calls) == 30
+    assert executor.usage.input_tokens == 300
+    assert executor.usage.output_tokens == 150
+
+
+@pytest.mark.anyio
+async def test_sharded_executor_returns_errors_from_workers():
+    # Arrange
+    batch = [
+        [{"role": "user", "content": "fail"}],
+        [{"role": "user", "content": "x" * 4000}],
+        [{"role": "user", "content": "Say hello"}],
+    ]
+
+    # Act
+    with FakeOpenAIServer(
+        arguments={"text": "hello"}, failing={"fail"}
+    ) as server:
+        async with ShardedExecutor(
+            LLMModel.gpt_4o_mini,
+            workers=2,
+            api_key="test",
+            base_url=server.base_url,
+            retry_policy=RetryPolicy(max_transport_retries=0),
+            context_budget=ContextBudget(max_input_tokens=100),
+        ) as executor:
+            results = await executor.structured_response_many(
+                SimpleResponse, batch
+            )
+
+    # Assert
+    failed, rejected, answered = results
+    assert isinstance(failed.error, RuntimeError)
+    assert str(failed.error).startswith("BadRequestError")
+    assert isinstance(rejected.error, ContextWindowExceededError)
+    assert rejected.error.limit == 100
+    assert answered.response == SimpleResponse(text="hello")
+    assert executor.usage.input_tokens == 10
+
+
+@pytest.mark.anyio
+async def test_abandoned_batch_sends_no_more_calls():
+    # Arrange
+    with FakeOpenAIServer(arguments={"text": "hello"}) as server:
+        async with ShardedExecutor(
+            LLMModel.gpt_4o_mini,
+            workers=1,
+            max_concurrency=2,
+            api_key="test",
+            base_url=server.base_url,
+        ) as executor:
+            # Act
+            async with aclosing(
+                executor.structured_response_as_completed(
+                    SimpleResponse, messages(100)
+                )
+            ) as results:
+                async for _ in results:
+                    break
+
+    # Assert
+    # the first call and those in flight alongside it
+    assert server.requests <= 3
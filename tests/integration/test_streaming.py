@@ -0,0 +1,95 @@
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_stream_server import (
+    FakeAnthropicStreamServer,
+    FakeOpenAIStreamServer,
+)
+from yalc.clients.provider_clients.anthropic import AnthropicClient
+from yalc.clients.provider_clients.openai import OpenAIClient
+from yalc.common.schemas import LLMModel
+
+
+class Judgment(BaseModel):
+    verdict: str
+    reasoning: str
+
+
+ARGUMENTS = {
+    "verdict": "pass",
+    "reasoning": "the answer cites its sources",
+}
+
+
+@pytest.mark.anyio
+async def test_openai_stream_yields_partials_then_final_call(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeOpenAIStreamServer(arguments=ARGUMENTS)
+    model = LLMModel.gpt_4o_mini
+    client = OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+    )
+    messages = [{"role": "user", "content": "Judge this"}]
+    sent_at_first_field = None
+
+    # Act
+    updates = []
+    async for update in client.structured_response_stream(
+        Judgment, messages
+    ):
+        if sent_at_first_field is None and update.response.verdict:
+            sent_at_first_field = server.sent
+        updates.append(update)
+
+    # Assert
+    assert server.request["stream"] is True
+    assert sent_at_first_field is not None
+    assert sent_at_first_field < server.total
+    assert not any(update.done for update in updates[:-1])
+    final = updates[-1]
+    assert final.done
+    assert final.response == Judgment(**ARGUMENTS)
+    assert final.call is not None
+    assert final.call.input_tokens == 10
+    assert final.call.output_tokens == 5
+    assert final.call.input_tokens_cost == 10 * 0.0001
+    assert final.call.time_to_first_field is not None
+
+
+@pytest.mark.anyio
+async def test_anthropic_stream_takes_usage_from_final_delta(
+    mock_pricing,
+):
+    # Arrange
+    server = FakeAnthropicStreamServer(arguments=ARGUMENTS)
+    model = LLMModel.claude_sonnet_4_5
+    client = AnthropicClient(
+        model,
+        AnthropicClient.build_instructor_client(
+            model, http_client=server.http_client(), api_key="test"
+        ),
+    )
+    messages = [{"role": "user", "content": "Judge this"}]
+
+    # Act
+    updates = [
+        update
+        async for update in client.structured_response_stream(
+            Judgment, messages
+        )
+    ]
+
+    # Assert
+    assert len(updates) > 2
+    assert updates[0].response.reasoning is None
+    final = updates[-1]
+    assert final.response == Judgment(**ARGUMENTS)
+    assert final.call is not None
+    assert final.call.input_tokens == 10
+    assert final.call.output_tokens == 5
+    assert final.call.output_tokens_cost == 5 * 0.0006
@@ -0,0 +1,153 @@
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from tests.integration.fake_client import FakeClient
+from tests.integration.fake_responses import openai_response
+from yalc.clients.provider_clients.openai import OpenAIClient
+from yalc.clients.schemas import CallTiming, ClientCall
+from yalc.clients.telemetry import CallObserver
+from yalc.clients.timing import record_first_byte
+from yalc.common.schemas import LLMModel
+
+
+class SimpleResponse(BaseModel):
+    text: str
+
+
+class RecordingObserver(CallObserver):
+    def __init__(self):
+        self.observed: list[
+            tuple[CallTiming, ClientCall | None, Exception | None]
+        ] = []
+
+    def observe(self, model, timing, call=None, error=None):
+        self.observed.append((timing, call, error))
+
+
+@pytest.mark.anyio
+async def test_structured_response_times_every_attempt(mock_pricing):
+    # Arrange
+    # the first answer fails validation and is retried
+    answers = iter([{"wrong": "field"}, {"text": "hello"}])
+    http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: openai_response(request, next(answers))
+        ),
+        event_hooks={"response": [record_first_byte]},
+    )
+    model = LLMModel.gpt_4o_mini
+    client = OpenAIClient(
+        model,
+        OpenAIClient.build_instructor_client(
+            model, http_client=http_client, api_key="test"
+        ),
+    )
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    _, call = await client.structured_response(
+        SimpleResponse, messages
+    )
+
+    # Assert
+    timing = call.timing
+    assert timing is not None
+    assert timing.retries == 1
+    assert len(timing.attempts) == 2
+    assert timing.time_to_first_byte is not None
+    assert timing.provider_latency > 0
+    assert timing.parse_time > 0
+    assert timing.duration >= sum(timing.attempts)
+
+
+@pytest.mark.anyio
+async def test_observers_see_calls_and_errors(mock_pricing):
+    # Arrange
+    observer = RecordingObserver()
+    client = FakeClient()
+    client.observers = [observer]
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    _, call = await client.structured_response(
+        SimpleResponse, messages
+    )
+    client._response = AsyncMock(side_effect=RuntimeError("down"))  # type: ignore[method-assign]
+    with pytest.raises(RuntimeError):
+        await client.structured_response(SimpleResponse, messages)
+
+    # Assert
+    (timing, observed_call, _), (_, _, error) = observer.observed
+    assert observed_call is call
+    assert timing is call.timing
+    assert timing.retries == 0
+    assert len(timing.attempts) == 1
+    assert isinstance(error, RuntimeError)
+
+
+@pytest.mark.anyio
+async def test_prometheus_observer_records_histograms(mock_pricing):
+    # Arrange
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from yalc.clients.telemetry import PrometheusObserver
+
+    registry = prometheus_client.CollectorRegistry()
+    client = FakeClient()
+    client.observers = [PrometheusObserver(registry=registry)]
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    await client.structured_response(SimpleResponse, messages)
+
+    # Assert
+    labels = {"model": "gpt-4o-mini"}
+    assert (
+        registry.get_sample_value(
+            "yalc_call_duration_seconds_count", labels
+        )
+        == 1
+    )
+    assert (
+        registry.get_sample_value(
+            "yalc_provider_latency_seconds_count", labels
+        )
+        == 1
+    )
+
+
+@pytest.mark.anyio
+async def test_opentelemetry_observer_emits_span(mock_pricing):
+    # Arrange
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    from yalc.clients.telemetry import OpenTelemetryObserver
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    client = FakeClient()
+    client.observers = [
+        OpenTelemetryObserver(tracer=provider.get_tracer("test"))
+    ]
+    messages = [{"role": "user", "content": "Say hello"}]
+
+    # Act
+    _, call = await client.structured_response(
+        SimpleResponse, messages
+    )
+
+    # Assert
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes is not None
+    assert span.attributes["gen_ai.request.model"] == "gpt-4o-mini"
+    assert span.attributes["gen_ai.usage.input_tokens"] == 10
+    assert call.timing is not None
+    assert span.start_time == int(call.timing.started_at * 1e9)
@@ -1,24 +1,200 @@
-from yalc.clients.client import Client
-from yalc.clients.client_factory import create_client
-from yalc.clients.schemas import ClientCall, ClientMessage
-from yalc.clients.strategy import ClientMetadataStrategy
-from yalc.common.schemas import (
-    ContextMessage,
-    LLMModel,
-    LLMProvider,
-    LLMRole,
-    ResponseStats,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from yalc.clients.budget import (
+        ContextBudget,
+        OverflowStrategy,
+        TokenCounter,
+        get_token_counter,
+    )
+    from yalc.clients.cache import (
+        MemoryResponseCache,
+        ResponseCache,
+        SQLiteResponseCache,
+    )
+    from yalc.clients.client import Client
+    from yalc.clients.client_factory import (
+        create_client,
+        create_routing_client,
+    )
+    from yalc.clients.dispatch import DispatchMode, StrategyDispatcher
+    from yalc.clients.health import (
+        CircuitBreaker,
+        HealthTracker,
+        get_health_tracker,
+    )
+    from yalc.clients.pool import (
+        PoolConfig,
+        ProviderClientPool,
+        aclose,
+    )
+    from yalc.clients.rate_limit import (
+        RateLimiter,
+        RateLimits,
+        TokenBucketRateLimiter,
+        set_rate_limits,
+    )
+    from yalc.clients.retry import RetryPolicy
+    from yalc.clients.routing import RoutingClient
+    from yalc.clients.scheduler import (
+        Priority,
+        PriorityClass,
+        RequestScheduler,
+    )
+    from yalc.clients.schemas import (
+        BatchResult,
+        CallTiming,
+        ClientCall,
+        ClientMessage,
+        StreamedResponse,
+    )
+    from yalc.clients.sharding import ShardedExecutor
+    from yalc.clients.sinks import JSONLSink, MetadataSink, SQLiteSink
+    from yalc.clients.strategy import (
+        BufferedMetadataStrategy,
+        ClientMetadataStrategy,
+    )
+    from yalc.clients.telemetry import (
+        CallObserver,
+        OpenTelemetryObserver,
+        PrometheusObserver,
+    )
+    from yalc.common.exceptions import (
+        CircuitOpenError,
+        ContextWindowExceededError,
+        LoadShedError,
+    )
+    from yalc.common.schemas import (
+        ContextMessage,
+        LLMModel,
+        LLMProvider,
+        LLMRole,
+        ModelLimits,
+        ResponseStats,
+    )
+
+# public names and the modules they live in; a module is only imported
+# when one of its names is first accessed (PEP 562), so `import yalc`
+# stays cheap and the provider SDKs load only once a client is created
+_exports = {
+    "ContextBudget": "yalc.clients.budget",
+    "OverflowStrategy": "yalc.clients.budget",
+    "TokenCounter": "yalc.clients.budget",
+    "get_token_counter": "yalc.clients.budget",
+    "MemoryResponseCache": "yalc.clients.cache",
+    "ResponseCache": "yalc.clients.cache",
+    "SQLiteResponseCache": "yalc.clients.cache",
+    "Client": "yalc.clients.client",
+    "create_client": "yalc.clients.client_factory",
+    "create_routing_client": "yalc.clients.client_factory",
+    "DispatchMode": "yalc.clients.dispatch",
+    "StrategyDispatcher": "yalc.clients.dispatch",
+    "CircuitBreaker": "yalc.clients.health",
+    "HealthTracker": "yalc.clients.health",
+    "get_health_tracker": "yalc.clients.health",
+    "PoolConfig": "yalc.clients.pool",
+    "ProviderClientPool": "yalc.clients.pool",
+    "aclose": "yalc.clients.pool",
+    "RateLimiter": "yalc.clients.rate_limit",
+    "RateLimits": "yalc.clients.rate_limit",
+    "TokenBucketRateLimiter": "yalc.clients.rate_limit",
+    "set_rate_limits": "yalc.clients.rate_limit",
+    "RetryPolicy": "yalc.clients.retry",
+    "RoutingClient": "yalc.clients.routing",
+    "Priority": "yalc.clients.scheduler",
+    "PriorityClass": "yalc.clients.scheduler",
+    "RequestScheduler": "yalc.clients.scheduler",
+    "BatchResult": "yalc.clients.schemas",
+    "CallTiming": "yalc.clients.schemas",
+    "ClientCall": "yalc.clients.schemas",
+    "ClientMessage": "yalc.clients.schemas",
+    "StreamedResponse": "yalc.clients.schemas",
+    "ShardedExecutor": "yalc.clients.sharding",
+    "JSONLSink": "yalc.clients.sinks",
+    "MetadataSink": "yalc.clients.sinks",
+    "SQLiteSink": "yalc.clients.sinks",
+    "BufferedMetadataStrategy": "yalc.clients.strategy",
+    "ClientMetadataStrategy": "yalc.clients.strategy",
+    "CallObserver": "yalc.clients.telemetry",
+    "OpenTelemetryObserver": "yalc.clients.telemetry",
+    "PrometheusObserver": "yalc.clients.telemetry",
+    "CircuitOpenError": "yalc.common.exceptions",
+    "ContextWindowExceededError": "yalc.common.exceptions",
+    "LoadShedError": "yalc.common.exceptions",
+    "ContextMessage": "yalc.common.schemas",
+    "LLMModel": "yalc.common.schemas",
+    "LLMProvider": "yalc.common.schemas",
+    "LLMRole": "yalc.common.schemas",
+    "ModelLimits": "yalc.common.schemas",
+    "ResponseStats": "yalc.common.schemas",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_exports])
+
 
 __all__ = [
     "Client",
     "ClientMetadataStrategy",
+    "BufferedMetadataStrategy",
+    "MetadataSink",
+    "JSONLSink",
+    "SQLiteSink",
+    "DispatchMode",
+    "StrategyDispatcher",
     "ClientCall",
+    "BatchResult",
+    "StreamedResponse",
+    "CallTiming",
+    "CallObserver",
+    "OpenTelemetryObserver",
+    "PrometheusObserver",
     "ClientMessage",
     "LLMRole",
     "ContextMessage",
     "ResponseStats",
     "create_client",
+    "create_routing_client",
+    "RoutingClient",
+    "ShardedExecutor",
+    "aclose",
+    "PoolConfig",
+    "ProviderClientPool",
+    "ResponseCache",
+    "MemoryResponseCache",
+    "SQLiteResponseCache",
+    "RateLimiter",
+    "RateLimits",
+    "TokenBucketRateLimiter",
+    "set_rate_limits",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HealthTracker",
+    "get_health_tracker",
+    "ContextBudget",
+    "OverflowStrategy",
+    "TokenCounter",
+    "get_token_counter",
+    "ContextWindowExceededError",
+    "RequestScheduler",
+    "Priority",
+    "PriorityClass",
+    "LoadShedError",
+    "ModelLimits",
     "LLMModel",
     "LLMProvider",
 ]
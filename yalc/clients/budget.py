@@ -0,0 +1,209 @@
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from yalc.common.exceptions import ContextWindowExceededError
+from yalc.common.schemas import LLMModel, LLMProvider, ModelLimits
+
+# characters per token of English text for each provider's tokenizer
+_CHARS_PER_TOKEN = {
+    LLMProvider.OPENAI: 4.0,
+    LLMProvider.ANTHROPIC: 3.5,
+}
+# tokens framing every message, e.g. its role
+_TOKENS_PER_MESSAGE = 4
+
+# calls with smaller prompts do not calibrate the estimate, since the
+# tool definition and other fixed overhead would dominate them
+_MIN_CALIBRATION_TOKENS = 512
+
+
+class TokenCounter:
+    """Estimates the input tokens of a model's prompts locally, before they are sent.
+
+    The estimate starts from the characters per token of the provider's
+    tokenizer. Every call with a prompt of at least a few hundred tokens
+    then moves it towards the input tokens the provider reported, by
+    ``smoothing`` of the difference, so the estimate follows the
+    conversations actually sent. The correction stays within
+    ``[0.5, 2]``.
+
+    Every client of a model shares its counter, see :func:`get_token_counter`.
+    """
+
+    def __init__(self, model: LLMModel, smoothing: float = 0.1):
+        self.model = model
+        self.smoothing = smoothing
+        self.correction = 1.0
+        self._chars_per_token = _CHARS_PER_TOKEN.get(
+            model.provider, 4.0
+        )
+
+    def count(self, messages: list[dict[str, Any]]) -> int:
+        """Estimated input tokens of ``messages``."""
+        return int(
+            sum(map(self._message_tokens, messages)) * self.correction
+        )
+
+    def count_message(self, message: dict[str, Any]) -> int:
+        return int(self._message_tokens(message) * self.correction)
+
+    def calibrate(self, estimated: int, actual: int) -> None:
+        """Move the estimate towards ``actual`` for a prompt estimated at ``estimated``."""
+        if estimated < _MIN_CALIBRATION_TOKENS:
+            return
+        observed = self.correction * actual / estimated
+        self.correction = min(
+            max(
+                self.correction
+                + self.smoothing * (observed - self.correction),
+                0.5,
+            ),
+            2.0,
+        )
+
+    def _message_tokens(self, message: dict[str, Any]) -> int:
+        content = message["content"]
+        if not isinstance(content, str):
+            content = str(content)
+        return (
+            int(len(content) / self._chars_per_token)
+            + _TOKENS_PER_MESSAGE
+        )
+
+
+_token_counters: dict[LLMModel, TokenCounter] = {}
+
+
+def get_token_counter(model: LLMModel) -> TokenCounter:
+    """Return the process-wide :class:`TokenCounter` of ``model``."""
+    counter = _token_counters.get(model)
+    if counter is None:
+        counter = _token_counters[model] = TokenCounter(model)
+    return counter
+
+
+class OverflowStrategy(StrEnum):
+    # raise ContextWindowExceededError
+    REJECT = "reject"
+    # drop the oldest messages
+    TRIM = "trim"
+    # replace the oldest messages with a summary of them
+    SUMMARIZE = "summarize"
+
+
+type Summarizer = Callable[
+    [list[dict[str, Any]]], Awaitable[dict[str, Any]]
+]
+
+
+@dataclass(frozen=True)
+class ContextBudget:
+    """What a :class:`~yalc.clients.client.Client` does with conversations too long for the model.
+
+    A conversation fits when its estimated input tokens, plus
+    ``reserved_output_tokens`` for the answer, are within the model's
+    context window. ``max_input_tokens`` lowers the window, for example to
+    cap the cost of a call. Conversations that do not fit are handled
+    according to ``overflow``:
+
+    * ``REJECT`` raises :class:`~yalc.common.exceptions.ContextWindowExceededError`
+      without calling the provider.
+    * ``TRIM`` drops the oldest messages until the conversation fits, and
+      then up to the next user message, so what is left starts with one.
+      The leading system messages and the last message are always kept.
+    * ``SUMMARIZE`` trims as well, then awaits ``summarize`` with the
+      dropped messages and puts the message it returns in their place,
+      after the system messages. Trimming makes room for
+      ``summary_tokens`` more tokens for the summary.
+
+    A conversation that still does not fit raises
+    :class:`~yalc.common.exceptions.ContextWindowExceededError`.
+    """
+
+    overflow: OverflowStrategy = OverflowStrategy.REJECT
+    reserved_output_tokens: int = 4096
+    max_input_tokens: int | None = None
+    summarize: Summarizer | None = None
+    summary_tokens: int = 1024
+
+    def __post_init__(self):
+        if (
+            self.overflow == OverflowStrategy.SUMMARIZE
+            and self.summarize is None
+        ):
+            raise ValueError("SUMMARIZE needs a summarize hook")
+
+    def input_limit(self, limits: ModelLimits) -> int | None:
+        """Input tokens a conversation may use, ``None`` for no limit."""
+        limit = self.max_input_tokens
+        if limits.max_input_tokens is not None:
+            reserved = self.reserved_output_tokens
+            if limits.max_output_tokens is not None:
+                reserved = min(reserved, limits.max_output_tokens)
+            window = limits.max_input_tokens - reserved
+            limit = window if limit is None else min(limit, window)
+        return limit
+
+    async def fit(
+        self,
+        messages: list[dict[str, Any]],
+        counter: TokenCounter,
+        limits: ModelLimits,
+    ) -> list[dict[str, Any]]:
+        """``messages`` if they fit, or the trimmed or summarized conversation.
+
+        Raises:
+            ContextWindowExceededError: If the conversation does not fit and
+                cannot be made to.
+        """
+        limit = self.input_limit(limits)
+        if limit is None:
+            return messages
+        tokens = counter.count(messages)
+        if tokens <= limit:
+            return messages
+        if self.overflow == OverflowStrategy.REJECT:
+            raise ContextWindowExceededError(
+                counter.model, tokens, limit
+            )
+
+        system = 0
+        while (
+            system < len(messages) - 1
+            and messages[system]["role"] == "system"
+        ):
+            system += 1
+        room = limit
+        if self.overflow == OverflowStrategy.SUMMARIZE:
+            room -= self.summary_tokens
+        dropped = system
+        while dropped < len(messages) - 1 and (
+            tokens > room
+            # providers like Anthropic reject a conversation whose first
+            # message after the system prompt is not the user's
+            or (
+                dropped > system
+                and messages[dropped]["role"] != "user"
+            )
+        ):
+            tokens -= counter.count_message(messages[dropped])
+            dropped += 1
+        if tokens > room:
+            raise ContextWindowExceededError(
+                counter.model, tokens, limit
+            )
+
+        head, tail = messages[:system], messages[dropped:]
+        if self.overflow == OverflowStrategy.TRIM:
+            return head + tail
+        assert self.summarize is not None
+        summary = await self.summarize(messages[system:dropped])
+        fitted = [*head, summary, *tail]
+        tokens = counter.count(fitted)
+        if tokens > limit:
+            raise ContextWindowExceededError(
+                counter.model, tokens, limit
+            )
+        return fitted
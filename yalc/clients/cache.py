@@ -0,0 +1,187 @@
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+
+from cachetools import Cache, LRUCache, TTLCache
+from pydantic import BaseModel
+
+from yalc.clients.schemas import ClientCall
+from yalc.common.schemas import LLMModel
+
+
+# class attribute caching the digest cache keys are built from, so a
+# response type's JSON schema is generated and hashed only once
+_DIGEST = "__yalc_schema_digest__"
+
+
+def _schema_digest(response_type: type[BaseModel]) -> str:
+    # read from the type's own namespace, a subclass has its own schema
+    digest: str | None = response_type.__dict__.get(_DIGEST)
+    if digest is None:
+        schema = json.dumps(
+            response_type.model_json_schema(), sort_keys=True
+        )
+        digest = hashlib.sha256(schema.encode()).hexdigest()
+        setattr(response_type, _DIGEST, digest)
+    return digest
+
+
+def cache_key(
+    model: LLMModel,
+    response_type: type[BaseModel],
+    messages: list[dict[str, str]],
+) -> str:
+    """Stable hash of the model, the JSON schema of ``response_type`` and the messages."""
+    payload = json.dumps(
+        [model.value, _schema_digest(response_type), messages],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """Storage for structured responses keyed by :func:`cache_key`."""
+
+    @abstractmethod
+    async def get[T: BaseModel](
+        self, key: str, response_type: type[T]
+    ) -> tuple[T, ClientCall] | None:
+        pass
+
+    @abstractmethod
+    async def set(
+        self, key: str, parsed: BaseModel, call: ClientCall
+    ) -> None:
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU cache, with entries expiring after ``ttl`` seconds if given.
+
+    Responses are copied on the way in and out, so callers mutating what
+    they got back never change what the cache serves next.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self._cache: Cache[str, tuple[BaseModel, ClientCall]] = (
+            TTLCache(maxsize=maxsize, ttl=ttl)
+            if ttl is not None
+            else LRUCache(maxsize=maxsize)
+        )
+
+    async def get[T: BaseModel](
+        self, key: str, response_type: type[T]
+    ) -> tuple[T, ClientCall] | None:
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        # one deep copy, so the call keeps sharing the parsed response
+        return copy.deepcopy(cached)  # type: ignore[return-value]
+
+    async def set(
+        self, key: str, parsed: BaseModel, call: ClientCall
+    ) -> None:
+        self._cache[key] = copy.deepcopy((parsed, call))
+
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk cache in a SQLite database, shared across processes and runs.
+
+    Entries expire ``ttl`` seconds after they were written. With ``max_entries``, the
+    least recently read entries are evicted once the cache grows past it. Queries run
+    in a worker thread so the event loop never blocks on disk I/O.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "call TEXT NOT NULL, created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+
+    async def get[T: BaseModel](
+        self, key: str, response_type: type[T]
+    ) -> tuple[T, ClientCall] | None:
+        row = await asyncio.to_thread(self._get, key)
+        if row is None:
+            return None
+
+        parsed = response_type.model_validate_json(row[0])
+        # the call is stored without the response, which only the
+        # caller knows how to parse
+        call_data = json.loads(row[1])
+        call_data["client_message"]["response"] = parsed
+        return parsed, ClientCall.model_validate(call_data)
+
+    async def set(
+        self, key: str, parsed: BaseModel, call: ClientCall
+    ) -> None:
+        await asyncio.to_thread(
+            self._set,
+            key,
+            parsed.model_dump_json(),
+            call.model_dump_json(),
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _get(self, key: str) -> tuple[str, str] | None:
+        now = self._clock()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, call, created_at FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and row[2] <= now - self.ttl:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,)
+                )
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+        return row[0], row[1]
+
+    def _set(self, key: str, response: str, call: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, call, now, now),
+            )
+            if self.max_entries is not None:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
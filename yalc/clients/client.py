@@ -1,11 +1,50 @@
+import asyncio
+import importlib
+import time
 from abc import ABC, abstractmethod
-from typing import Any, overload
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Mapping,
+)
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, overload
 
-from instructor import AsyncInstructor
 from pydantic import BaseModel
 
-from yalc.clients.schemas import ClientCall, ClientMessage
+from yalc.clients.budget import ContextBudget, get_token_counter
+from yalc.clients.cache import ResponseCache, cache_key
+from yalc.clients.dispatch import StrategyDispatcher
+from yalc.clients.health import CircuitBreaker, get_health_tracker
+from yalc.clients.rate_limit import RateLimiter
+from yalc.clients.retry import RetryPolicy
+from yalc.clients.schema_cache import compiled_model
+from yalc.clients.scheduler import (
+    RequestScheduler,
+    Slot,
+    current_request_context,
+    request_context,
+)
+from yalc.clients.schemas import (
+    BatchResult,
+    ClientCall,
+    ClientMessage,
+    StreamedResponse,
+)
 from yalc.clients.strategy import ClientMetadataStrategy
+from yalc.clients.telemetry import CallObserver, notify
+from yalc.clients.timing import (
+    CallTimer,
+    current_timer,
+    instrument,
+    timed_call,
+)
+from yalc.common.exceptions import (
+    ContextWindowExceededError,
+    LoadShedError,
+)
 from yalc.common.pricing import PricingService
 from yalc.common.schemas import (
     LLMModel,
@@ -13,7 +52,22 @@ from yalc.common.schemas import (
     LLMRole,
     ResponseStats,
 )
-from yalc.common.utils import to_context_messages
+
+if TYPE_CHECKING:
+    import httpx
+    from instructor import AsyncInstructor
+
+type BatchJob = tuple[type[BaseModel], list[dict[str, str]]]
+
+# imported on first use, so only the SDKs of the providers in use load
+_provider_modules = {
+    LLMProvider.OPENAI: "yalc.clients.provider_clients.openai",
+    LLMProvider.ANTHROPIC: "yalc.clients.provider_clients.anthropic",
+}
+
+
+class _QueueTimeoutError(TimeoutError):
+    """The deadline passed before the call reached the provider."""
 
 
 class Client(ABC):
@@ -24,6 +78,12 @@ class Client(ABC):
     """
 
     _registry: dict[LLMProvider, type["Client"]] = {}
+    # requests in flight across all clients, for coalesce_requests, by
+    # instructor client and cache key: clients only share requests when
+    # they share credentials, endpoint and connection pool
+    _inflight: dict[
+        tuple[int, str], asyncio.Future[tuple[BaseModel, ClientCall]]
+    ] = {}
 
     @classmethod
     def provider(cls, llm_provider: LLMProvider):
@@ -35,16 +95,78 @@ class Client(ABC):
 
         return decorator
 
+    @classmethod
+    def for_provider(
+        cls, llm_provider: LLMProvider
+    ) -> type["Client"]:
+        """Return the Client subclass for ``llm_provider``, importing its module on first use.
+
+        Raises:
+            ValueError: If the provider is not supported.
+        """
+        subclass = cls._registry.get(llm_provider)
+        if subclass is None and llm_provider in _provider_modules:
+            importlib.import_module(_provider_modules[llm_provider])
+            subclass = cls._registry.get(llm_provider)
+        if subclass is None:
+            raise ValueError(f"Unsupported provider: {llm_provider}")
+        return subclass
+
+    @classmethod
+    @abstractmethod
+    def build_instructor_client(
+        cls,
+        model: LLMModel,
+        http_client: "httpx.AsyncClient",
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ) -> "AsyncInstructor":
+        """Build the provider SDK client wrapped by instructor.
+
+        Called by :class:`~yalc.clients.pool.ProviderClientPool`, which passes
+        the shared ``http_client`` all provider clients send requests through.
+        """
+        pass
+
     def __init__(
         self,
         model: LLMModel,
-        instructor_client: AsyncInstructor,
+        instructor_client: "AsyncInstructor",
         metadata_strategies: list[ClientMetadataStrategy] = [],
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ResponseCache | None = None,
+        coalesce_requests: bool = False,
+        dispatcher: StrategyDispatcher | None = None,
+        prompt_caching: bool = False,
+        observers: list[CallObserver] = [],
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        store_context: bool = True,
+        context_budget: ContextBudget | None = None,
+        scheduler: RequestScheduler | None = None,
     ):
         self.metadata_strategies = metadata_strategies
-        self.pricing_service = PricingService()
+        self.observers = observers
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.health = (
+            circuit_breaker.tracker
+            if circuit_breaker is not None
+            else get_health_tracker(model)
+        )
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.coalesce_requests = coalesce_requests
+        self.dispatcher = dispatcher or StrategyDispatcher()
+        self.prompt_caching = prompt_caching
+        self.store_context = store_context
+        self.context_budget = context_budget
+        self.scheduler = scheduler
+        self.token_counter = get_token_counter(model)
+        self.pricing_service = PricingService(model)
         self.instructor_client = instructor_client
         self.model = model
+        instrument(instructor_client)
 
     @overload
     async def structured_response[T: BaseModel](
@@ -52,6 +174,8 @@ class Client(ABC):
         response_type: type[T],
         messages: list[dict[str, str]],
         context: BaseModel,
+        *,
+        use_cache: bool = True,
     ) -> T: ...
 
     @overload
@@ -59,6 +183,8 @@ class Client(ABC):
         self,
         response_type: type[T],
         messages: list[dict[str, str]],
+        *,
+        use_cache: bool = True,
     ) -> tuple[T, ClientCall]: ...
 
     async def structured_response[T: BaseModel](
@@ -66,53 +192,751 @@ class Client(ABC):
         response_type: type[T],
         messages: list[dict[str, str]],
         context: BaseModel | None = None,
+        *,
+        use_cache: bool = True,
     ) -> T | tuple[T, ClientCall]:
         """
         Sends messages to the LLM and returns a parsed Pydantic response.
 
-        If ``context`` is provided, all registered metadata strategies are invoked and only
-        the parsed response is returned. Otherwise, a ``(parsed, ClientCall)`` tuple is returned
+        If ``context`` is provided, all registered metadata strategies are handed to the
+        client's dispatcher and only the parsed response is returned. Otherwise, a ``(parsed, ClientCall)`` tuple is returned
         so the caller can inspect token usage and costs.
+
+        When the client has a ``response_cache``, a stored response for the same model,
+        response schema and messages is returned instead of calling the provider; pass
+        ``use_cache=False`` to bypass the cache for this call.
+
+        With ``coalesce_requests``, identical calls made while one is already in flight
+        wait for its result instead of calling the provider again. Every caller gets its
+        own copy of the response and its own ``ClientCall``; the duplicates are flagged
+        ``coalesced`` and cost nothing.
+
+        With a ``scheduler``, the call waits for a slot before it is sent, with
+        the priority and tenant of ``context``, and may be shed with
+        :class:`~yalc.common.exceptions.LoadShedError`.
         """
-        response, llm_call = await self._structured_response(
-            response_type, messages
-        )
+        with request_context(context):
+            response, llm_call = await self._structured_response(
+                response_type, messages, use_cache
+            )
 
         if context is not None:
-            for strategy in self.metadata_strategies:
-                strategy.handle(llm_call, context)
+            await self._handle_metadata(llm_call, context)
             return response
 
         return response, llm_call
 
+    async def structured_response_stream[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+        context: BaseModel | None = None,
+    ) -> AsyncIterator[StreamedResponse[T]]:
+        """
+        Streams the response, yielding it as it is generated.
+
+        Every update but the last carries a partial ``response`` whose fields that have
+        not streamed in yet are ``None``. The last one is ``done``: its ``response`` is
+        validated against ``response_type`` and it carries the ``ClientCall``, with usage
+        from the stream's final event and ``time_to_first_field`` set.
+
+        Streamed calls go through the scheduler and the rate limiter but are neither
+        cached, coalesced nor retried. If ``context`` is provided, metadata strategies
+        are invoked once the stream completes.
+        """
+        from instructor.processing.response import (
+            handle_response_model,
+        )
+
+        messages = await self._fit_context(messages)
+        response_model, params = handle_response_model(
+            compiled_model(response_type, partial=True),
+            mode=self.model.mode,
+            **self._request_params(messages),
+        )
+        assert response_model is not None
+
+        timer = CallTimer()
+        slot = (
+            await self.scheduler.acquire(context)
+            if self.scheduler is not None
+            else None
+        )
+        rate_limiter = self.rate_limiter
+        estimated_tokens = self.token_counter.count(messages)
+        if rate_limiter is not None:
+            try:
+                await rate_limiter.acquire(estimated_tokens)
+            except BaseException:
+                if slot is not None:
+                    slot.release()
+                raise
+        if slot is not None or rate_limiter is not None:
+            timer.queue_time = time.time() - timer.started_at
+
+        timer.attempt_started()
+        started = time.perf_counter()
+        time_to_first_field: float | None = None
+        raw_response: Any = None
+
+        async def tap(
+            stream: AsyncIterator[Any],
+        ) -> AsyncIterator[Any]:
+            nonlocal raw_response
+            async for event in stream:
+                timer.first_byte()
+                raw_response = self._stream_response(
+                    event, raw_response
+                )
+                yield event
+
+        partial: T | None = None
+        try:
+            async with aclosing(self._stream(params)) as stream:
+                partials = (
+                    response_model.from_streaming_response_async(  # type: ignore[attr-defined]
+                        tap(stream), mode=self.model.mode
+                    )
+                )
+                async for partial in partials:
+                    if (
+                        time_to_first_field is None
+                        and partial.model_dump(exclude_none=True)
+                    ):
+                        time_to_first_field = (
+                            time.perf_counter() - started
+                        )
+                    yield StreamedResponse(response=partial)
+            timer.response_received()
+
+            if partial is None or raw_response is None:
+                raise RuntimeError("stream ended without a response")
+            parsed = response_type.model_validate(
+                partial.model_dump()
+            )
+        except Exception as e:
+            timer.attempt_ended()
+            if rate_limiter is not None:
+                rate_limiter.settle(estimated_tokens, 0)
+            if self.observers:
+                notify(
+                    self.observers,
+                    self.model,
+                    timer.finish(),
+                    error=e,
+                )
+            raise
+        finally:
+            if slot is not None:
+                slot.release()
+        timer.attempt_ended()
+        llm_call = self._create_llm_call(
+            messages, parsed, raw_response
+        )
+        llm_call.time_to_first_field = time_to_first_field
+        if slot is not None:
+            llm_call.queue_wait_time = slot.queue_wait
+        llm_call.timing = timer.finish()
+        if self.observers:
+            notify(
+                self.observers, self.model, llm_call.timing, llm_call
+            )
+        if rate_limiter is not None:
+            rate_limiter.settle(
+                estimated_tokens,
+                llm_call.input_tokens + llm_call.output_tokens,
+            )
+        if context is not None:
+            await self._handle_metadata(llm_call, context)
+        yield StreamedResponse(response=parsed, call=llm_call)
+
+    async def structured_response_many[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages_batch: Iterable[list[dict[str, str]]]
+        | AsyncIterable[list[dict[str, str]]],
+        max_concurrency: int = 10,
+        context: BaseModel | None = None,
+    ) -> list[BatchResult[T]]:
+        """
+        Sends every message list in ``messages_batch`` and returns the results in input order.
+
+        See :meth:`structured_response_as_completed`, which this collects; prefer that one
+        for inputs too large to hold all results in memory.
+        """
+        results = [
+            result
+            async for result in self.structured_response_as_completed(
+                response_type,
+                messages_batch,
+                max_concurrency,
+                context,
+            )
+        ]
+        results.sort(key=lambda result: result.index)
+        return results
+
+    async def structured_response_as_completed[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages_batch: Iterable[list[dict[str, str]]]
+        | AsyncIterable[list[dict[str, str]]],
+        max_concurrency: int = 10,
+        context: BaseModel | None = None,
+    ) -> AsyncIterator[BatchResult[T]]:
+        """
+        Sends every message list in ``messages_batch`` and yields results as they complete.
+
+        At most ``max_concurrency`` calls are in flight, and ``messages_batch`` is only
+        advanced when a slot frees up, so lazy generators of any size run in bounded memory.
+        A failing item yields a :class:`BatchResult` carrying the error instead of aborting the
+        batch. If ``context`` is provided, metadata strategies are invoked for every success.
+        """
+        pending: set[asyncio.Task[BatchResult[T]]] = set()
+        try:
+            index = 0
+            async for messages in _aiter(messages_batch):
+                pending.add(
+                    asyncio.create_task(
+                        self._batch_item(
+                            index, response_type, messages, context
+                        )
+                    )
+                )
+                index += 1
+                if len(pending) >= max_concurrency:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def structured_response_batch(
+        self,
+        jobs: Iterable[BatchJob],
+        poll_interval: float = 30.0,
+        context: BaseModel | None = None,
+    ) -> list[BatchResult[BaseModel]]:
+        """
+        Runs ``(response_type, messages)`` jobs through the provider's batch API.
+
+        All jobs are submitted as one provider batch, which is polled every
+        ``poll_interval`` seconds until it ends; results are returned in input order.
+        Batches trade latency (up to 24 hours) for batch pricing, which the calls are
+        costed at, and are not subject to the client's rate limiter, response cache or
+        coalescing. Wrap the call in ``asyncio.timeout`` to give up waiting.
+
+        A job the provider failed or that does not parse carries the error in its
+        :class:`BatchResult`. If ``context`` is provided, metadata strategies are
+        invoked for every success.
+        """
+        from instructor.processing.response import (
+            handle_response_model,
+        )
+
+        jobs = list(jobs)
+        if not jobs:
+            return []
+
+        response_models = []
+        requests = []
+        # outputs of the jobs that are not sent, by custom ID
+        rejected: dict[str, Any] = {}
+        for index, (response_type, messages) in enumerate(jobs):
+            try:
+                messages = await self._fit_context(messages)
+            except ContextWindowExceededError as e:
+                rejected[str(index)] = e
+            jobs[index] = response_type, messages
+            response_model, params = handle_response_model(
+                compiled_model(response_type),
+                mode=self.model.mode,
+                **self._request_params(messages),
+            )
+            response_models.append(response_model)
+            if str(index) not in rejected:
+                requests.append(
+                    self._batch_request(str(index), params)
+                )
+
+        batch_id = None
+        outputs: Mapping[str, Any] = {}
+        if requests:
+            batch_id = await self._submit_batch(requests)
+            while (
+                batch_outputs := await self._batch_outputs(batch_id)
+            ) is None:
+                await asyncio.sleep(poll_interval)
+            outputs = batch_outputs
+        outputs = {**outputs, **rejected}
+
+        return [
+            await self._batch_job_result(
+                index,
+                response_model,
+                messages,
+                outputs.get(
+                    str(index),
+                    RuntimeError(
+                        f"Batch {batch_id} returned no result"
+                    ),
+                ),
+                context,
+            )
+            for index, (response_model, (_, messages)) in enumerate(
+                zip(response_models, jobs)
+            )
+        ]
+
+    @abstractmethod
+    def _stream(self, params: dict[str, Any]) -> AsyncGenerator[Any]:
+        """Open a streaming request with ``params`` and yield the provider's events."""
+        pass
+
+    @abstractmethod
+    def _stream_response(self, event: Any, response: Any) -> Any:
+        """Fold a stream event into the raw response costed once the stream ends."""
+        pass
+
+    async def _batch_job_result(
+        self,
+        index: int,
+        response_model: type[BaseModel] | None,
+        messages: list[dict[str, str]],
+        output: Any,
+        context: BaseModel | None,
+    ) -> BatchResult[BaseModel]:
+        from instructor.processing.response import (
+            process_response_async,
+        )
+
+        try:
+            if isinstance(output, Exception):
+                raise output
+            parsed = await process_response_async(
+                output,
+                response_model=response_model,
+                mode=self.model.mode,
+            )
+            llm_call = self._create_llm_call(
+                messages, parsed, output, batch=True
+            )
+            if context is not None:
+                await self._handle_metadata(llm_call, context)
+        except Exception as e:
+            return BatchResult(index=index, error=e)
+        return BatchResult(
+            index=index, response=parsed, call=llm_call
+        )
+
+    @abstractmethod
+    def _request_params(
+        self, messages: list[dict[str, str]]
+    ) -> dict[str, Any]:
+        """Provider request parameters for ``messages``, before the response model is applied.
+
+        Carries the prompt cache hints, see :mod:`yalc.clients.prompt_cache`.
+        """
+        pass
+
+    @abstractmethod
+    def _batch_request(
+        self, custom_id: str, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Wrap request ``params`` in the provider's batch request format."""
+        pass
+
+    @abstractmethod
+    async def _submit_batch(
+        self, requests: list[dict[str, Any]]
+    ) -> str:
+        """Create a provider batch and return its ID."""
+        pass
+
+    @abstractmethod
+    async def _batch_outputs(
+        self, batch_id: str
+    ) -> Mapping[str, Any] | None:
+        """Results of an ended batch by custom ID, or ``None`` while it is still running.
+
+        Each result is the provider's raw response, or the exception a failed request
+        maps to.
+        """
+        pass
+
+    async def _batch_item[T: BaseModel](
+        self,
+        index: int,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+        context: BaseModel | None,
+    ) -> BatchResult[T]:
+        try:
+            with request_context(context):
+                response, llm_call = await self._structured_response(
+                    response_type, messages
+                )
+            if context is not None:
+                await self._handle_metadata(llm_call, context)
+        except Exception as e:
+            return BatchResult(index=index, error=e)
+        return BatchResult(
+            index=index, response=response, call=llm_call
+        )
+
+    async def _handle_metadata(
+        self, llm_call: ClientCall, context: BaseModel
+    ) -> None:
+        await self.dispatcher.dispatch(
+            self.metadata_strategies, llm_call, context
+        )
+
+    def estimate_call(
+        self, messages: list[dict[str, str]], output_tokens: int = 0
+    ) -> ResponseStats:
+        """Estimated tokens and cost of sending ``messages``, without sending them.
+
+        The input tokens are estimated locally by the model's
+        :class:`~yalc.clients.budget.TokenCounter`, the same estimate the rate
+        limiter and the context budget use. ``output_tokens`` is the length of the
+        answer to cost in.
+        """
+        return self.pricing_service.build_response_stats(
+            input_tokens=self.token_counter.count(messages),
+            output_tokens=output_tokens,
+            model=self.model,
+        )
+
+    async def _fit_context(
+        self, messages: list[dict[str, str]]
+    ) -> list[dict[str, str]]:
+        """``messages`` made to fit the context window, see :class:`ContextBudget`."""
+        budget = self.context_budget
+        if budget is None:
+            return messages
+        return await budget.fit(
+            messages,
+            self.token_counter,
+            self.pricing_service.get_limits(self.model),
+        )
+
     async def _structured_response[T: BaseModel](
         self,
         response_type: type[T],
         messages: list[dict[str, str]],
+        use_cache: bool = True,
     ) -> tuple[T, ClientCall]:
-        parsed, response = await self._response(
-            response_type, messages
-        )
+        with timed_call() as timer:
+            try:
+                parsed, llm_call = await self._cached_response(
+                    response_type, messages, use_cache
+                )
+            except Exception as e:
+                if self.observers:
+                    notify(
+                        self.observers,
+                        self.model,
+                        timer.finish(),
+                        error=e,
+                    )
+                raise
 
-        llm_call = self._create_llm_call(messages, parsed, response)
+        llm_call.timing = timer.finish()
+        if self.observers:
+            notify(
+                self.observers, self.model, llm_call.timing, llm_call
+            )
         return parsed, llm_call
 
+    async def _cached_response[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+        use_cache: bool,
+    ) -> tuple[T, ClientCall]:
+        messages = await self._fit_context(messages)
+        cache = self.response_cache if use_cache else None
+        if cache is None and not self.coalesce_requests:
+            return await self._call_provider(response_type, messages)
+
+        key = cache_key(self.model, response_type, messages)
+        if cache is not None:
+            cached = await cache.get(key, response_type)
+            if cached is not None:
+                parsed, llm_call = cached
+                return parsed, llm_call.model_copy(
+                    update={
+                        "input_tokens_cost": 0.0,
+                        "output_tokens_cost": 0.0,
+                        "queue_wait_time": 0.0,
+                        "cache_hit": True,
+                    }
+                )
+
+        if not self.coalesce_requests:
+            parsed, llm_call = await self._call_provider(
+                response_type, messages
+            )
+        else:
+            parsed, llm_call = await self._coalesced_call(
+                key, response_type, messages
+            )
+            if llm_call.coalesced:
+                return parsed, llm_call
+
+        if cache is not None:
+            await cache.set(key, parsed, llm_call)
+        return parsed, llm_call
+
+    async def _coalesced_call[T: BaseModel](
+        self,
+        key: str,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+    ) -> tuple[T, ClientCall]:
+        flight = id(self.instructor_client), key
+        inflight = self._inflight.get(flight)
+        if inflight is not None:
+            try:
+                parsed, llm_call = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise
+                # the caller making the request was cancelled, not us
+                return await self._coalesced_call(
+                    key, response_type, messages
+                )
+
+            parsed = parsed.model_copy(deep=True)
+            return parsed, llm_call.model_copy(  # type: ignore[return-value]
+                update={
+                    "client_message": self._parse_client_message(
+                        parsed
+                    ),
+                    "input_tokens_cost": 0.0,
+                    "output_tokens_cost": 0.0,
+                    "queue_wait_time": 0.0,
+                    "coalesced": True,
+                }
+            )
+
+        future: asyncio.Future[tuple[BaseModel, ClientCall]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight[flight] = future
+        try:
+            result = await self._call_provider(
+                response_type, messages
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark the exception retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[flight]
+
+    async def _call_provider[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+    ) -> tuple[T, ClientCall]:
+        breaker = self.circuit_breaker
+        trial = breaker.before_call() if breaker is not None else None
+        failed: bool | None = None
+        try:
+            result = await self._limited_call(response_type, messages)
+            failed = False
+            return result
+        except (LoadShedError, _QueueTimeoutError):
+            # these calls never reached the provider
+            raise
+        except Exception as e:
+            # only errors on the provider's side count against its health
+            failed = self._is_transient(e) or isinstance(
+                e, TimeoutError
+            )
+            if failed:
+                self.health.record_failure()
+            else:
+                self.health.record_success()
+            raise
+        finally:
+            if breaker is not None:
+                breaker.after_call(failed, trial)
+
+    async def _limited_call[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+    ) -> tuple[T, ClientCall]:
+        # a deadline passing while the call waits for the scheduler or the
+        # rate limiter says nothing about the provider's health
+        reached = False
+        try:
+            async with asyncio.timeout(
+                self.retry_policy.deadline
+            ) as deadline:
+                timer = current_timer()
+                slot = await self._acquire_slot()
+                try:
+                    estimated_tokens = self.token_counter.count(
+                        messages
+                    )
+                    rate_limiter = self.rate_limiter
+                    if rate_limiter is not None:
+                        queued = time.perf_counter()
+                        await rate_limiter.acquire(estimated_tokens)
+                        if timer is not None:
+                            timer.queue_time += (
+                                time.perf_counter() - queued
+                            )
+                    reached = True
+                    try:
+                        (
+                            parsed,
+                            response,
+                        ) = await self._provider_response(
+                            response_type, messages, deadline.when()
+                        )
+                    except BaseException:
+                        # give back the reservation, so a run of failing
+                        # calls does not starve the ones after it
+                        if rate_limiter is not None:
+                            rate_limiter.settle(estimated_tokens, 0)
+                        raise
+                finally:
+                    if slot is not None:
+                        slot.release()
+                llm_call = self._create_llm_call(
+                    messages, parsed, response
+                )
+                if slot is not None:
+                    llm_call.queue_wait_time = slot.queue_wait
+                if rate_limiter is not None:
+                    rate_limiter.settle(
+                        estimated_tokens,
+                        llm_call.input_tokens
+                        + llm_call.output_tokens,
+                    )
+                # validation retries resend the conversation, so only
+                # single attempts tell how long it was
+                if timer is None or len(timer.responses) <= 1:
+                    self.token_counter.calibrate(
+                        estimated_tokens, llm_call.input_tokens
+                    )
+                return parsed, llm_call
+        except TimeoutError as e:
+            if reached:
+                raise
+            raise _QueueTimeoutError() from e
+
+    async def _acquire_slot(self) -> Slot | None:
+        """Wait for the scheduler to let the current call through, if there is one."""
+        scheduler = self.scheduler
+        if scheduler is None:
+            return None
+        slot = await scheduler.acquire(current_request_context())
+        timer = current_timer()
+        if timer is not None:
+            timer.queue_time += slot.queue_wait
+        return slot
+
+    async def _provider_response[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+        deadline: float | None,
+    ) -> tuple[T, Any]:
+        """Call ``_response``, retrying transient errors as the retry policy allows.
+
+        ``deadline`` is the event loop time past which no retry is started.
+        """
+        policy = self.retry_policy
+        started = time.perf_counter()
+        retries = 0
+        while True:
+            try:
+                result = await self._response(response_type, messages)
+                break
+            except Exception as e:
+                if (
+                    retries >= policy.max_transport_retries
+                    or not self._is_transient(e)
+                ):
+                    raise
+                delay = policy.backoff(retries, self._retry_after(e))
+                if delay is None or (
+                    deadline is not None
+                    and asyncio.get_running_loop().time() + delay
+                    >= deadline
+                ):
+                    raise
+                retries += 1
+                await asyncio.sleep(delay)
+
+        self.health.record_success(time.perf_counter() - started)
+        timer = current_timer()
+        if timer is not None:
+            timer.provider_call_ended(started)
+        return result
+
     def _create_llm_call(
         self,
         messages: list[dict[str, str]],
         parsed: BaseModel,
         response: Any,
+        batch: bool = False,
     ) -> ClientCall:
-        context_messages = to_context_messages(messages)
-        client_message = self._parse_client_message(parsed)
+        timer = current_timer()
+        if timer is not None and len(timer.responses) > 1:
+            stats = self._attempts_stats(timer.responses, batch)
+        else:
+            stats = self._get_response_stats(response, batch=batch)
 
         return ClientCall(
-            context_messages=context_messages,
-            client_message=client_message,
+            messages=list(messages) if self.store_context else [],
+            client_message=self._parse_client_message(parsed),
             model_name=self.model,
-            **self._get_response_stats(response).model_dump(),
+            batch=batch,
+            **stats.__dict__,
         )
 
+    def _attempts_stats(
+        self, responses: list[tuple[Any, Any]], batch: bool
+    ) -> ResponseStats:
+        """Stats summed over the responses of every attempt of a call.
+
+        instructor leaves either the last attempt's usage or a running total
+        on the final response, so each attempt is costed with the usage it
+        came with.
+        """
+        stats = [
+            self._get_response_stats(
+                response.model_copy(update={"usage": usage}),
+                batch=batch,
+            )
+            for response, usage in responses
+        ]
+        return sum(stats[1:], stats[0])
+
     @staticmethod
     def _parse_client_message(parsed: BaseModel) -> ClientMessage:
         return ClientMessage(response=parsed, role=LLMRole.ASSISTANT)
@@ -126,5 +950,26 @@ class Client(ABC):
         pass
 
     @abstractmethod
-    def _get_response_stats(self, response: Any) -> ResponseStats:
+    def _get_response_stats(
+        self, response: Any, batch: bool = False
+    ) -> ResponseStats:
         pass
+
+    def _is_transient(self, error: Exception) -> bool:
+        """Whether ``error`` is worth retrying, e.g. a timeout or a rate limit."""
+        return False
+
+    def _retry_after(self, error: Exception) -> float | None:
+        """Seconds the provider asked to wait before retrying after ``error``."""
+        return None
+
+
+async def _aiter[T](
+    items: Iterable[T] | AsyncIterable[T],
+) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
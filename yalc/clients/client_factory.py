@@ -1,40 +1,143 @@
-import instructor
+from typing import Any
 
+from yalc.clients.budget import ContextBudget
+from yalc.clients.cache import ResponseCache
 from yalc.clients.client import Client
-from yalc.clients.provider_clients.anthropic import (
-    AnthropicClient,  # noqa: F401
-)
-from yalc.clients.provider_clients.openai import (
-    OpenAIClient,  # noqa: F401
-)
+from yalc.clients.dispatch import StrategyDispatcher
+from yalc.clients.health import CircuitBreaker
+from yalc.clients.pool import ProviderClientPool, default_pool
+from yalc.clients.rate_limit import RateLimiter, get_rate_limiter
+from yalc.clients.retry import RetryPolicy
+from yalc.clients.routing import RoutingClient
+from yalc.clients.scheduler import RequestScheduler
 from yalc.clients.strategy import ClientMetadataStrategy
+from yalc.clients.telemetry import CallObserver
 from yalc.common.schemas import LLMModel
 
 
 def create_client(
     model: LLMModel,
     metadata_strategies: list[ClientMetadataStrategy] = [],
+    api_key: str | None = None,
+    base_url: str | None = None,
+    pool: ProviderClientPool | None = None,
+    rate_limiter: RateLimiter | None = None,
+    response_cache: ResponseCache | None = None,
+    coalesce_requests: bool = False,
+    dispatcher: StrategyDispatcher | None = None,
+    prompt_caching: bool = False,
+    observers: list[CallObserver] = [],
+    retry_policy: RetryPolicy | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    store_context: bool = True,
+    context_budget: ContextBudget | None = None,
+    scheduler: RequestScheduler | None = None,
 ) -> Client:
     """Create and return a provider-specific :class:`~yalc.clients.client.Client` for the given model.
 
+    Provider SDK clients come from a :class:`~yalc.clients.pool.ProviderClientPool`, so
+    repeated calls are cheap and all clients share pooled connections.
+
     Args:
         model: The LLM model to use. Determines which provider client is instantiated.
         metadata_strategies: Optional list of strategies invoked after each call when a
             context object is supplied to ``structured_response``.
+        api_key: Provider API key. Defaults to the provider's environment variable.
+        base_url: Override for the provider API base URL.
+        pool: Client pool to draw the provider SDK client from. Defaults to the
+            process-wide pool closed by :func:`yalc.aclose`.
+        rate_limiter: Limiter awaited before every call. Defaults to the limiter registered
+            for the model or its provider with :func:`~yalc.clients.rate_limit.set_rate_limits`.
+        response_cache: Optional cache of structured responses, e.g. a
+            :class:`~yalc.clients.cache.MemoryResponseCache` or
+            :class:`~yalc.clients.cache.SQLiteResponseCache`.
+        coalesce_requests: Share one provider call between identical concurrent calls
+            (same model, response type and messages) instead of sending duplicates.
+        dispatcher: Decides where ``metadata_strategies`` run. Defaults to running them
+            inline before ``structured_response`` returns.
+        prompt_caching: Let the provider cache the leading system messages, the prefix
+            most prompts share across calls. Messages marked with
+            :func:`~yalc.clients.prompt_cache.cache_breakpoint` are cached either way.
+        observers: Receive the timing of every call, e.g. a
+            :class:`~yalc.clients.telemetry.PrometheusObserver` or
+            :class:`~yalc.clients.telemetry.OpenTelemetryObserver`.
+        retry_policy: How validation and transport errors are retried. Defaults to
+            :class:`~yalc.clients.retry.RetryPolicy` with its default budgets.
+        circuit_breaker: Fails calls fast while the model keeps failing. Share one
+            :class:`~yalc.clients.health.CircuitBreaker` between the clients of a model.
+        store_context: Keep the input messages on each ``ClientCall``. Turn off to
+            leave ``context_messages`` empty and save their memory on long conversations.
+        context_budget: Checks that conversations fit the model's context window before
+            sending them, and rejects, trims or summarizes those that do not. See
+            :class:`~yalc.clients.budget.ContextBudget`.
+        scheduler: Queues calls by the priority and tenant of their context once too
+            many are in flight, and sheds those that wait too long. Share one
+            :class:`~yalc.clients.scheduler.RequestScheduler` between clients.
 
     Returns:
         A ready-to-use async ``Client`` instance configured for the specified model.
 
     Raises:
-        ValueError: If the model's provider is not supported.
+        ValueError: If the model's provider is not supported, or
+            ``circuit_breaker`` belongs to another model.
+    """
+    if circuit_breaker is not None and circuit_breaker.model != model:
+        raise ValueError(
+            f"Circuit breaker of {circuit_breaker.model} "
+            f"used for {model}"
+        )
+    client_class = Client.for_provider(model.provider)
+
+    instructor_client = (pool or default_pool).get(
+        model, api_key=api_key, base_url=base_url
+    )
+    return client_class(
+        model,
+        instructor_client,
+        metadata_strategies,
+        rate_limiter=rate_limiter or get_rate_limiter(model),
+        response_cache=response_cache,
+        coalesce_requests=coalesce_requests,
+        dispatcher=dispatcher,
+        prompt_caching=prompt_caching,
+        observers=observers,
+        retry_policy=retry_policy,
+        circuit_breaker=circuit_breaker,
+        store_context=store_context,
+        context_budget=context_budget,
+        scheduler=scheduler,
+    )
+
+
+def create_routing_client(
+    models: list[LLMModel],
+    metadata_strategies: list[ClientMetadataStrategy] = [],
+    hedge_percentile: float | None = 0.95,
+    min_samples: int = 20,
+    dispatcher: StrategyDispatcher | None = None,
+    **client_options: Any,
+) -> RoutingClient:
+    """Create a :class:`~yalc.clients.routing.RoutingClient` over ``models``, in order of preference.
+
+    Args:
+        models: The models to route to; the first one gets every call, the others
+            hedges and failovers.
+        metadata_strategies: Strategies invoked once per call with the winning
+            ``ClientCall``, when a context object is supplied.
+        hedge_percentile: Latency percentile of a model after which the call is also
+            sent to the next model. ``None`` only fails over.
+        min_samples: Latencies a model needs before its calls are hedged.
+        dispatcher: Decides where ``metadata_strategies`` run.
+        **client_options: Passed to :func:`create_client` for every model, e.g.
+            ``pool``, ``response_cache`` or ``retry_policy``.
+
+    Raises:
+        ValueError: If ``models`` is empty or a model's provider is not supported.
     """
-    client_class = Client._registry.get(model.provider)
-    if client_class is None:
-        raise ValueError(f"Unsupported provider: {model.provider}")
-
-    instructor_client = instructor.from_provider(
-        model.provider_string,
-        async_client=True,
-        mode=model.mode,
+    return RoutingClient(
+        [create_client(model, **client_options) for model in models],
+        metadata_strategies,
+        hedge_percentile=hedge_percentile,
+        min_samples=min_samples,
+        dispatcher=dispatcher,
     )
-    return client_class(model, instructor_client, metadata_strategies)
@@ -0,0 +1,132 @@
+import asyncio
+import inspect
+import logging
+from concurrent.futures import Executor
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+from yalc.clients.schemas import ClientCall
+from yalc.clients.strategy import ClientMetadataStrategy
+
+logger = logging.getLogger(__name__)
+
+type _Job = tuple[list[ClientMetadataStrategy], ClientCall, BaseModel]
+
+
+class DispatchMode(StrEnum):
+    """Where metadata strategies run relative to the LLM call that produced the metadata."""
+
+    # before structured_response returns; strategy errors reach the caller
+    INLINE = "inline"
+    # in background tasks on the event loop
+    BACKGROUND = "background"
+    # in background tasks, with synchronous handlers on a thread pool
+    THREAD = "thread"
+
+
+class StrategyDispatcher:
+    """Runs :class:`ClientMetadataStrategy` handlers for every call made with a context.
+
+    In ``BACKGROUND`` and ``THREAD`` mode calls are queued and ``workers`` tasks drain
+    the queue, so slow handlers (e.g. database writes) stay off the request path. The
+    queue holds at most ``max_queue_size`` calls; once full, callers wait for room
+    instead of buffering without bound. Errors raised by queued handlers are logged.
+
+    Call :meth:`flush` to wait for queued calls and :meth:`aclose` on shutdown.
+    """
+
+    def __init__(
+        self,
+        mode: DispatchMode = DispatchMode.INLINE,
+        max_queue_size: int = 1000,
+        workers: int = 1,
+        executor: Executor | None = None,
+    ):
+        self.mode = mode
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self._executor = executor
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._worker_tasks: list[asyncio.Task[None]] = []
+
+    async def dispatch(
+        self,
+        strategies: list[ClientMetadataStrategy],
+        call: ClientCall,
+        context: BaseModel,
+    ) -> None:
+        if not strategies:
+            return
+        if self.mode == DispatchMode.INLINE:
+            for strategy in strategies:
+                result = strategy.handle(call, context)
+                if inspect.isawaitable(result):
+                    await result
+            return
+
+        await self._ensure_workers().put((strategies, call, context))
+
+    async def flush(self) -> None:
+        """Wait until every queued call has been handled."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        """Handle everything still queued, then stop the workers."""
+        await self.flush()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(
+            *self._worker_tasks, return_exceptions=True
+        )
+        self._worker_tasks = []
+        self._queue = None
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting to be handled."""
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def _ensure_workers(self) -> asyncio.Queue[_Job]:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._worker_tasks = [
+                asyncio.create_task(self._work(self._queue))
+                for _ in range(self.workers)
+            ]
+        return self._queue
+
+    async def _work(self, queue: asyncio.Queue[_Job]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            strategies, call, context = await queue.get()
+            try:
+                for strategy in strategies:
+                    await self._run(loop, strategy, call, context)
+            finally:
+                queue.task_done()
+
+    async def _run(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        strategy: ClientMetadataStrategy,
+        call: ClientCall,
+        context: BaseModel,
+    ) -> None:
+        try:
+            if self.mode == DispatchMode.THREAD and not (
+                inspect.iscoroutinefunction(strategy.handle)
+            ):
+                await loop.run_in_executor(
+                    self._executor, strategy.handle, call, context
+                )
+                return
+
+            result = strategy.handle(call, context)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception(
+                "Metadata strategy %s failed", type(strategy).__name__
+            )
@@ -0,0 +1,263 @@
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum
+
+from yalc.common.exceptions import CircuitOpenError
+from yalc.common.schemas import LLMModel
+
+# latencies below this are counted as zero
+_MIN_LATENCY = 1e-6
+
+
+class LatencySketch:
+    """Streaming latency histogram answering quantiles within ``relative_accuracy``.
+
+    Latencies are counted in logarithmically sized buckets, so memory grows
+    with the range of the latencies rather than their number: at 1%
+    accuracy, everything from a millisecond to an hour fits in under 800
+    buckets. Sketches merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (
+            1 - relative_accuracy
+        )
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, latency: float) -> None:
+        self.count += 1
+        if latency < _MIN_LATENCY:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(latency) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other: "LatencySketch") -> None:
+        self.count += other.count
+        self.zeros += other.zeros
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """The ``q`` quantile (0 to 1), ``None`` while the sketch is empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                break
+        # the middle of the bucket, within relative_accuracy of any value in it
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+
+class _Slice:
+    __slots__ = ("started", "sketch", "calls", "errors")
+
+    def __init__(self, started: float, relative_accuracy: float):
+        self.started = started
+        self.sketch = LatencySketch(relative_accuracy)
+        self.calls = 0
+        self.errors = 0
+
+
+class HealthTracker:
+    """Rolling latency and error statistics of one model.
+
+    Calls are counted in time slices of ``window / slices`` seconds, and only
+    the slices of the last ``window`` seconds are kept, so memory stays
+    bounded however many calls are made. Every client records its provider
+    calls with the tracker of its model, see :func:`get_health_tracker`.
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        slices: int = 6,
+        relative_accuracy: float = 0.01,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = window
+        self.relative_accuracy = relative_accuracy
+        self._slice_length = window / slices
+        self._clock = clock
+        self._slices: deque[_Slice] = deque()
+
+    def record_success(self, latency: float | None = None) -> None:
+        current = self._current_slice()
+        current.calls += 1
+        if latency is not None:
+            current.sketch.add(latency)
+
+    def record_failure(self) -> None:
+        current = self._current_slice()
+        current.calls += 1
+        current.errors += 1
+
+    def latency(self, q: float) -> float | None:
+        """The ``q`` quantile of the latencies in the window."""
+        sketch = LatencySketch(self.relative_accuracy)
+        for window_slice in self._live_slices():
+            sketch.merge(window_slice.sketch)
+        return sketch.quantile(q)
+
+    def calls(self, since: float | None = None) -> int:
+        """Calls in the window, counting only slices started at or after ``since``."""
+        return sum(s.calls for s in self._live_slices(since))
+
+    def error_rate(self, since: float | None = None) -> float:
+        """Share of the calls in the window that failed."""
+        calls = errors = 0
+        for window_slice in self._live_slices(since):
+            calls += window_slice.calls
+            errors += window_slice.errors
+        return errors / calls if calls else 0.0
+
+    def _current_slice(self) -> _Slice:
+        now = self._clock()
+        slices = self._slices
+        if (
+            not slices
+            or now - slices[-1].started >= self._slice_length
+        ):
+            slices.append(_Slice(now, self.relative_accuracy))
+            while now - slices[0].started >= self.window:
+                slices.popleft()
+        return slices[-1]
+
+    def _live_slices(
+        self, since: float | None = None
+    ) -> list[_Slice]:
+        cutoff = self._clock() - self.window
+        if since is not None:
+            cutoff = max(cutoff, since)
+        return [s for s in self._slices if s.started >= cutoff]
+
+
+_health_trackers: dict[LLMModel, HealthTracker] = {}
+
+
+def get_health_tracker(model: LLMModel) -> HealthTracker:
+    """Return the process-wide :class:`HealthTracker` of ``model``."""
+    tracker = _health_trackers.get(model)
+    if tracker is None:
+        tracker = _health_trackers[model] = HealthTracker()
+    return tracker
+
+
+class CircuitState(StrEnum):
+    # calls go through
+    CLOSED = "closed"
+    # calls fail fast with CircuitOpenError
+    OPEN = "open"
+    # a limited number of trial calls go through
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a model that keeps failing, and probes until it recovers.
+
+    The breaker opens once at least ``min_calls`` calls were made in the
+    tracker's window and at least ``failure_threshold`` of them failed.
+    Only transient errors (timeouts, rate limits, connection and server
+    errors) count as failures. While open, calls raise
+    :class:`~yalc.common.exceptions.CircuitOpenError` straight away instead of
+    waiting on the provider. After ``open_duration`` seconds the breaker lets
+    ``half_open_calls`` trial calls through. It closes once one of them
+    succeeds, and it opens again if one fails.
+
+    Share one breaker between the clients of a model, e.g. by passing the
+    same instance to every ``create_client`` call for that model.
+    """
+
+    def __init__(
+        self,
+        model: LLMModel,
+        failure_threshold: float = 0.5,
+        min_calls: int = 20,
+        open_duration: float = 30.0,
+        half_open_calls: int = 1,
+        tracker: HealthTracker | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.tracker = tracker or get_health_tracker(model)
+        self._clock = clock
+        self.state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        # only failures after the last close count towards opening
+        self._closed_at: float | None = None
+        self._trials = 0
+        # times the breaker opened, which tells trials of each half-open
+        # period apart
+        self._openings = 0
+
+    def before_call(self) -> int | None:
+        """Admit a call, or raise :class:`CircuitOpenError`.
+
+        Returns the trial a half-open breaker admitted the call as, to pass
+        to :meth:`after_call`, or ``None`` for calls admitted while closed.
+        """
+        if self.state == CircuitState.CLOSED:
+            return None
+        if self.state == CircuitState.OPEN:
+            retry_after = (
+                self._opened_at + self.open_duration - self._clock()
+            )
+            if retry_after > 0:
+                raise CircuitOpenError(self.model, retry_after)
+            self.state = CircuitState.HALF_OPEN
+            self._trials = 0
+        if self._trials >= self.half_open_calls:
+            raise CircuitOpenError(self.model, 0.0)
+        self._trials += 1
+        return self._openings
+
+    def after_call(
+        self, failed: bool | None, trial: int | None = None
+    ) -> None:
+        """Record the outcome of an admitted call.
+
+        ``failed`` is ``None`` for calls that tell nothing about the model's
+        health, e.g. cancelled ones. ``trial`` is what :meth:`before_call`
+        returned for the call.
+        """
+        if self.state == CircuitState.HALF_OPEN:
+            # calls admitted before the breaker last opened tell nothing
+            # about whether the model recovered since
+            if trial != self._openings:
+                return
+            self._trials -= 1
+            if failed:
+                self._open()
+            elif failed is False:
+                self.state = CircuitState.CLOSED
+                self._closed_at = self._clock()
+            return
+
+        if (
+            failed
+            and self.state == CircuitState.CLOSED
+            and self.tracker.calls(self._closed_at) >= self.min_calls
+            and self.tracker.error_rate(self._closed_at)
+            >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._openings += 1
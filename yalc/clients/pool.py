@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import httpx
+
+from yalc.clients.client import Client
+from yalc.clients.timing import record_first_byte
+from yalc.common.schemas import LLMModel, LLMProvider
+
+if TYPE_CHECKING:
+    import instructor
+    from instructor import AsyncInstructor
+
+type PoolKey = tuple[
+    LLMProvider, instructor.Mode, str | None, str | None
+]
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection limits for the HTTP transport shared by provider clients.
+
+    ``http2`` requires the ``h2`` package (``pip install httpx[http2]``).
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+
+class ProviderClientPool:
+    """Registry of provider SDK clients that share one pooled transport.
+
+    Instructor clients are cached per provider, mode and credentials, and
+    all of them send requests through a single ``httpx.AsyncClient``, so
+    connections and TLS sessions are reused across every
+    :class:`~yalc.clients.client.Client` created from the pool.
+
+    The transport belongs to the event loop that first uses it. Call
+    :meth:`aclose` before that loop shuts down; the pool can be used again
+    afterwards and will open a fresh transport.
+    """
+
+    def __init__(self, config: PoolConfig | None = None):
+        self.config = config or PoolConfig()
+        self._http_client: httpx.AsyncClient | None = None
+        self._clients: dict[PoolKey, "AsyncInstructor"] = {}
+
+    def get(
+        self,
+        model: LLMModel,
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ) -> "AsyncInstructor":
+        """Return the shared instructor client for ``model``'s provider."""
+        key = (model.provider, model.mode, api_key, base_url)
+        instructor_client = self._clients.get(key)
+        if instructor_client is None:
+            client_class = Client.for_provider(model.provider)
+            instructor_client = client_class.build_instructor_client(
+                model,
+                http_client=self._get_http_client(),
+                api_key=api_key,
+                base_url=base_url,
+            )
+            self._clients[key] = instructor_client
+        return instructor_client
+
+    async def aclose(self) -> None:
+        """Close the shared transport and forget all cached clients."""
+        http_client, self._http_client = self._http_client, None
+        self._clients = {}
+        if http_client is not None:
+            await http_client.aclose()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry,
+                ),
+                http2=self.config.http2,
+                event_hooks={"response": [record_first_byte]},
+            )
+        return self._http_client
+
+
+default_pool = ProviderClientPool()
+
+
+async def aclose() -> None:
+    """Close the connections held by the default client pool."""
+    await default_pool.aclose()
@@ -0,0 +1,64 @@
+import hashlib
+import json
+
+# message key marking the end of a prefix shared across calls
+CACHE_CONTROL = "cache_control"
+
+# Anthropic rejects requests with more cache breakpoints than this
+MAX_BREAKPOINTS = 4
+
+
+def cache_breakpoint(message: dict[str, str]) -> dict[str, str]:
+    """Mark ``message`` as the last one of a prefix worth caching.
+
+    Everything up to and including a marked message is sent so the
+    provider can cache it: Anthropic gets a ``cache_control`` breakpoint
+    there, OpenAI a ``prompt_cache_key`` derived from the prefix.
+    """
+    return {**message, CACHE_CONTROL: "ephemeral"}
+
+
+def cache_breakpoints(
+    messages: list[dict[str, str]], detect: bool
+) -> list[int]:
+    """Indices of the messages that end a cacheable prefix.
+
+    Those marked with :func:`cache_breakpoint`, keeping the last
+    :data:`MAX_BREAKPOINTS` of them. Without markers and with
+    ``detect`` set, the leading system messages, which are the part of a
+    prompt that stays the same across calls, form the prefix.
+    """
+    marked = [
+        index
+        for index, message in enumerate(messages)
+        if CACHE_CONTROL in message
+    ]
+    if marked or not detect:
+        return marked[-MAX_BREAKPOINTS:]
+
+    leading = 0
+    while (
+        leading < len(messages)
+        and messages[leading]["role"] == "system"
+    ):
+        leading += 1
+    return [leading - 1] if leading else []
+
+
+def strip_cache_markers(
+    messages: list[dict[str, str]],
+) -> list[dict[str, str]]:
+    return [
+        {k: v for k, v in message.items() if k != CACHE_CONTROL}
+        if CACHE_CONTROL in message
+        else message
+        for message in messages
+    ]
+
+
+def prefix_key(messages: list[dict[str, str]]) -> str:
+    """Stable key of a message prefix, the same for the same messages."""
+    payload = json.dumps(
+        strip_cache_markers(messages), sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
@@ -1,27 +1,201 @@
-from anthropic.types import Message
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import anthropic
+import httpx
+import instructor
+from anthropic import AsyncAnthropic
+from anthropic.types import Message, RawMessageStreamEvent
+from instructor import AsyncInstructor
 from pydantic import BaseModel
 
 from yalc.clients.client import Client
-from yalc.common.schemas import LLMProvider, ResponseStats
+from yalc.clients.prompt_cache import (
+    cache_breakpoints,
+    strip_cache_markers,
+)
+from yalc.clients.retry import is_transient_status, retry_after
+from yalc.clients.schema_cache import compiled_model
+from yalc.common.schemas import LLMModel, LLMProvider, ResponseStats
 
 
 @Client.provider(LLMProvider.ANTHROPIC)
 class AnthropicClient(Client):
+    @classmethod
+    def build_instructor_client(
+        cls,
+        model: LLMModel,
+        http_client: httpx.AsyncClient,
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ) -> AsyncInstructor:
+        return instructor.from_anthropic(
+            AsyncAnthropic(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=http_client,
+                # transport errors are retried by the Client, see
+                # RetryPolicy
+                max_retries=0,
+            ),
+            mode=model.mode,
+            # the Messages API requires max_tokens, same default as
+            # instructor.from_provider
+            max_tokens=4096,
+        )
+
     async def _response[T: BaseModel](
         self,
         response_type: type[T],
         messages: list[dict[str, str]],
     ) -> tuple[T, Message]:
         return await self.instructor_client.messages.create_with_completion(  # type: ignore
-            model=self.model.value,
-            response_model=response_type,
-            max_retries=3,
-            messages=messages,  # type: ignore
+            response_model=compiled_model(response_type),
+            max_retries=self.retry_policy.validation_retrying(),
+            **self._request_params(messages),
         )
 
-    def _get_response_stats(self, response: Message) -> ResponseStats:
+    def _get_response_stats(
+        self, response: Message, batch: bool = False
+    ) -> ResponseStats:
+        usage = response.usage
+        cache_read_tokens = usage.cache_read_input_tokens or 0
+        cache_write_tokens = usage.cache_creation_input_tokens or 0
+        # input_tokens only counts the tokens after the last cache
+        # breakpoint, the cached ones are reported separately
         return self.pricing_service.build_response_stats(
-            input_tokens=response.usage.input_tokens,
-            output_tokens=response.usage.output_tokens,
+            input_tokens=usage.input_tokens
+            + cache_read_tokens
+            + cache_write_tokens,
+            output_tokens=usage.output_tokens,
             model=self.model,
+            batch=batch,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+        )
+
+    def _is_transient(self, error: Exception) -> bool:
+        if isinstance(error, anthropic.APIConnectionError):
+            return True
+        return isinstance(
+            error, anthropic.APIStatusError
+        ) and is_transient_status(error.status_code)
+
+    def _retry_after(self, error: Exception) -> float | None:
+        if isinstance(error, anthropic.APIStatusError):
+            return retry_after(error.response.headers)
+        return None
+
+    @property
+    def _sdk_client(self) -> AsyncAnthropic:
+        return self.instructor_client.client  # type: ignore[return-value]
+
+    def _request_params(
+        self, messages: list[dict[str, str]]
+    ) -> dict[str, Any]:
+        return {
+            "model": self.model.value,
+            "messages": self._cached_messages(messages),
+            # the client defaults, e.g. max_tokens
+            **self.instructor_client.kwargs,
+        }
+
+    def _cached_messages(
+        self, messages: list[dict[str, str]]
+    ) -> list[dict[str, Any]]:
+        breakpoints = cache_breakpoints(
+            messages, detect=self.prompt_caching
         )
+        if not breakpoints:
+            return strip_cache_markers(messages)
+
+        # Anthropic caches everything up to a content block carrying
+        # cache_control, system messages included
+        return [
+            {
+                "role": message["role"],
+                "content": [
+                    {
+                        "type": "text",
+                        "text": message["content"],
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            }
+            if index in breakpoints
+            else message
+            for index, message in enumerate(
+                strip_cache_markers(messages)
+            )
+        ]
+
+    async def _stream(
+        self, params: dict[str, Any]
+    ) -> AsyncGenerator[RawMessageStreamEvent]:
+        async with await self._sdk_client.messages.create(
+            **params, stream=True
+        ) as stream:
+            async for event in stream:
+                yield event
+
+    def _stream_response(
+        self, event: RawMessageStreamEvent, response: Message | None
+    ) -> Message | None:
+        # input tokens arrive with the start of the message, the
+        # cumulative output tokens with every message delta
+        if event.type == "message_start":
+            return event.message
+        if event.type == "message_delta" and response is not None:
+            usage, delta = response.usage, event.usage
+            usage.output_tokens = delta.output_tokens
+            if delta.input_tokens is not None:
+                usage.input_tokens = delta.input_tokens
+            if delta.cache_read_input_tokens is not None:
+                usage.cache_read_input_tokens = (
+                    delta.cache_read_input_tokens
+                )
+            if delta.cache_creation_input_tokens is not None:
+                usage.cache_creation_input_tokens = (
+                    delta.cache_creation_input_tokens
+                )
+        return response
+
+    def _batch_request(
+        self, custom_id: str, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {"custom_id": custom_id, "params": params}
+
+    async def _submit_batch(
+        self, requests: list[dict[str, Any]]
+    ) -> str:
+        client = self._sdk_client
+        batch = await client.messages.batches.create(
+            requests=requests  # type: ignore[arg-type]
+        )
+        return batch.id
+
+    async def _batch_outputs(
+        self, batch_id: str
+    ) -> dict[str, Message | Exception] | None:
+        client = self._sdk_client
+        batch = await client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+
+        outputs: dict[str, Message | Exception] = {}
+        async for entry in await client.messages.batches.results(
+            batch_id
+        ):
+            result = entry.result
+            if result.type == "succeeded":
+                outputs[entry.custom_id] = result.message
+            elif result.type == "errored":
+                outputs[entry.custom_id] = RuntimeError(
+                    f"Batch request {entry.custom_id} failed: "
+                    f"{result.error.error.message}"
+                )
+            else:
+                outputs[entry.custom_id] = RuntimeError(
+                    f"Batch request {entry.custom_id} {result.type}"
+                )
+        return outputs
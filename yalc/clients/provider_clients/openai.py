@@ -1,32 +1,198 @@
-from openai.types.responses import Response
+import json
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import httpx
+import instructor
+import openai
+from instructor import AsyncInstructor
+from openai import AsyncOpenAI
+from openai.types.responses import Response, ResponseStreamEvent
 from pydantic import BaseModel
 
 from yalc.clients.client import Client
-from yalc.common.schemas import LLMProvider, ResponseStats
+from yalc.clients.prompt_cache import (
+    cache_breakpoints,
+    prefix_key,
+    strip_cache_markers,
+)
+from yalc.clients.retry import is_transient_status, retry_after
+from yalc.clients.schema_cache import compiled_model
+from yalc.common.schemas import LLMModel, LLMProvider, ResponseStats
+
+# batch statuses after which no more results will be produced
+_ENDED_BATCH_STATUSES = {
+    "completed",
+    "expired",
+    "cancelled",
+    "failed",
+}
 
 
 @Client.provider(LLMProvider.OPENAI)
 class OpenAIClient(Client):
+    @classmethod
+    def build_instructor_client(
+        cls,
+        model: LLMModel,
+        http_client: httpx.AsyncClient,
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ) -> AsyncInstructor:
+        return instructor.from_openai(
+            AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=http_client,
+                # transport errors are retried by the Client, see
+                # RetryPolicy
+                max_retries=0,
+            ),
+            mode=model.mode,
+        )
+
     async def _response[T: BaseModel](
         self,
         response_type: type[T],
         messages: list[dict[str, str]],
     ) -> tuple[T, Response]:
         return await self.instructor_client.responses.create_with_completion(  # type: ignore
-            model=self.model.value,
-            response_model=response_type,
-            max_retries=3,
-            input=messages,  # type: ignore
+            response_model=compiled_model(response_type),
+            max_retries=self.retry_policy.validation_retrying(),  # type: ignore[arg-type]
+            **self._request_params(messages),
         )
 
     def _get_response_stats(
-        self, response: Response
+        self, response: Response, batch: bool = False
     ) -> ResponseStats:
         if response.usage is None:
             raise RuntimeError("no usage for llm call")
 
+        usage = response.usage
+        # cached and reasoning tokens are included in the totals
         return self.pricing_service.build_response_stats(
-            input_tokens=response.usage.input_tokens,
-            output_tokens=response.usage.output_tokens,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
             model=self.model,
+            batch=batch,
+            cache_read_tokens=usage.input_tokens_details.cached_tokens,
+            reasoning_tokens=usage.output_tokens_details.reasoning_tokens,
+        )
+
+    def _is_transient(self, error: Exception) -> bool:
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        return isinstance(
+            error, openai.APIStatusError
+        ) and is_transient_status(error.status_code)
+
+    def _retry_after(self, error: Exception) -> float | None:
+        if isinstance(error, openai.APIStatusError):
+            return retry_after(error.response.headers)
+        return None
+
+    @property
+    def _sdk_client(self) -> AsyncOpenAI:
+        return self.instructor_client.client  # type: ignore[return-value]
+
+    def _request_params(
+        self, messages: list[dict[str, str]]
+    ) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "model": self.model.value,
+            "input": strip_cache_markers(messages),
+        }
+        breakpoints = cache_breakpoints(
+            messages, detect=self.prompt_caching
+        )
+        if breakpoints:
+            # caching is automatic for prefixes of 1024+ tokens, the key
+            # routes calls sharing a prefix to the same cache. instructor
+            # puts the tools first and the messages keep their order, so
+            # the shared prefix is already at the start of the prompt
+            params["prompt_cache_key"] = prefix_key(
+                messages[: breakpoints[-1] + 1]
+            )
+        return params
+
+    async def _stream(
+        self, params: dict[str, Any]
+    ) -> AsyncGenerator[ResponseStreamEvent]:
+        async with await self._sdk_client.responses.create(
+            **params, stream=True
+        ) as stream:
+            async for event in stream:
+                yield event
+
+    def _stream_response(
+        self, event: ResponseStreamEvent, response: Response | None
+    ) -> Response | None:
+        # the completed event carries the full response, usage included
+        if event.type == "response.completed":
+            return event.response
+        return response
+
+    def _batch_request(
+        self, custom_id: str, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": params,
+        }
+
+    async def _submit_batch(
+        self, requests: list[dict[str, Any]]
+    ) -> str:
+        client = self._sdk_client
+        lines = "".join(
+            json.dumps(request) + "\n" for request in requests
+        )
+        input_file = await client.files.create(
+            file=("batch.jsonl", lines.encode(), "application/jsonl"),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def _batch_outputs(
+        self, batch_id: str
+    ) -> dict[str, Response | Exception] | None:
+        client = self._sdk_client
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status not in _ENDED_BATCH_STATUSES:
+            return None
+        if batch.status == "failed":
+            raise RuntimeError(
+                f"Batch {batch_id} failed: {batch.errors}"
+            )
+
+        # expired and cancelled batches still return what completed
+        outputs: dict[str, Response | Exception] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is None:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                output = json.loads(line)
+                outputs[output["custom_id"]] = _parse_batch_output(
+                    output
+                )
+        return outputs
+
+
+def _parse_batch_output(
+    output: dict[str, Any],
+) -> Response | Exception:
+    response = output.get("response")
+    if response is None or response["status_code"] != 200:
+        error = output.get("error") or (response or {}).get("body")
+        return RuntimeError(
+            f"Batch request {output['custom_id']} failed: {error}"
         )
+    return Response.model_validate(response["body"])
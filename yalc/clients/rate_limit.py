@@ -0,0 +1,137 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from yalc.common.schemas import LLMModel, LLMProvider
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """Provider quota for a model. ``None`` leaves that dimension unlimited."""
+
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+
+
+class RateLimiter(ABC):
+    """Admission control in front of provider calls.
+
+    :meth:`acquire` is awaited before every call with an estimate of the tokens it will
+    use, and :meth:`settle` is called once the real usage is known.
+    """
+
+    @abstractmethod
+    async def acquire(self, tokens: int) -> None:
+        pass
+
+    @abstractmethod
+    def settle(
+        self, estimated_tokens: int, actual_tokens: int
+    ) -> None:
+        pass
+
+
+class _Bucket:
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.level = min(
+            self.capacity, self.level + elapsed * self.rate
+        )
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        # a single call larger than the bucket waits for a full bucket
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """Token buckets for requests and tokens per minute.
+
+    Waiters are served strictly in arrival order, so callers queue instead of failing
+    with 429s. Token usage is reserved from the pre-call estimate and corrected by
+    :meth:`settle`; an underestimate puts the bucket into debt that later callers wait
+    out. ``clock`` and ``sleep`` can be swapped for a fake clock in tests.
+    """
+
+    def __init__(
+        self,
+        limits: RateLimits,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.limits = limits
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = asyncio.Lock()
+        now = clock()
+        self._requests = (
+            _Bucket(limits.requests_per_minute, now)
+            if limits.requests_per_minute is not None
+            else None
+        )
+        self._tokens = (
+            _Bucket(limits.tokens_per_minute, now)
+            if limits.tokens_per_minute is not None
+            else None
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                wait = 0.0
+                if self._requests is not None:
+                    self._requests.refill(now)
+                    wait = max(wait, self._requests.wait_time(1))
+                if self._tokens is not None:
+                    self._tokens.refill(now)
+                    wait = max(wait, self._tokens.wait_time(tokens))
+                if wait <= 0:
+                    break
+                await self._sleep(wait)
+
+            if self._requests is not None:
+                self._requests.level -= 1
+            if self._tokens is not None:
+                self._tokens.level -= tokens
+
+    def settle(
+        self, estimated_tokens: int, actual_tokens: int
+    ) -> None:
+        if self._tokens is not None:
+            self._tokens.level = min(
+                self._tokens.capacity,
+                self._tokens.level + estimated_tokens - actual_tokens,
+            )
+
+
+_rate_limiters: dict[LLMModel | LLMProvider, RateLimiter] = {}
+
+
+def set_rate_limits(
+    target: LLMModel | LLMProvider, limits: RateLimits
+) -> RateLimiter:
+    """Register a shared :class:`TokenBucketRateLimiter` for a model or a whole provider.
+
+    Clients created afterwards by :func:`~yalc.clients.client_factory.create_client`
+    share it; a model-specific limiter takes precedence over its provider's.
+    """
+    limiter = TokenBucketRateLimiter(limits)
+    _rate_limiters[target] = limiter
+    return limiter
+
+
+def get_rate_limiter(model: LLMModel) -> RateLimiter | None:
+    """Return the limiter registered for ``model`` or, failing that, its provider."""
+    return _rate_limiters.get(model) or _rate_limiters.get(
+        model.provider
+    )
@@ -0,0 +1,118 @@
+import random
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from json import JSONDecodeError
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tenacity import AsyncRetrying
+
+# request timeouts, lock conflicts, rate limits and server errors
+_TRANSIENT_STATUSES = {408, 409, 429}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How a :class:`~yalc.clients.client.Client` retries failed calls.
+
+    Validation errors and transport errors have separate budgets.
+
+    * A response that fails to parse or validate is sent back to the model
+      with the error, up to ``max_validation_retries`` times. These retries
+      resend the whole conversation, so every one adds to the call's
+      tokens and cost.
+    * Connection errors, timeouts, rate limits and server errors are
+      retried up to ``max_transport_retries`` times. Retries back off
+      exponentially from ``initial_backoff`` up to ``max_backoff``, with
+      full jitter. A ``Retry-After`` header from the provider takes
+      precedence, and one asking for more than ``max_backoff`` fails the
+      call straight away rather than holding it.
+
+    ``deadline`` bounds a whole call, from waiting for the rate limiter to
+    the last retry. The call raises ``TimeoutError`` once it passes, and a
+    retry that would only start after the deadline is not attempted.
+    """
+
+    max_validation_retries: int = 2
+    max_transport_retries: int = 2
+    initial_backoff: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    deadline: float | None = None
+
+    def backoff(
+        self, retry: int, retry_after: float | None = None
+    ) -> float | None:
+        """Seconds to wait before transport retry number ``retry`` (from 0).
+
+        ``None`` when ``retry_after`` asks for longer than ``max_backoff``,
+        and the error should be raised instead.
+        """
+        if retry_after is not None:
+            return (
+                retry_after
+                if retry_after <= self.max_backoff
+                else None
+            )
+        delay = min(self.max_backoff, self.initial_backoff * 2**retry)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def validation_retrying(self) -> "AsyncRetrying":
+        """A fresh tenacity controller for instructor's validation retries.
+
+        Only the errors instructor reasks on are retried. Anything else is
+        raised straight away, so the client can retry it with backoff.
+        """
+        from instructor.core.exceptions import (
+            AsyncValidationError,
+        )
+        from instructor.core.exceptions import (
+            ValidationError as InstructorValidationError,
+        )
+        from pydantic import ValidationError
+        from tenacity import (
+            AsyncRetrying,
+            retry_if_exception_type,
+            stop_after_attempt,
+        )
+
+        return AsyncRetrying(
+            stop=stop_after_attempt(self.max_validation_retries + 1),
+            retry=retry_if_exception_type(
+                (
+                    ValidationError,
+                    JSONDecodeError,
+                    AsyncValidationError,
+                    InstructorValidationError,
+                )
+            ),
+        )
+
+
+def is_transient_status(status_code: int) -> bool:
+    return status_code in _TRANSIENT_STATUSES or status_code >= 500
+
+
+def retry_after(headers: Mapping[str, str]) -> float | None:
+    """Seconds the provider asked to wait, from its retry headers."""
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at - time.time(), 0.0)
@@ -0,0 +1,311 @@
+import asyncio
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Iterable,
+    Mapping,
+)
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, cast
+
+from pydantic import BaseModel
+
+from yalc.clients.client import BatchJob, Client
+from yalc.clients.dispatch import StrategyDispatcher
+from yalc.clients.schemas import (
+    BatchResult,
+    ClientCall,
+    StreamedResponse,
+)
+from yalc.clients.strategy import ClientMetadataStrategy
+from yalc.common.schemas import LLMModel, ResponseStats
+
+if TYPE_CHECKING:
+    import httpx
+    from instructor import AsyncInstructor
+
+type _Attempt = asyncio.Task[tuple[BaseModel, ClientCall]]
+
+
+class LatencyWindow:
+    """Latencies of the last ``size`` calls, kept sorted for percentile lookups."""
+
+    def __init__(self, size: int = 1000):
+        self.size = size
+        self._recent: deque[float] = deque()
+        self._sorted: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def add(self, latency: float) -> None:
+        if len(self._recent) == self.size:
+            oldest = self._recent.popleft()
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._recent.append(latency)
+        insort(self._sorted, latency)
+
+    def percentile(self, q: float) -> float | None:
+        """The ``q`` quantile (0 to 1) of the window, ``None`` while it is empty."""
+        if not self._sorted:
+            return None
+        return self._sorted[
+            min(int(q * len(self._sorted)), len(self._sorted) - 1)
+        ]
+
+
+class RoutingClient(Client):
+    """Client that routes each call over several clients, in order of preference.
+
+    A call goes to the first client. Once it has taken longer than the
+    ``hedge_percentile`` of that client's recent latencies, the same call is
+    also sent to the next client, and the first valid answer wins; the other
+    request is cancelled. Hedging starts once a client has ``min_samples``
+    latencies, and ``hedge_percentile=None`` turns it off. A client that
+    fails, e.g. on a rate limit or a response that keeps failing validation,
+    is failed over to the next one. The last error is raised once every
+    client has failed.
+
+    The :class:`ClientCall` is the winning client's, so ``model_name`` names
+    the model that answered. ``hedges`` and ``failovers`` count the extra
+    requests, and ``wasted_cost`` is the cost of the answers that lost the
+    race. For hedges cancelled in flight, it is the estimated cost of their
+    input.
+
+    Streams and provider batches go to the first client only, through its
+    scheduler, rate limiter and context budget. Use
+    :func:`~yalc.clients.client_factory.create_routing_client` to build one.
+    """
+
+    def __init__(
+        self,
+        clients: list[Client],
+        metadata_strategies: list[ClientMetadataStrategy] = [],
+        hedge_percentile: float | None = 0.95,
+        min_samples: int = 20,
+        window: int = 1000,
+        dispatcher: StrategyDispatcher | None = None,
+    ):
+        if not clients:
+            raise ValueError(
+                "RoutingClient needs at least one client"
+            )
+        primary = clients[0]
+        super().__init__(
+            primary.model,
+            primary.instructor_client,
+            metadata_strategies,
+            dispatcher=dispatcher,
+        )
+        self.clients = clients
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.latencies = [LatencyWindow(window) for _ in clients]
+
+    @property
+    def primary(self) -> Client:
+        return self.clients[0]
+
+    async def structured_response_stream[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+        context: BaseModel | None = None,
+    ) -> AsyncIterator[StreamedResponse[T]]:
+        """Streams the response from the first client, see :meth:`Client.structured_response_stream`."""
+        stream = cast(
+            AsyncGenerator[StreamedResponse[T]],
+            self.primary.structured_response_stream(
+                response_type, messages, context
+            ),
+        )
+        async with aclosing(stream):
+            async for update in stream:
+                if update.call is not None and context is not None:
+                    await self._handle_metadata(update.call, context)
+                yield update
+
+    async def structured_response_batch(
+        self,
+        jobs: Iterable[BatchJob],
+        poll_interval: float = 30.0,
+        context: BaseModel | None = None,
+    ) -> list[BatchResult[BaseModel]]:
+        """Runs the jobs through the first client's batch API, see :meth:`Client.structured_response_batch`."""
+        results = await self.primary.structured_response_batch(
+            jobs, poll_interval
+        )
+        if context is None:
+            return results
+        for position, result in enumerate(results):
+            if result.call is None:
+                continue
+            try:
+                await self._handle_metadata(result.call, context)
+            except Exception as e:
+                results[position] = BatchResult(
+                    index=result.index, error=e
+                )
+        return results
+
+    async def _structured_response[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+        use_cache: bool = True,
+    ) -> tuple[T, ClientCall]:
+        loop = asyncio.get_running_loop()
+        pending: dict[_Attempt, int] = {}
+        started: list[float] = []
+        hedges = failovers = 0
+        wasted_cost = 0.0
+        error: BaseException | None = None
+
+        def send() -> None:
+            index = len(started)
+            task = asyncio.create_task(
+                self.clients[index]._structured_response(
+                    response_type, messages, use_cache
+                )
+            )
+            # errors of requests that lost the race are not raised
+            task.add_done_callback(_retrieve_exception)
+            pending[task] = index
+            started.append(loop.time())
+
+        send()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self._hedge_delay(started),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    send()
+                    hedges += 1
+                    continue
+
+                winner: tuple[T, ClientCall] | None = None
+                for task in done:
+                    index = pending.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    parsed, llm_call = task.result()
+                    self.latencies[index].add(
+                        loop.time() - started[index]
+                    )
+                    if winner is None:
+                        winner = parsed, llm_call  # type: ignore[assignment]
+                    else:
+                        wasted_cost += _cost(llm_call)
+
+                if winner is not None:
+                    wasted_cost += sum(
+                        self._estimated_input_cost(
+                            self.clients[index], messages
+                        )
+                        for index in pending.values()
+                    )
+                    parsed, llm_call = winner
+                    return parsed, llm_call.model_copy(
+                        update={
+                            "hedges": hedges,
+                            "failovers": failovers,
+                            "wasted_cost": wasted_cost,
+                        }
+                    )
+                if not pending and len(started) < len(self.clients):
+                    send()
+                    failovers += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+        assert error is not None
+        raise error
+
+    def _hedge_delay(self, started: list[float]) -> float | None:
+        """Seconds until the next client is sent a hedge, ``None`` for never."""
+        if self.hedge_percentile is None or len(started) >= len(
+            self.clients
+        ):
+            return None
+        latencies = self.latencies[len(started) - 1]
+        if len(latencies) < self.min_samples:
+            return None
+        latency = latencies.percentile(self.hedge_percentile)
+        assert latency is not None
+        hedge_at = started[-1] + latency
+        return max(hedge_at - asyncio.get_running_loop().time(), 0.0)
+
+    @staticmethod
+    def _estimated_input_cost(
+        client: Client, messages: list[dict[str, str]]
+    ) -> float:
+        return client.estimate_call(messages).input_tokens_cost
+
+    # everything but structured responses goes to the primary client
+
+    @classmethod
+    def build_instructor_client(
+        cls,
+        model: LLMModel,
+        http_client: "httpx.AsyncClient",
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ) -> "AsyncInstructor":
+        raise TypeError(
+            "RoutingClient routes over clients built by create_client "
+            "and has no provider client of its own"
+        )
+
+    async def _response[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages: list[dict[str, str]],
+    ) -> tuple[T, Any]:
+        return await self.primary._response(response_type, messages)
+
+    def _get_response_stats(
+        self, response: Any, batch: bool = False
+    ) -> ResponseStats:
+        return self.primary._get_response_stats(response, batch)
+
+    def _request_params(
+        self, messages: list[dict[str, str]]
+    ) -> dict[str, Any]:
+        return self.primary._request_params(messages)
+
+    def _stream(self, params: dict[str, Any]) -> AsyncGenerator[Any]:
+        return self.primary._stream(params)
+
+    def _stream_response(self, event: Any, response: Any) -> Any:
+        return self.primary._stream_response(event, response)
+
+    def _batch_request(
+        self, custom_id: str, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        return self.primary._batch_request(custom_id, params)
+
+    async def _submit_batch(
+        self, requests: list[dict[str, Any]]
+    ) -> str:
+        return await self.primary._submit_batch(requests)
+
+    async def _batch_outputs(
+        self, batch_id: str
+    ) -> Mapping[str, Any] | None:
+        return await self.primary._batch_outputs(batch_id)
+
+
+def _cost(llm_call: ClientCall) -> float:
+    return llm_call.input_tokens_cost + llm_call.output_tokens_cost
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,377 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter, deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+from yalc.common.exceptions import LoadShedError
+
+# calls that stopped waiting but are still in the queues, beyond those
+# waiting, before the queues are compacted
+_PRUNE_SLACK = 64
+
+# the context of the call running in the current task, which the
+# scheduler reads its priority and tenant from
+_request_context: ContextVar[BaseModel | None] = ContextVar(
+    "yalc_request_context", default=None
+)
+
+
+class Priority(StrEnum):
+    # user-facing calls, someone is waiting for the answer
+    INTERACTIVE = "interactive"
+    DEFAULT = "default"
+    # enrichment and other offline work
+    BACKGROUND = "background"
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    """How a priority's calls are queued.
+
+    While several priorities have calls waiting, each gets slots in
+    proportion to its ``weight``. A call that waited ``max_queue_time``
+    seconds without a slot is shed; ``None`` waits as long as it takes.
+    """
+
+    weight: float
+    max_queue_time: float | None = None
+
+
+DEFAULT_CLASSES: Mapping[Priority, PriorityClass] = {
+    Priority.INTERACTIVE: PriorityClass(
+        weight=8, max_queue_time=10.0
+    ),
+    Priority.DEFAULT: PriorityClass(weight=4),
+    Priority.BACKGROUND: PriorityClass(weight=1),
+}
+
+
+class _State(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+
+
+class Slot:
+    """A call's place in a :class:`RequestScheduler`, queued or running.
+
+    ``queue_wait`` is the seconds the call waited before it could start.
+    """
+
+    __slots__ = (
+        "priority",
+        "tenant",
+        "queue_wait",
+        "_scheduler",
+        "_finish",
+        "_seq",
+        "_enqueued",
+        "_future",
+        "_state",
+    )
+
+    def __init__(
+        self,
+        scheduler: "RequestScheduler",
+        priority: Priority,
+        tenant: str | None,
+    ):
+        self.priority = priority
+        self.tenant = tenant
+        self.queue_wait = 0.0
+        self._scheduler = scheduler
+        self._finish = 0.0
+        self._seq = 0
+        self._enqueued = 0.0
+        self._future: asyncio.Future[None] | None = None
+        self._state = _State.QUEUED
+
+    def __lt__(self, other: "Slot") -> bool:
+        return (self._finish, self._seq) < (other._finish, other._seq)
+
+    def release(self) -> None:
+        """Free the slot once the call is done."""
+        if self._state == _State.RUNNING:
+            self._scheduler._release(self)
+
+
+class RequestScheduler:
+    """Admission control that lets at most ``max_in_flight`` calls reach the providers.
+
+    Calls beyond that wait in a queue and are started by weighted fair
+    queuing over their priority classes: while several priorities have calls
+    waiting, each is served in proportion to its
+    :attr:`PriorityClass.weight`, so interactive calls overtake a backlog of
+    background ones without starving it. Within a priority, calls start in
+    arrival order.
+
+    A call's priority and tenant are read from the ``context`` it is made
+    with, from its ``priority_field`` and ``tenant_field`` attributes. Calls
+    without a context or without those fields get ``default_priority`` and
+    no tenant. A tenant has at most ``tenant_quota`` calls running at once,
+    or its entry in ``tenant_quotas``; its other calls wait without holding
+    up other tenants.
+
+    Calls are shed with :class:`~yalc.common.exceptions.LoadShedError`
+    instead of being sent when they waited longer than their class's
+    ``max_queue_time``, or when ``max_queue_size`` calls are already waiting.
+    A full queue makes room by shedding the newest call of a lower priority
+    than the one arriving, if there is one.
+
+    Share one scheduler between the clients that compete for the same
+    connections and rate limits, by passing it to every ``create_client``
+    call. A scheduler belongs to the event loop that first uses it.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 100,
+        classes: Mapping[Priority, PriorityClass] = DEFAULT_CLASSES,
+        max_queue_size: int = 10_000,
+        tenant_quota: int | None = None,
+        tenant_quotas: Mapping[str, int] = {},
+        priority_field: str = "priority",
+        tenant_field: str = "tenant_id",
+        default_priority: Priority = Priority.DEFAULT,
+    ):
+        self.max_in_flight = max_in_flight
+        self.classes = classes
+        self.max_queue_size = max_queue_size
+        self.tenant_quota = tenant_quota
+        self.tenant_quotas = tenant_quotas
+        self.priority_field = priority_field
+        self.tenant_field = tenant_field
+        self.default_priority = default_priority
+        # calls shed, by priority
+        self.shed: Counter[Priority] = Counter()
+        self.in_flight = 0
+        self.queued = 0
+        self._tenants: Counter[str] = Counter()
+        # queued calls, by virtual finish time
+        self._heap: list[Slot] = []
+        # queued calls of each priority in arrival order, to shed the newest
+        self._arrivals: dict[Priority, deque[Slot]] = {
+            priority: deque() for priority in classes
+        }
+        # queued calls of tenants at their quota, by virtual finish time
+        self._parked: dict[str, list[Slot]] = {}
+        self._virtual_time = 0.0
+        self._last_finish: dict[Priority, float] = {}
+        self._seq = itertools.count()
+
+    def classify(
+        self, context: BaseModel | None
+    ) -> tuple[Priority, str | None]:
+        """The priority and tenant of a call made with ``context``."""
+        priority = getattr(context, self.priority_field, None)
+        tenant = getattr(context, self.tenant_field, None)
+        if priority is None:
+            priority = self.default_priority
+        elif priority not in self.classes:
+            raise ValueError(
+                f"Unknown priority {priority!r}, expected one of: "
+                + ", ".join(self.classes)
+            )
+        return (
+            Priority(priority),
+            str(tenant) if tenant is not None else None,
+        )
+
+    async def acquire(self, context: BaseModel | None = None) -> Slot:
+        """Wait for a slot for a call made with ``context``.
+
+        Raises:
+            LoadShedError: If the call is shed instead.
+            ValueError: If the context's priority is not one of
+                :attr:`classes`.
+        """
+        slot = Slot(self, *self.classify(context))
+        if not self.queued and self._has_room(slot.tenant):
+            self._start(slot)
+            return slot
+
+        self._prune()
+        self._enqueue(slot)
+        future = slot._future = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._dispatch()
+        try:
+            await asyncio.wait_for(
+                future, self.classes[slot.priority].max_queue_time
+            )
+        except TimeoutError:
+            self._abandon(slot)
+            self.shed[slot.priority] += 1
+            raise LoadShedError(
+                slot.priority, slot.queue_wait, "waited too long"
+            ) from None
+        except BaseException:
+            self._abandon(slot)
+            raise
+        return slot
+
+    def _prune(self) -> None:
+        """Drop calls that stopped waiting from the queues, once they outnumber those waiting."""
+        limit = 2 * self.queued + _PRUNE_SLACK
+        if len(self._heap) > limit:
+            self._heap[:] = [
+                slot
+                for slot in self._heap
+                if slot._state == _State.QUEUED
+            ]
+            heapq.heapify(self._heap)
+        for arrivals in self._arrivals.values():
+            if len(arrivals) > limit:
+                waiting = [
+                    slot
+                    for slot in arrivals
+                    if slot._state == _State.QUEUED
+                ]
+                arrivals.clear()
+                arrivals.extend(waiting)
+        if len(self._parked) > limit:
+            for tenant, parked in list(self._parked.items()):
+                parked[:] = [
+                    slot
+                    for slot in parked
+                    if slot._state == _State.QUEUED
+                ]
+                if parked:
+                    heapq.heapify(parked)
+                else:
+                    del self._parked[tenant]
+
+    def _has_room(self, tenant: str | None) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return False
+        if tenant is None:
+            return True
+        quota = self.tenant_quotas.get(tenant, self.tenant_quota)
+        return quota is None or self._tenants[tenant] < quota
+
+    def _start(self, slot: Slot) -> None:
+        slot._state = _State.RUNNING
+        self.in_flight += 1
+        if slot.tenant is not None:
+            self._tenants[slot.tenant] += 1
+
+    def _enqueue(self, slot: Slot) -> None:
+        if self.queued >= self.max_queue_size:
+            self._make_room(slot)
+        weight = self.classes[slot.priority].weight
+        slot._finish = self._last_finish[slot.priority] = (
+            max(
+                self._virtual_time,
+                self._last_finish.get(slot.priority, 0.0),
+            )
+            + 1 / weight
+        )
+        slot._seq = next(self._seq)
+        slot._enqueued = time.perf_counter()
+        heapq.heappush(self._heap, slot)
+        self._arrivals[slot.priority].append(slot)
+        self.queued += 1
+
+    def _make_room(self, arriving: Slot) -> None:
+        """Shed the newest queued call of a lower priority than ``arriving``, or ``arriving`` itself."""
+        weight = self.classes[arriving.priority].weight
+        for priority in sorted(
+            self._arrivals, key=lambda p: self.classes[p].weight
+        ):
+            if self.classes[priority].weight >= weight:
+                break
+            arrivals = self._arrivals[priority]
+            while arrivals:
+                victim = arrivals.pop()
+                if victim._state != _State.QUEUED:
+                    continue
+                assert victim._future is not None
+                victim._state = _State.DONE
+                victim.queue_wait = (
+                    time.perf_counter() - victim._enqueued
+                )
+                self.queued -= 1
+                self.shed[priority] += 1
+                victim._future.set_exception(
+                    LoadShedError(
+                        priority, victim.queue_wait, "queue full"
+                    )
+                )
+                return
+        self.shed[arriving.priority] += 1
+        raise LoadShedError(arriving.priority, 0.0, "queue full")
+
+    def _dispatch(self) -> None:
+        heap = self._heap
+        while heap and self.in_flight < self.max_in_flight:
+            slot = heapq.heappop(heap)
+            if slot._state != _State.QUEUED or slot._future is None:
+                continue
+            if slot._future.done():
+                # timed out, and about to be abandoned
+                continue
+            if not self._has_room(slot.tenant):
+                assert slot.tenant is not None
+                heapq.heappush(
+                    self._parked.setdefault(slot.tenant, []), slot
+                )
+                continue
+            self._virtual_time = slot._finish
+            self.queued -= 1
+            slot.queue_wait = time.perf_counter() - slot._enqueued
+            self._start(slot)
+            slot._future.set_result(None)
+            arrivals = self._arrivals[slot.priority]
+            while arrivals and arrivals[0]._state != _State.QUEUED:
+                arrivals.popleft()
+
+    def _release(self, slot: Slot) -> None:
+        slot._state = _State.DONE
+        self.in_flight -= 1
+        tenant = slot.tenant
+        if tenant is not None:
+            self._tenants[tenant] -= 1
+            if not self._tenants[tenant]:
+                del self._tenants[tenant]
+            # the tenant's next waiting call can start
+            parked = self._parked.get(tenant)
+            while parked:
+                waiting = heapq.heappop(parked)
+                if waiting._state == _State.QUEUED:
+                    heapq.heappush(self._heap, waiting)
+                    break
+            if parked is not None and not parked:
+                del self._parked[tenant]
+        self._dispatch()
+
+    def _abandon(self, slot: Slot) -> None:
+        """Take a call that stopped waiting out of the queue, or free the slot it was just given."""
+        if slot._state == _State.RUNNING:
+            self._release(slot)
+        elif slot._state == _State.QUEUED:
+            slot._state = _State.DONE
+            slot.queue_wait = time.perf_counter() - slot._enqueued
+            self.queued -= 1
+
+
+@contextmanager
+def request_context(context: BaseModel | None) -> Iterator[None]:
+    """Make ``context`` the one the scheduler classifies the current task's calls by."""
+    token = _request_context.set(context)
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def current_request_context() -> BaseModel | None:
+    return _request_context.get()
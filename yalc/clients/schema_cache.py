@@ -0,0 +1,90 @@
+import pickle
+import weakref
+from collections import OrderedDict
+from typing import Any, cast
+
+from pydantic import BaseModel
+
+# response types whose compiled models are kept, least recently used
+# first
+MAX_COMPILED = 256
+
+# class attribute holding a response type's compiled models, so they
+# live exactly as long as the response type itself
+_COMPILED = "__yalc_compiled__"
+
+_recent: OrderedDict[weakref.ref[type[BaseModel]], None] = (
+    OrderedDict()
+)
+
+
+def compiled_model[T: BaseModel](
+    response_type: type[T], partial: bool = False
+) -> type[T]:
+    """instructor's response model for ``response_type``, built once and shared by every client.
+
+    Given a plain pydantic model, instructor wraps it in a new class on every
+    call and generates its JSON schema again to build the provider's tool
+    definition, which for deeply nested models takes milliseconds. The
+    compiled model is that wrapper, built once and with its JSON schema
+    cached, and instructor uses it as is. It validates and parses responses
+    like the wrapper instructor would build. ``partial`` compiles
+    ``Partial[response_type]``, for streams.
+
+    Nothing compiled depends on the provider's mode, so one entry serves
+    every client. The last :data:`MAX_COMPILED` response types are kept.
+    Entries are stored on the response type itself, so a model created at
+    runtime does not outlive its last use because of this cache.
+    """
+    compiled: dict[bool, type[BaseModel]] | None = (
+        response_type.__dict__.get(_COMPILED)
+    )
+    if compiled is None:
+        compiled = {}
+        setattr(response_type, _COMPILED, compiled)
+    model = compiled.get(partial)
+    if model is None:
+        model = compiled[partial] = _compile(response_type, partial)
+    _touch(response_type)
+    return cast(type[T], model)
+
+
+def _compile(
+    response_type: type[BaseModel], partial: bool
+) -> type[BaseModel]:
+    from instructor import Partial, openai_schema
+
+    if partial:
+        response_type = Partial[response_type]  # type: ignore[valid-type, assignment]
+    model = cast(type[BaseModel], openai_schema(response_type))
+    # pickled, since unpickling is the fastest way to copy it
+    schema = pickle.dumps(model.model_json_schema())
+
+    def model_json_schema(
+        cls: type[BaseModel], *args: Any, **kwargs: Any
+    ) -> dict[str, Any]:
+        if args or kwargs:
+            return BaseModel.model_json_schema.__func__(  # type: ignore[attr-defined]
+                cls, *args, **kwargs
+            )
+        # the OpenAI SDK makes the schema strict in place
+        return pickle.loads(schema)
+
+    model.model_json_schema = classmethod(model_json_schema)  # type: ignore[method-assign, assignment]
+    return model
+
+
+def _touch(response_type: type[BaseModel]) -> None:
+    ref = weakref.ref(response_type)
+    if ref in _recent:
+        _recent.move_to_end(ref)
+        return
+    _recent[weakref.ref(response_type, _forget)] = None
+    while len(_recent) > MAX_COMPILED:
+        evicted = _recent.popitem(last=False)[0]()
+        if evicted is not None:
+            delattr(evicted, _COMPILED)
+
+
+def _forget(ref: weakref.ref[type[BaseModel]]) -> None:
+    _recent.pop(ref, None)
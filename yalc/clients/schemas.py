@@ -1,6 +1,17 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+from pydantic import (
+    BaseModel,
+    Field,
+    SkipValidation,
+    computed_field,
+    model_validator,
+)
 
 from yalc.common.schemas import ContextMessage, LLMRole, ResponseStats
+from yalc.common.utils import to_context_messages
 
 
 class ClientMessage(BaseModel):
@@ -10,9 +21,104 @@ class ClientMessage(BaseModel):
     role: LLMRole
 
 
+class CallTiming(BaseModel):
+    """Where the time of a call went. Durations are in seconds."""
+
+    # wall clock, seconds since the epoch
+    started_at: float
+    ended_at: float
+    # waiting for the scheduler and the rate limiter
+    queue_time: float = 0.0
+    # from sending the first request to its response headers
+    time_to_first_byte: float | None = None
+    # waiting on the provider, over all attempts
+    provider_latency: float = 0.0
+    # parsing and validating responses, over all attempts
+    parse_time: float = 0.0
+    # provider attempts after the first, after validation and transport
+    # errors alike
+    retries: int = 0
+    # duration of each provider attempt
+    attempts: list[float] = []
+
+    @property
+    def duration(self) -> float:
+        return self.ended_at - self.started_at
+
+
 class ClientCall(ResponseStats):
-    """Full record of a single LLM call: input messages, parsed response, and token/cost stats."""
+    """Full record of a single LLM call: input messages, parsed response, and token/cost stats.
 
-    context_messages: list[ContextMessage]
+    The input messages are kept as sent, and only turned into ``context_messages``
+    when those are first read or the call is serialized.
+    """
+
+    # the input messages as sent to the provider
+    messages: SkipValidation[list[dict[str, Any]]] = Field(
+        default=[], exclude=True, repr=False
+    )
     client_message: ClientMessage
     model_name: str
+    cache_hit: bool = False
+    coalesced: bool = False
+    batch: bool = False
+    # seconds until a streamed response had its first field
+    time_to_first_field: float | None = None
+    # seconds the call waited for the client's RequestScheduler
+    queue_wait_time: float = 0.0
+    timing: CallTiming | None = None
+    # requests a RoutingClient sent to other models for this call, and
+    # the cost of the answers that were not used
+    hedges: int = 0
+    failovers: int = 0
+    wasted_cost: float = 0.0
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_context_messages(cls, data: Any) -> Any:
+        # serialized calls carry context_messages rather than messages
+        if isinstance(data, dict) and "context_messages" in data:
+            data = dict(data)
+            data["messages"] = [
+                {"role": m.role, "content": m.message}
+                for m in map(
+                    ContextMessage.model_validate,
+                    data.pop("context_messages"),
+                )
+            ]
+        return data
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def context_messages(self) -> list[ContextMessage]:
+        return to_context_messages(self.messages)
+
+
+@dataclass
+class BatchResult[T: BaseModel]:
+    """Outcome of one item of a batch call.
+
+    ``index`` is the item's position in the input. A successful item carries the parsed
+    ``response`` and its ``call`` record, a failed one carries the ``error`` it raised.
+    """
+
+    index: int
+    response: T | None = None
+    call: ClientCall | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class StreamedResponse[T: BaseModel]:
+    """One update of a streamed response.
+
+    Until the stream completes, ``response`` is partial and ``call`` is ``None``. The
+    final update carries the validated ``response`` and its ``call`` record.
+    """
+
+    response: T
+    call: ClientCall | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.call is not None
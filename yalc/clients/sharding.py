@@ -0,0 +1,423 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from yalc.clients.client import _aiter
+from yalc.clients.dispatch import StrategyDispatcher
+from yalc.clients.pool import PoolConfig
+from yalc.clients.rate_limit import (
+    RateLimits,
+    TokenBucketRateLimiter,
+    get_rate_limiter,
+)
+from yalc.clients.schemas import BatchResult
+from yalc.clients.strategy import ClientMetadataStrategy
+from yalc.common.schemas import LLMModel, ResponseStats
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+# seconds between checks that the workers are still alive while
+# waiting for results
+_LIVENESS_INTERVAL = 1.0
+# results taken off the queue per hop to the event loop
+_MAX_RECEIVE = 256
+# seconds workers get to finish their calls on close
+_JOIN_TIMEOUT = 30.0
+
+
+class ShardedExecutor:
+    """Runs batches of structured responses on a pool of worker processes.
+
+    A single event loop spends most of its time parsing and validating
+    responses once thousands of calls are in flight, which caps a batch at
+    one core. The executor spreads a batch over ``workers`` processes, each
+    with its own event loop and its own client from
+    :func:`~yalc.clients.client_factory.create_client`, running up to
+    ``max_concurrency`` calls at a time.
+
+    Inputs are read lazily and results streamed back as they complete, so
+    only the calls in flight are held in memory. The ``ClientCall`` of every
+    result is returned to this process, where ``metadata_strategies`` run
+    and :attr:`usage` adds up the tokens and costs of every call.
+
+    ``client_options`` are passed to ``create_client`` in every worker and
+    have to be picklable, e.g. ``api_key``, ``retry_policy`` or
+    ``context_budget``. Response types and their errors cross processes
+    too: response types must be importable from a module, and errors that
+    cannot be pickled, like the provider SDKs' HTTP errors, arrive as a
+    ``RuntimeError`` with the original type and message.
+
+    Rate limits cannot be shared between processes, so ``rate_limits`` are
+    split evenly between the workers. They default to the limits
+    registered for the model with
+    :func:`~yalc.clients.rate_limit.set_rate_limits`.
+
+    Workers are started on first use, with the ``spawn`` method, so scripts
+    using the executor need an ``if __name__ == "__main__"`` guard. Batches
+    run one at a time. Call :meth:`aclose` to stop the workers, or use the
+    executor as an async context manager.
+    """
+
+    def __init__(
+        self,
+        model: LLMModel,
+        workers: int | None = None,
+        max_concurrency: int = 100,
+        metadata_strategies: list[ClientMetadataStrategy] = [],
+        dispatcher: StrategyDispatcher | None = None,
+        rate_limits: RateLimits | None = None,
+        pool_config: PoolConfig | None = None,
+        **client_options: Any,
+    ):
+        self.model = model
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency
+        self.metadata_strategies = metadata_strategies
+        self.dispatcher = dispatcher or StrategyDispatcher()
+        if rate_limits is None:
+            limiter = get_rate_limiter(model)
+            if isinstance(limiter, TokenBucketRateLimiter):
+                rate_limits = limiter.limits
+        self.rate_limits = rate_limits
+        self.pool_config = pool_config
+        self.client_options = client_options
+        # tokens and costs of every call made through the executor
+        self.usage = ResponseStats(
+            input_tokens=0,
+            output_tokens=0,
+            input_tokens_cost=0.0,
+            output_tokens_cost=0.0,
+        )
+        self._processes: list[BaseProcess] = []
+        self._inputs: Any = None
+        self._outputs: Any = None
+        # the batch being run, shared with the workers; -1 between batches
+        self._active: Any = None
+        self._lock = asyncio.Lock()
+        # tags the inputs and results of each batch, so results of an
+        # abandoned batch are not mistaken for those of the next one
+        self._batches = itertools.count()
+
+    async def __aenter__(self) -> "ShardedExecutor":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def structured_response_many[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages_batch: Iterable[list[dict[str, str]]]
+        | AsyncIterable[list[dict[str, str]]],
+        context: BaseModel | None = None,
+    ) -> list[BatchResult[T]]:
+        """Sends every message list in ``messages_batch`` and returns the results in input order."""
+        results = [
+            result
+            async for result in self.structured_response_as_completed(
+                response_type, messages_batch, context
+            )
+        ]
+        results.sort(key=lambda result: result.index)
+        return results
+
+    async def structured_response_as_completed[T: BaseModel](
+        self,
+        response_type: type[T],
+        messages_batch: Iterable[list[dict[str, str]]]
+        | AsyncIterable[list[dict[str, str]]],
+        context: BaseModel | None = None,
+    ) -> AsyncIterator[BatchResult[T]]:
+        """
+        Sends every message list in ``messages_batch`` and yields results as they complete.
+
+        Like :meth:`~yalc.clients.client.Client.structured_response_as_completed`, a
+        failing item yields a :class:`BatchResult` carrying the error. At most twice
+        the calls the workers run at once are sent ahead, so lazy generators of any
+        size run in bounded memory. If ``context`` is provided, metadata strategies
+        are invoked for every success. Once the caller stops iterating, the calls
+        the workers have not started yet are never sent.
+
+        Raises:
+            RuntimeError: If a worker process dies.
+        """
+        async with self._lock:
+            self._start()
+            loop = asyncio.get_running_loop()
+            batch = self._active.value = next(self._batches)
+            window = 2 * self.workers * self.max_concurrency
+            items = _aiter(messages_batch)
+            sent = received = 0
+            exhausted = False
+            try:
+                while True:
+                    while not exhausted and sent - received < window:
+                        try:
+                            messages = await anext(items)
+                        except StopAsyncIteration:
+                            exhausted = True
+                            break
+                        # pickled here, so what cannot be sent raises here
+                        self._inputs.put(
+                            pickle.dumps(
+                                (batch, sent, response_type, messages)
+                            )
+                        )
+                        sent += 1
+                    if exhausted and received == sent:
+                        return
+
+                    for payload in await loop.run_in_executor(
+                        None, self._receive
+                    ):
+                        result_batch, result = pickle.loads(payload)
+                        if result_batch != batch:
+                            continue
+                        received += 1
+                        yield await self._merge(result, context)
+            finally:
+                # workers skip the calls of an abandoned batch instead
+                # of sending them
+                self._active.value = -1
+                self._withdraw()
+
+    async def aclose(self) -> None:
+        """Stop the workers once they have finished their calls."""
+        processes = self._processes
+        if not processes:
+            return
+        self._processes = []
+        for _ in processes:
+            self._inputs.put(None)
+        await asyncio.get_running_loop().run_in_executor(
+            None, _join, processes
+        )
+
+    def _start(self) -> None:
+        if self._processes:
+            return
+        context = multiprocessing.get_context("spawn")
+        self._inputs = context.Queue()
+        self._outputs = context.Queue()
+        self._active = context.Value("q", -1, lock=False)
+        rate_limits = self.rate_limits
+        if rate_limits is not None:
+            rate_limits = _split(rate_limits, self.workers)
+        self._processes = [
+            context.Process(
+                target=_work,
+                args=(
+                    self.model,
+                    self.client_options,
+                    self.pool_config,
+                    rate_limits,
+                    self.max_concurrency,
+                    self._inputs,
+                    self._outputs,
+                    self._active,
+                ),
+                daemon=True,
+            )
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def _withdraw(self) -> None:
+        """Take the calls no worker has picked up yet off the queue."""
+        while True:
+            try:
+                self._inputs.get_nowait()
+            except queue.Empty:
+                return
+
+    def _receive(self) -> list[bytes]:
+        """Wait for results, then take those already queued behind them."""
+        while True:
+            try:
+                payloads = [
+                    self._outputs.get(timeout=_LIVENESS_INTERVAL)
+                ]
+                break
+            except queue.Empty:
+                for process in self._processes:
+                    if not process.is_alive():
+                        raise RuntimeError(
+                            f"Worker process {process.pid} exited "
+                            f"with code {process.exitcode}"
+                        )
+        while len(payloads) < _MAX_RECEIVE:
+            try:
+                payloads.append(self._outputs.get_nowait())
+            except queue.Empty:
+                break
+        return payloads
+
+    async def _merge[T: BaseModel](
+        self, result: BatchResult[T], context: BaseModel | None
+    ) -> BatchResult[T]:
+        llm_call = result.call
+        if llm_call is None:
+            return result
+        self.usage += llm_call
+        if context is not None:
+            try:
+                await self.dispatcher.dispatch(
+                    self.metadata_strategies, llm_call, context
+                )
+            except Exception as e:
+                return BatchResult(index=result.index, error=e)
+        return result
+
+
+def _split(limits: RateLimits, workers: int) -> RateLimits:
+    def share(per_minute: int | None) -> int | None:
+        if per_minute is None:
+            return None
+        return max(per_minute // workers, 1)
+
+    return replace(
+        limits,
+        requests_per_minute=share(limits.requests_per_minute),
+        tokens_per_minute=share(limits.tokens_per_minute),
+    )
+
+
+def _join(processes: list["BaseProcess"]) -> None:
+    for process in processes:
+        process.join(_JOIN_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+
+def _work(
+    model: LLMModel,
+    client_options: dict[str, Any],
+    pool_config: PoolConfig | None,
+    rate_limits: RateLimits | None,
+    max_concurrency: int,
+    inputs: Any,
+    outputs: Any,
+    active: Any,
+) -> None:
+    # results of an abandoned batch are not waited for on exit
+    outputs.cancel_join_thread()
+    asyncio.run(
+        _serve(
+            model,
+            client_options,
+            pool_config,
+            rate_limits,
+            max_concurrency,
+            inputs,
+            outputs,
+            active,
+        )
+    )
+
+
+async def _serve(
+    model: LLMModel,
+    client_options: dict[str, Any],
+    pool_config: PoolConfig | None,
+    rate_limits: RateLimits | None,
+    max_concurrency: int,
+    inputs: Any,
+    outputs: Any,
+    active: Any,
+) -> None:
+    from yalc.clients.client_factory import create_client
+    from yalc.clients.pool import ProviderClientPool
+
+    pool = ProviderClientPool(pool_config)
+    client = create_client(
+        model,
+        pool=pool,
+        rate_limiter=TokenBucketRateLimiter(rate_limits)
+        if rate_limits is not None
+        else None,
+        **client_options,
+    )
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_concurrency)
+    tasks: set[asyncio.Task[None]] = set()
+
+    async def run(
+        batch: int,
+        index: int,
+        response_type: type[BaseModel],
+        messages: list[dict[str, str]],
+    ) -> None:
+        try:
+            if batch != active.value:
+                # abandoned, its result would be thrown away
+                return
+            result = await client._batch_item(
+                index, response_type, messages, None
+            )
+            outputs.put(_dumps(batch, result, response_type))
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            item = await loop.run_in_executor(None, inputs.get)
+            if item is None:
+                break
+            task = asyncio.create_task(run(*pickle.loads(item)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+    finally:
+        await pool.aclose()
+
+
+def _dumps(
+    batch: int,
+    result: BatchResult[BaseModel],
+    response_type: type[BaseModel],
+) -> bytes:
+    """Pickle ``result`` for the executor, with what cannot cross processes replaced."""
+    response = result.response
+    if response is not None and type(response) is not response_type:
+        # instructor parses into a subclass built at runtime, which
+        # cannot be pickled by reference
+        response = response_type.model_construct(
+            response.model_fields_set, **dict(response)
+        )
+        result.response = response
+        if result.call is not None:
+            result.call.client_message.response = response
+    error = result.error
+    if error is not None:
+        try:
+            pickle.loads(pickle.dumps(error))
+        except Exception:
+            result.error = RuntimeError(
+                f"{type(error).__name__}: {error}"
+            )
+    try:
+        return pickle.dumps((batch, result))
+    except Exception as e:
+        return pickle.dumps(
+            (
+                batch,
+                BatchResult(
+                    index=result.index,
+                    error=RuntimeError(
+                        f"Result could not be pickled: {e}"
+                    ),
+                ),
+            )
+        )
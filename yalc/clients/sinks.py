@@ -0,0 +1,112 @@
+import asyncio
+import json
+import re
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from yalc.clients.schemas import ClientCall
+
+type MetadataBatch = list[tuple[ClientCall, BaseModel | None]]
+
+# table names are put into the SQL as they are, so only plain identifiers
+_TABLE_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _dump_call(call: ClientCall) -> dict[str, Any]:
+    # serialize_as_any keeps the fields of the concrete response model
+    return call.model_dump(mode="json", serialize_as_any=True)
+
+
+def _dump_context(context: BaseModel | None) -> dict[str, Any] | None:
+    return (
+        None if context is None else context.model_dump(mode="json")
+    )
+
+
+class MetadataSink(ABC):
+    """Destination that persists buffered ``(ClientCall, context)`` pairs in bulk."""
+
+    @abstractmethod
+    async def write(self, batch: MetadataBatch) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class JSONLSink(MetadataSink):
+    """Appends one JSON object per call to a file, with ``call`` and ``context`` keys."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    async def write(self, batch: MetadataBatch) -> None:
+        lines = "".join(
+            json.dumps(
+                {
+                    "call": _dump_call(call),
+                    "context": _dump_context(context),
+                }
+            )
+            + "\n"
+            for call, context in batch
+        )
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: str) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class SQLiteSink(MetadataSink):
+    """Inserts calls into a SQLite table, one transaction per batch.
+
+    Token counts, costs and the model get their own columns for querying; the full call
+    and context are kept as JSON. ``table`` must be a plain SQL identifier.
+    """
+
+    def __init__(self, path: str | Path, table: str = "client_calls"):
+        if not _TABLE_NAME.fullmatch(table):
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.table = table
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False
+        )
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "model_name TEXT NOT NULL, "
+            "input_tokens INTEGER NOT NULL, "
+            "output_tokens INTEGER NOT NULL, "
+            "input_tokens_cost REAL NOT NULL, "
+            "output_tokens_cost REAL NOT NULL, "
+            "call TEXT NOT NULL, context TEXT)"
+        )
+
+    async def write(self, batch: MetadataBatch) -> None:
+        rows = [
+            (
+                call.model_name,
+                call.input_tokens,
+                call.output_tokens,
+                call.input_tokens_cost,
+                call.output_tokens_cost,
+                json.dumps(_dump_call(call)),
+                json.dumps(_dump_context(context)),
+            )
+            for call, context in batch
+        ]
+        await asyncio.to_thread(self._insert, rows)
+
+    async def aclose(self) -> None:
+        self._connection.close()
+
+    def _insert(self, rows: list[tuple[Any, ...]]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO {self.table} VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
@@ -1,8 +1,14 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable
 
 from pydantic import BaseModel
 
 from yalc.clients.schemas import ClientCall
+from yalc.clients.sinks import MetadataBatch, MetadataSink
+
+logger = logging.getLogger(__name__)
 
 
 class ClientMetadataStrategy[T: BaseModel](ABC):
@@ -10,9 +16,102 @@ class ClientMetadataStrategy[T: BaseModel](ABC):
 
     Subclass this and implement :meth:`handle` to define custom behaviour that runs
     after each LLM call when a ``context`` object is passed to
-    :meth:`~yalc.clients.client.Client.structured_response`.
+    :meth:`~yalc.clients.client.Client.structured_response`. ``handle`` may be a plain
+    or an ``async def`` method; when it runs is up to the client's
+    :class:`~yalc.clients.dispatch.StrategyDispatcher`.
     """
 
     @abstractmethod
-    def handle(self, call: ClientCall, context: T | None):
+    def handle(
+        self, call: ClientCall, context: T | None
+    ) -> Awaitable[None] | None:
         pass
+
+
+class BufferedMetadataStrategy[T: BaseModel](
+    ClientMetadataStrategy[T]
+):
+    """Strategy that buffers calls and writes them to a :class:`MetadataSink` in bulk.
+
+    ``handle`` only appends to an in-memory buffer. It is a coroutine, so it runs on
+    the event loop in every dispatch mode, ``THREAD`` included. The buffer is written out in a
+    background task once it holds ``max_batch_size`` calls, and at least every
+    ``flush_interval`` seconds. Once ``max_buffer_size`` calls are waiting, new ones are
+    dropped; so are batches the sink fails to write. ``queued``, ``written`` and
+    ``dropped`` count what happened to each call.
+
+    Call :meth:`aclose` on shutdown to write out whatever is still buffered.
+    """
+
+    def __init__(
+        self,
+        sink: MetadataSink,
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer_size: int = 10_000,
+    ):
+        self.sink = sink
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.written = 0
+        self.dropped = 0
+        self._buffer: MetadataBatch = []
+        self._write_lock = asyncio.Lock()
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+        self._timer: asyncio.Task[None] | None = None
+
+    @property
+    def queued(self) -> int:
+        """Number of calls buffered and not yet written."""
+        return len(self._buffer)
+
+    async def handle(
+        self, call: ClientCall, context: T | None
+    ) -> None:
+        if len(self._buffer) >= self.max_buffer_size:
+            self.dropped += 1
+            return
+
+        self._buffer.append((call, context))
+        if self._timer is None:
+            self._timer = asyncio.create_task(
+                self._flush_periodically()
+            )
+        if len(self._buffer) >= self.max_batch_size:
+            task = asyncio.create_task(self.flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> None:
+        """Write everything buffered so far to the sink."""
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+
+        async with self._write_lock:
+            try:
+                await self.sink.write(batch)
+            except Exception:
+                self.dropped += len(batch)
+                logger.exception(
+                    "Failed to write %d calls to %s",
+                    len(batch),
+                    type(self.sink).__name__,
+                )
+            else:
+                self.written += len(batch)
+
+    async def aclose(self) -> None:
+        """Stop the flush timer, write out the buffer and close the sink."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await asyncio.gather(*self._flush_tasks)
+        await self.flush()
+        await self.sink.aclose()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
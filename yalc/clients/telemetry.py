@@ -0,0 +1,216 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from yalc.clients.schemas import CallTiming, ClientCall
+from yalc.common.schemas import LLMModel
+
+if TYPE_CHECKING:
+    from opentelemetry.trace import Tracer
+    from prometheus_client import CollectorRegistry
+
+logger = logging.getLogger(__name__)
+
+# seconds, from a cached answer to a long reasoning call
+DEFAULT_BUCKETS = (
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class CallObserver(ABC):
+    """Receives the timing of every call a client makes, e.g. to export it.
+
+    ``observe`` runs on the event loop once the call has finished, with the
+    :class:`ClientCall` of a successful call or the ``error`` a failed one
+    raised. Keep it cheap. Errors it raises are logged and otherwise
+    ignored.
+    """
+
+    @abstractmethod
+    def observe(
+        self,
+        model: LLMModel,
+        timing: CallTiming,
+        call: ClientCall | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        pass
+
+
+def notify(
+    observers: list[CallObserver],
+    model: LLMModel,
+    timing: CallTiming,
+    call: ClientCall | None = None,
+    error: Exception | None = None,
+) -> None:
+    for observer in observers:
+        try:
+            observer.observe(model, timing, call, error)
+        except Exception:
+            logger.exception(
+                "Call observer %s failed", type(observer).__name__
+            )
+
+
+class OpenTelemetryObserver(CallObserver):
+    """Emits every call as an OpenTelemetry span.
+
+    The span starts and ends with the call, is a child of the span current
+    when the call was made, and carries the timings, token usage and cost
+    as attributes. Requires ``opentelemetry-api``.
+    """
+
+    def __init__(self, tracer: "Tracer | None" = None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("yalc")
+
+    def observe(
+        self,
+        model: LLMModel,
+        timing: CallTiming,
+        call: ClientCall | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        attributes: dict[str, Any] = {
+            "gen_ai.request.model": model.value,
+            "gen_ai.system": model.provider.value,
+            "yalc.queue_time": timing.queue_time,
+            "yalc.provider_latency": timing.provider_latency,
+            "yalc.parse_time": timing.parse_time,
+            "yalc.retries": timing.retries,
+        }
+        if timing.time_to_first_byte is not None:
+            attributes["yalc.time_to_first_byte"] = (
+                timing.time_to_first_byte
+            )
+        if call is not None:
+            attributes |= {
+                "gen_ai.usage.input_tokens": call.input_tokens,
+                "gen_ai.usage.output_tokens": call.output_tokens,
+                "yalc.cost": call.input_tokens_cost
+                + call.output_tokens_cost,
+                "yalc.cache_hit": call.cache_hit,
+                "yalc.coalesced": call.coalesced,
+            }
+
+        span = self.tracer.start_span(
+            f"yalc {model.value}",
+            start_time=_nanoseconds(timing.started_at),
+            attributes=attributes,
+        )
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(
+                self._trace.Status(
+                    self._trace.StatusCode.ERROR, str(error)
+                )
+            )
+        span.end(end_time=_nanoseconds(timing.ended_at))
+
+
+class PrometheusObserver(CallObserver):
+    """Records call timings in Prometheus histograms, labelled by model.
+
+    Exports ``yalc_call_duration_seconds``, ``yalc_queue_time_seconds``,
+    ``yalc_time_to_first_byte_seconds``, ``yalc_provider_latency_seconds``
+    and ``yalc_parse_time_seconds``, and counts retries and failed calls.
+    Metrics are registered with ``registry`` when the observer is created,
+    so create one per registry and share it between clients. Requires
+    ``prometheus-client``.
+    """
+
+    def __init__(
+        self,
+        registry: "CollectorRegistry | None" = None,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        if registry is None:
+            registry = REGISTRY
+
+        def histogram(name: str, documentation: str) -> Histogram:
+            return Histogram(
+                name,
+                documentation,
+                ["model"],
+                namespace="yalc",
+                buckets=buckets,
+                registry=registry,
+            )
+
+        self.duration = histogram(
+            "call_duration_seconds", "Duration of LLM calls"
+        )
+        self.queue_time = histogram(
+            "queue_time_seconds",
+            "Time calls waited for the scheduler and the rate limiter",
+        )
+        self.time_to_first_byte = histogram(
+            "time_to_first_byte_seconds",
+            "Time from sending a request to the first response bytes",
+        )
+        self.provider_latency = histogram(
+            "provider_latency_seconds",
+            "Time spent waiting on the provider, over all attempts",
+        )
+        self.parse_time = histogram(
+            "parse_time_seconds",
+            "Time spent parsing and validating responses",
+        )
+        self.retries = Counter(
+            "call_retries",
+            "Provider attempts retried",
+            ["model"],
+            namespace="yalc",
+            registry=registry,
+        )
+        self.errors = Counter(
+            "call_errors",
+            "LLM calls that failed",
+            ["model", "error"],
+            namespace="yalc",
+            registry=registry,
+        )
+
+    def observe(
+        self,
+        model: LLMModel,
+        timing: CallTiming,
+        call: ClientCall | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        label = model.value
+        self.duration.labels(label).observe(timing.duration)
+        self.queue_time.labels(label).observe(timing.queue_time)
+        if timing.time_to_first_byte is not None:
+            self.time_to_first_byte.labels(label).observe(
+                timing.time_to_first_byte
+            )
+        if timing.attempts:
+            self.provider_latency.labels(label).observe(
+                timing.provider_latency
+            )
+            self.parse_time.labels(label).observe(timing.parse_time)
+        if timing.retries:
+            self.retries.labels(label).inc(timing.retries)
+        if error is not None:
+            self.errors.labels(label, type(error).__name__).inc()
+
+
+def _nanoseconds(seconds: float) -> int:
+    return int(seconds * 1e9)
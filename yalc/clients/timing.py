@@ -0,0 +1,179 @@
+import time
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from yalc.clients.schemas import CallTiming
+
+if TYPE_CHECKING:
+    import httpx
+    from instructor import AsyncInstructor
+
+# the timer of the call running in the current task; instructor and
+# httpx hooks are shared between calls and report to it
+_current_timer: ContextVar["CallTimer | None"] = ContextVar(
+    "yalc_call_timer", default=None
+)
+
+# instructor clients that already report to the current timer
+_instrumented: weakref.WeakSet["AsyncInstructor"] = weakref.WeakSet()
+
+
+class CallTimer:
+    """Collects the timing of one call while it runs.
+
+    Provider attempts are reported by the instructor hooks that
+    :func:`instrument` installs, the first response bytes by
+    :func:`record_first_byte`. Without them the whole provider call counts
+    as one attempt.
+    """
+
+    __slots__ = (
+        "started_at",
+        "queue_time",
+        "time_to_first_byte",
+        "provider_latency",
+        "parse_time",
+        "attempts",
+        "responses",
+        "_started",
+        "_attempt_started",
+        "_response_at",
+    )
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.queue_time = 0.0
+        self.time_to_first_byte: float | None = None
+        self.provider_latency = 0.0
+        self.parse_time = 0.0
+        self.attempts: list[float] = []
+        # raw response of every attempt, with the usage it arrived with
+        self.responses: list[tuple[Any, Any]] = []
+        self._started = time.perf_counter()
+        self._attempt_started: float | None = None
+        self._response_at: float | None = None
+
+    def attempt_started(self) -> None:
+        self._attempt_started = time.perf_counter()
+        self._response_at = None
+
+    def first_byte(self) -> None:
+        if (
+            self.time_to_first_byte is None
+            and self._attempt_started is not None
+        ):
+            self.time_to_first_byte = (
+                time.perf_counter() - self._attempt_started
+            )
+
+    def response_received(self, response: Any = None) -> None:
+        if response is not None:
+            self.responses.append(
+                (response, getattr(response, "usage", None))
+            )
+        if self._attempt_started is None:
+            return
+        now = self._response_at = time.perf_counter()
+        self.provider_latency += now - self._attempt_started
+
+    def attempt_ended(self) -> None:
+        """Close the current attempt, once its response is parsed or it failed."""
+        if self._attempt_started is None:
+            return
+        now = time.perf_counter()
+        if self._response_at is not None:
+            self.parse_time += now - self._response_at
+        else:
+            # the request itself failed
+            self.provider_latency += now - self._attempt_started
+        self.attempts.append(now - self._attempt_started)
+        self._attempt_started = self._response_at = None
+
+    def provider_call_ended(self, started: float) -> None:
+        """Close the last attempt once the provider call returns.
+
+        ``started`` is the ``perf_counter`` time the call was made at.
+        """
+        if self._attempt_started is not None:
+            self.attempt_ended()
+        elif not self.attempts:
+            # nothing reported, count the call as a single attempt
+            elapsed = time.perf_counter() - started
+            self.provider_latency += elapsed
+            self.attempts.append(elapsed)
+
+    def finish(self) -> CallTiming:
+        duration = time.perf_counter() - self._started
+        return CallTiming(
+            started_at=self.started_at,
+            ended_at=self.started_at + duration,
+            queue_time=self.queue_time,
+            time_to_first_byte=self.time_to_first_byte,
+            provider_latency=self.provider_latency,
+            parse_time=self.parse_time,
+            retries=max(len(self.attempts) - 1, 0),
+            attempts=self.attempts,
+        )
+
+
+def current_timer() -> CallTimer | None:
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_call() -> Iterator[CallTimer]:
+    """Time the call made in the body, which the hooks then report to."""
+    timer = CallTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+def instrument(instructor_client: "AsyncInstructor") -> None:
+    """Report the attempts made through ``instructor_client`` to the current timer.
+
+    Safe to call more than once per client. The hooks do nothing for calls
+    made outside of a timed call.
+    """
+    if instructor_client in _instrumented:
+        return
+    instructor_client.on("completion:kwargs", _attempt_started)
+    instructor_client.on("completion:response", _response_received)
+    instructor_client.on("parse:error", _attempt_ended)
+    instructor_client.on("completion:error", _attempt_ended)
+    _instrumented.add(instructor_client)
+
+
+async def record_first_byte(response: "httpx.Response") -> None:
+    """``httpx`` response event hook that records the time to first byte.
+
+    Response hooks run once the headers are in, before the body is read.
+    The pooled transport installs it; add it to the ``event_hooks`` of your
+    own ``httpx.AsyncClient`` to time calls made through it.
+    """
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.first_byte()
+
+
+def _attempt_started(*args: Any, **kwargs: Any) -> None:
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.attempt_started()
+
+
+def _response_received(response: Any) -> None:
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.response_received(response)
+
+
+def _attempt_ended(error: Exception) -> None:
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.attempt_ended()
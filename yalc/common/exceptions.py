@@ -0,0 +1,63 @@
+from yalc.common.schemas import LLMModel
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model whose circuit breaker is open.
+
+    ``retry_after`` is the number of seconds until the breaker lets a trial call
+    through.
+    """
+
+    def __init__(self, model: LLMModel, retry_after: float):
+        super().__init__(
+            f"Circuit open for {model}, retry in {retry_after:.1f}s"
+        )
+        self.model = model
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        return type(self), (self.model, self.retry_after)
+
+
+class ContextWindowExceededError(ValueError):
+    """Raised instead of sending a conversation too long for the model.
+
+    ``tokens`` is the estimated input of the conversation and ``limit`` the
+    input tokens the model's context window leaves for it.
+    """
+
+    def __init__(self, model: LLMModel, tokens: int, limit: int):
+        super().__init__(
+            f"Conversation of ~{tokens} tokens exceeds the {limit} "
+            f"input tokens available for {model}"
+        )
+        self.model = model
+        self.tokens = tokens
+        self.limit = limit
+
+    def __reduce__(self):
+        return type(self), (self.model, self.tokens, self.limit)
+
+
+class LoadShedError(RuntimeError):
+    """Raised instead of sending a call the scheduler dropped.
+
+    ``priority`` is the call's priority class and ``queue_wait`` the seconds
+    it waited before it was shed, either because it waited longer than its
+    class allows or because the queue was full.
+    """
+
+    def __init__(self, priority: str, queue_wait: float, reason: str):
+        super().__init__(
+            f"Shed {priority} call after {queue_wait:.1f}s: {reason}"
+        )
+        self.priority = priority
+        self.queue_wait = queue_wait
+        self.reason = reason
+
+    def __reduce__(self):
+        return type(self), (
+            self.priority,
+            self.queue_wait,
+            self.reason,
+        )
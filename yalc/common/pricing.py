@@ -1,61 +1,415 @@
-from cachetools import TTLCache, cached
-from litellm import model_cost_map_url
-from litellm.litellm_core_utils.get_model_cost_map import (
-    get_model_cost_map,
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from importlib.resources import files
+from pathlib import Path
+from typing import Any, ClassVar
+
+from yalc.common.schemas import (
+    LLMModel,
+    ModelLimits,
+    ResponseStats,
+    TokensPricing,
+)
+
+logger = logging.getLogger(__name__)
+
+type CostMap = dict[str, dict[str, Any]]
+
+# the cost map litellm maintains, which is all yalc uses of litellm
+MODEL_COST_MAP_URL = (
+    "https://raw.githubusercontent.com/BerriAI/litellm/main/"
+    "model_prices_and_context_window.json"
 )
 
-from yalc.common.schemas import LLMModel, ResponseStats, TokensPricing
+# cost map fields kept in snapshots, the rest is never read
+SNAPSHOT_KEYS = (
+    "input_cost_per_token",
+    "output_cost_per_token",
+    "input_cost_per_token_batches",
+    "output_cost_per_token_batches",
+    "cache_read_input_token_cost",
+    "cache_creation_input_token_cost",
+    "output_cost_per_reasoning_token",
+    "max_input_tokens",
+    "max_output_tokens",
+)
+
+# fraction of the interactive price charged for batch API requests
+BATCH_DISCOUNT = 0.5
+
+
+class PricingPolicy(StrEnum):
+    """How a :class:`PricingTable` keeps its prices current."""
+
+    # serve the seeded snapshot until refresh() is called explicitly, so
+    # costs are deterministic and computing them never does I/O
+    PINNED = "pinned"
+    # also refresh from the remote cost map in the background every ttl
+    REFRESH = "refresh"
+
+
+def fetch_remote_cost_map() -> CostMap:
+    """Download the latest litellm cost map.
+
+    Unlike litellm's own loader this does not silently fall back to the
+    bundled copy, so callers can tell a failed refresh from a fresh one.
+    """
+    import httpx
+
+    response = httpx.get(MODEL_COST_MAP_URL, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+
+def load_bundled_cost_map() -> CostMap:
+    """Load the pricing snapshot bundled with yalc.
+
+    It covers every :class:`LLMModel` and is regenerated with
+    ``scripts/update_pricing_snapshot.py``.
+    """
+    return json.loads(
+        files("yalc.common")
+        .joinpath("pricing_snapshot.json")
+        .read_text(encoding="utf-8")
+    )
+
+
+def snapshot_entries(cost_map: CostMap) -> CostMap:
+    """The :data:`SNAPSHOT_KEYS` of every :class:`LLMModel` in ``cost_map``."""
+    return {
+        model.value: {
+            key: cost_map[model][key]
+            for key in SNAPSHOT_KEYS
+            if key in cost_map[model]
+        }
+        for model in LLMModel
+        if model in cost_map
+    }
+
+
+class PricingTable:
+    """In-memory index of :class:`TokensPricing` keyed by :class:`LLMModel`.
+
+    Lookups never touch the network. The first lookup seeds the table from
+    a local snapshot: ``snapshot_path`` if it exists, otherwise the one
+    bundled with yalc. With the default ``PINNED`` policy those prices are
+    kept until :meth:`refresh` is called. With ``REFRESH``, every lookup
+    past ``ttl`` kicks off a refresh from the remote cost map in a
+    background thread; until that refresh lands, or if it fails, the
+    previous prices keep being served.
+
+    :attr:`version` identifies the prices being served. It is derived from
+    the prices themselves, so the same prices always have the same version.
+    """
+
+    def __init__(
+        self,
+        policy: PricingPolicy = PricingPolicy.PINNED,
+        ttl: float = 60 * 5,
+        fetch: Callable[[], CostMap] = fetch_remote_cost_map,
+        snapshot_path: Path | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy = policy
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self._fetch = fetch
+        self._clock = clock
+        # the index and its version are swapped together
+        self._state: (
+            tuple[dict[LLMModel, TokensPricing], str] | None
+        ) = None
+        self._limits: dict[LLMModel, ModelLimits] = {}
+        # the snapshot entries the index is built from
+        self._entries: CostMap = {}
+        self._refresh_due = 0.0
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def version(self) -> str:
+        """Version of the prices served, empty until the table is seeded."""
+        state = self._state
+        return "" if state is None else state[1]
+
+    def get(self, model: LLMModel) -> TokensPricing:
+        """Return the pricing for ``model`` without blocking on I/O."""
+        return self.lookup(model)[0]
+
+    def lookup(self, model: LLMModel) -> tuple[TokensPricing, str]:
+        """Return the pricing for ``model`` with the version it belongs to."""
+        state = self._state
+        if state is None:
+            state = self._load_snapshot()
+        self.refresh_if_due()
+
+        index, version = state
+        pricing = index.get(model)
+        if pricing is None:
+            raise ValueError(
+                f"Model {model} not found in pricing data"
+            )
+        return pricing, version
+
+    def limits(self, model: LLMModel) -> ModelLimits:
+        """Return the context window of ``model`` without blocking on I/O."""
+        if self._state is None:
+            self._load_snapshot()
+        return self._limits.get(model, ModelLimits())
+
+    def update(self, cost_map: CostMap) -> None:
+        """Merge the prices in ``cost_map`` over the current ones.
+
+        Models missing from ``cost_map`` keep their current prices, so a
+        cost map that lags behind :class:`LLMModel` never drops any.
+        """
+        entries = self._entries = {
+            **self._entries,
+            **snapshot_entries(cost_map),
+        }
+        index = {
+            model: TokensPricing(
+                input_cost_per_token=entry.get(
+                    "input_cost_per_token", 0
+                ),
+                output_cost_per_token=entry.get(
+                    "output_cost_per_token", 0
+                ),
+                input_cost_per_token_batches=entry.get(
+                    "input_cost_per_token_batches"
+                ),
+                output_cost_per_token_batches=entry.get(
+                    "output_cost_per_token_batches"
+                ),
+                cache_read_input_token_cost=entry.get(
+                    "cache_read_input_token_cost"
+                ),
+                cache_creation_input_token_cost=entry.get(
+                    "cache_creation_input_token_cost"
+                ),
+                output_cost_per_reasoning_token=entry.get(
+                    "output_cost_per_reasoning_token"
+                ),
+            )
+            for model in LLMModel
+            if (entry := entries.get(model)) is not None
+        }
+        self._limits = {
+            model: ModelLimits(
+                max_input_tokens=entry.get("max_input_tokens"),
+                max_output_tokens=entry.get("max_output_tokens"),
+            )
+            for model in LLMModel
+            if (entry := entries.get(model)) is not None
+        }
+        self._state = index, _index_version(index)
+        self._refresh_due = self._clock() + self.ttl
+
+    def refresh(self) -> None:
+        """Fetch the remote cost map and merge it in. Blocks the caller."""
+        cost_map = self._fetch()
+        if self._state is None:
+            # merged over the snapshot, for the models the remote lacks
+            self._load_snapshot()
+        self.update(cost_map)
+        if self.snapshot_path is not None:
+            self._write_snapshot()
+
+    async def prefetch(self) -> None:
+        """Refresh off the event loop, e.g. once during app startup."""
+        await asyncio.to_thread(self.refresh)
+
+    def refresh_if_due(self) -> None:
+        """Start a background refresh once the prices are past ``ttl``.
+
+        Does nothing for a ``PINNED`` table.
+        """
+        if (
+            self.policy == PricingPolicy.REFRESH
+            and self._clock() >= self._refresh_due
+        ):
+            self.refresh_in_background()
+
+    def refresh_in_background(self) -> threading.Thread | None:
+        """Start a refresh thread unless one is already running."""
+        with self._refresh_lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+
+        thread = threading.Thread(
+            target=self._background_refresh,
+            name="yalc-pricing-refresh",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            # keep serving stale prices and try again after another ttl
+            self._refresh_due = self._clock() + self.ttl
+            logger.warning(
+                "Failed to refresh LLM pricing, serving stale prices: %s",
+                e,
+            )
+        finally:
+            self._refreshing = False
+
+    def _load_snapshot(
+        self,
+    ) -> tuple[dict[LLMModel, TokensPricing], str]:
+        if (
+            self.snapshot_path is not None
+            and self.snapshot_path.exists()
+        ):
+            cost_map = json.loads(
+                self.snapshot_path.read_text(encoding="utf-8")
+            )
+        else:
+            cost_map = load_bundled_cost_map()
+
+        refresh_due = self._refresh_due
+        self.update(cost_map)
+        # a snapshot is never fresh, keep the remote refresh due
+        self._refresh_due = refresh_due
+        assert self._state is not None
+        return self._state
+
+    def _write_snapshot(self) -> None:
+        assert self.snapshot_path is not None
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(self._entries), encoding="utf-8"
+        )
+        tmp_path.replace(self.snapshot_path)
 
 
 class PricingService:
+    """Computes token costs from the process-wide :class:`PricingTable`.
+
+    The pricing of the ``model`` the service is bound to is resolved once
+    and reused until the table's version changes, so costing a call is two
+    multiplications. Every :class:`ResponseStats` records the version of
+    the prices it was costed with.
+    """
+
+    table: ClassVar[PricingTable] = PricingTable()
+
+    def __init__(self, model: LLMModel | None = None):
+        self.model = model
+        self._resolved: tuple[TokensPricing, str] | None = None
+
     def build_response_stats(
         self,
         input_tokens: int,
         output_tokens: int,
         model: LLMModel,
+        batch: bool = False,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        reasoning_tokens: int = 0,
     ) -> ResponseStats:
+        """Cost a call, at the provider's batch API rates if ``batch`` is set.
+
+        ``input_tokens`` includes the cache reads and writes, and ``output_tokens``
+        the reasoning tokens. Each is costed at its own rate when the cost map lists
+        one, and at the plain input or output rate otherwise.
+        """
+        pricing, version = self._resolve(model)
+        if not batch:
+            discount = 1.0
+            input_rate = pricing.input_cost_per_token
+            output_rate = pricing.output_cost_per_token
+        else:
+            # both providers stack the batch discount on cache pricing
+            discount = BATCH_DISCOUNT
+            input_rate, output_rate = _batch_rates(pricing)
+
+        uncached_tokens = (
+            input_tokens - cache_read_tokens - cache_write_tokens
+        )
+        input_cost = uncached_tokens * input_rate
+        if cache_read_tokens:
+            input_cost += cache_read_tokens * _rate(
+                pricing.cache_read_input_token_cost,
+                input_rate,
+                discount,
+            )
+        if cache_write_tokens:
+            input_cost += cache_write_tokens * _rate(
+                pricing.cache_creation_input_token_cost,
+                input_rate,
+                discount,
+            )
+        output_cost = (output_tokens - reasoning_tokens) * output_rate
+        if reasoning_tokens:
+            output_cost += reasoning_tokens * _rate(
+                pricing.output_cost_per_reasoning_token,
+                output_rate,
+                discount,
+            )
+
         return ResponseStats(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            input_tokens_cost=self._get_input_token_cost(
-                model.value, input_tokens
-            ),
-            output_tokens_cost=self.get_output_token_cost(
-                model.value, output_tokens
-            ),
+            input_tokens_cost=input_cost,
+            output_tokens_cost=output_cost,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+            reasoning_tokens=reasoning_tokens,
+            pricing_version=version,
         )
 
-    def _get_input_token_cost(
-        self, model: str, input_tokens: int
-    ) -> float:
-        model_pricing = self._get_model_pricing(model)
-        return input_tokens * model_pricing.input_cost_per_token
-
-    def get_output_token_cost(
-        self, model: str, output_tokens: int
-    ) -> float:
-        model_pricing = self._get_model_pricing(model)
-        return output_tokens * model_pricing.output_cost_per_token
-
-    @staticmethod
-    @cached(cache=TTLCache(maxsize=100, ttl=60 * 5))  # 5 minute TTL
-    def _get_model_pricing(model: str) -> TokensPricing:
-        """
-        Cache the result for 5 minutes since every function call makes
-        a http request
-        """
-        model_cost = get_model_cost_map(model_cost_map_url)
-        if model not in model_cost:
-            raise ValueError(
-                f"Model {model} not found in litellm pricing data"
-            )
+    def get_pricing(self, model: LLMModel) -> TokensPricing:
+        return self._resolve(model)[0]
+
+    def get_limits(self, model: LLMModel) -> ModelLimits:
+        return self.table.limits(model)
+
+    def _resolve(self, model: LLMModel) -> tuple[TokensPricing, str]:
+        table = self.table
+        table.refresh_if_due()
+        if model is not self.model:
+            return table.lookup(model)
+
+        resolved = self._resolved
+        if resolved is None or resolved[1] != table.version:
+            resolved = self._resolved = table.lookup(model)
+        return resolved
+
 
-        pricing = model_cost[model]
-        return TokensPricing(
-            input_cost_per_token=pricing.get(
-                "input_cost_per_token", 0
-            ),
-            output_cost_per_token=pricing.get(
-                "output_cost_per_token", 0
-            ),
+def _index_version(index: dict[LLMModel, TokensPricing]) -> str:
+    payload = json.dumps(
+        sorted(
+            (model.value, pricing) for model, pricing in index.items()
         )
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+def _rate(
+    rate: float | None, fallback: float, discount: float
+) -> float:
+    return fallback if rate is None else rate * discount
+
+
+def _batch_rates(pricing: TokensPricing) -> tuple[float, float]:
+    # both providers bill batch requests at half the interactive rate,
+    # which is what the cost map omits for some models
+    return (
+        pricing.input_cost_per_token_batches
+        if pricing.input_cost_per_token_batches is not None
+        else pricing.input_cost_per_token * BATCH_DISCOUNT,
+        pricing.output_cost_per_token_batches
+        if pricing.output_cost_per_token_batches is not None
+        else pricing.output_cost_per_token * BATCH_DISCOUNT,
+    )
@@ -1,9 +1,11 @@
 from enum import StrEnum
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
-import instructor
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    import instructor
+
 
 class LLMRole(StrEnum):
     """Role of a participant in an LLM conversation."""
@@ -15,12 +17,46 @@ class LLMRole(StrEnum):
 
 
 class ResponseStats(BaseModel):
-    """Token usage and cost statistics for a single LLM call."""
+    """Token usage and cost statistics for a single LLM call.
+
+    ``input_tokens`` counts every prompt token, including those read from and written
+    to the provider's prompt cache, and ``output_tokens`` includes reasoning tokens.
+    The costs apply each kind of token's own rate.
+    """
 
     input_tokens: int
     output_tokens: int
     input_tokens_cost: float
     output_tokens_cost: float
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    reasoning_tokens: int = 0
+    # PricingTable.version of the prices the costs were computed with
+    pricing_version: str | None = None
+
+    def __add__(self, other: "ResponseStats") -> "ResponseStats":
+        return ResponseStats(
+            input_tokens=self.input_tokens + other.input_tokens,
+            output_tokens=self.output_tokens + other.output_tokens,
+            input_tokens_cost=self.input_tokens_cost
+            + other.input_tokens_cost,
+            output_tokens_cost=self.output_tokens_cost
+            + other.output_tokens_cost,
+            cache_read_tokens=self.cache_read_tokens
+            + other.cache_read_tokens,
+            cache_write_tokens=self.cache_write_tokens
+            + other.cache_write_tokens,
+            reasoning_tokens=self.reasoning_tokens
+            + other.reasoning_tokens,
+            pricing_version=self.pricing_version,
+        )
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of the input tokens served from the prompt cache."""
+        if not self.input_tokens:
+            return 0.0
+        return self.cache_read_tokens / self.input_tokens
 
 
 class ContextMessage(BaseModel):
@@ -33,6 +69,21 @@ class ContextMessage(BaseModel):
 class TokensPricing(NamedTuple):
     input_cost_per_token: float
     output_cost_per_token: float
+    # the rates below are None when the cost map does not list them
+    input_cost_per_token_batches: float | None = None
+    output_cost_per_token_batches: float | None = None
+    cache_read_input_token_cost: float | None = None
+    cache_creation_input_token_cost: float | None = None
+    output_cost_per_reasoning_token: float | None = None
+
+
+class ModelLimits(NamedTuple):
+    """Context window of a model, ``None`` where the cost map does not list it."""
+
+    # tokens of the prompt; Claude models share this window with the
+    # answer, gpt-5 models get max_output_tokens on top of it
+    max_input_tokens: int | None = None
+    max_output_tokens: int | None = None
 
 
 class LLMProvider(StrEnum):
@@ -42,9 +93,11 @@ class LLMProvider(StrEnum):
     ANTHROPIC = "anthropic"
 
 
+# values of instructor.Mode, which is only imported once a mode is
+# needed since importing instructor loads every provider SDK
 provider_to_mode_map = {
-    LLMProvider.OPENAI: instructor.Mode.RESPONSES_TOOLS,
-    LLMProvider.ANTHROPIC: instructor.Mode.ANTHROPIC_TOOLS,
+    LLMProvider.OPENAI: "responses_tools",
+    LLMProvider.ANTHROPIC: "anthropic_tools",
 }
 
 
@@ -81,5 +134,7 @@ class LLMModel(StrEnum):
         return f"{self.provider.value}/{self.value}"
 
     @property
-    def mode(self) -> instructor.Mode:
-        return provider_to_mode_map[self.provider]
+    def mode(self) -> "instructor.Mode":
+        import instructor
+
+        return instructor.Mode(provider_to_mode_map[self.provider])